@@ -0,0 +1,141 @@
+"""initial schema
+
+The schema as it existed before migrations were introduced. Databases
+created by the old startup-time create_all should be stamped with this
+revision (``alembic stamp 0001``) and then upgraded.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 02:25:47.144859
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('username', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=True),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('profile_photo', sa.String(), nullable=True),
+    sa.Column('bio', sa.Text(), nullable=True),
+    sa.Column('availability', sa.Enum('WEEKDAYS', 'WEEKENDS', 'EVENINGS', 'MORNINGS', 'ANYTIME', name='useravailability'), nullable=True),
+    sa.Column('visibility', sa.Enum('PUBLIC', 'PRIVATE', name='profilevisibility'), nullable=True),
+    sa.Column('role', sa.Enum('USER', 'ADMIN', name='userrole'), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_banned', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_username'), ['username'], unique=True)
+
+    op.create_table('skills_offered',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'REJECTED', name='skillstatus'), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('skills_offered', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_skills_offered_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_skills_offered_name'), ['name'], unique=False)
+
+    op.create_table('skills_wanted',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('skills_wanted', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_skills_wanted_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_skills_wanted_name'), ['name'], unique=False)
+
+    op.create_table('swaps',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('requester_id', sa.Integer(), nullable=False),
+    sa.Column('provider_id', sa.Integer(), nullable=False),
+    sa.Column('skill_offered_id', sa.Integer(), nullable=True),
+    sa.Column('skill_wanted_id', sa.Integer(), nullable=True),
+    sa.Column('message', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'ACCEPTED', 'REJECTED', 'CANCELLED', 'COMPLETED', name='swapstatus'), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['provider_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['requester_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['skill_offered_id'], ['skills_offered.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['skill_wanted_id'], ['skills_wanted.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('swaps', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_swaps_id'), ['id'], unique=False)
+
+    op.create_table('feedback',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('swap_id', sa.Integer(), nullable=False),
+    sa.Column('giver_id', sa.Integer(), nullable=False),
+    sa.Column('receiver_id', sa.Integer(), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['giver_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['receiver_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['swap_id'], ['swaps.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('feedback', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_feedback_id'), ['id'], unique=False)
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('feedback', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_feedback_id'))
+
+    op.drop_table('feedback')
+    with op.batch_alter_table('swaps', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_swaps_id'))
+
+    op.drop_table('swaps')
+    with op.batch_alter_table('skills_wanted', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_skills_wanted_name'))
+        batch_op.drop_index(batch_op.f('ix_skills_wanted_id'))
+
+    op.drop_table('skills_wanted')
+    with op.batch_alter_table('skills_offered', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_skills_offered_name'))
+        batch_op.drop_index(batch_op.f('ix_skills_offered_id'))
+
+    op.drop_table('skills_offered')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_username'))
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
@@ -0,0 +1,94 @@
+"""skill search index
+
+FTS5 index over the name and description of both skill tables, kept in
+sync by triggers. The rowid encodes the source row: skills_offered.id * 2
+for offered skills and skills_wanted.id * 2 + 1 for wanted skills.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 02:31:10.412093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SKILL_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS skills_fts USING fts5(
+        name, description,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS skills_offered_fts_insert AFTER INSERT ON skills_offered BEGIN
+        INSERT INTO skills_fts (rowid, name, description) VALUES (new.id * 2, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS skills_offered_fts_update AFTER UPDATE OF name, description ON skills_offered BEGIN
+        UPDATE skills_fts SET name = new.name, description = new.description WHERE rowid = new.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS skills_offered_fts_delete AFTER DELETE ON skills_offered BEGIN
+        DELETE FROM skills_fts WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS skills_wanted_fts_insert AFTER INSERT ON skills_wanted BEGIN
+        INSERT INTO skills_fts (rowid, name, description) VALUES (new.id * 2 + 1, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS skills_wanted_fts_update AFTER UPDATE OF name, description ON skills_wanted BEGIN
+        UPDATE skills_fts SET name = new.name, description = new.description WHERE rowid = new.id * 2 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS skills_wanted_fts_delete AFTER DELETE ON skills_wanted BEGIN
+        DELETE FROM skills_fts WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+SKILL_FTS_TRIGGERS = [
+    "skills_offered_fts_insert", "skills_offered_fts_update", "skills_offered_fts_delete",
+    "skills_wanted_fts_insert", "skills_wanted_fts_update", "skills_wanted_fts_delete",
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    # Databases started before migrations may already have the index
+    exists = op.get_bind().execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'skills_fts'")
+    ).first()
+
+    for statement in SKILL_FTS_DDL:
+        op.execute(statement)
+
+    if not exists:
+        op.execute("INSERT INTO skills_fts (rowid, name, description) SELECT id * 2, name, description FROM skills_offered")
+        op.execute("INSERT INTO skills_fts (rowid, name, description) SELECT id * 2 + 1, name, description FROM skills_wanted")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    for trigger in SKILL_FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS skills_fts")
@@ -0,0 +1,49 @@
+"""hot path indexes
+
+Composite indexes matched to the list endpoints: swaps per participant
+(optionally by status) newest first, swaps by status for admins, feedback
+per giver/receiver, and skills per owner.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 02:34:52.907315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("ix_swaps_requester_created", "swaps", ["requester_id", "created_at"]),
+    ("ix_swaps_provider_created", "swaps", ["provider_id", "created_at"]),
+    ("ix_swaps_requester_status_created", "swaps", ["requester_id", "status", "created_at"]),
+    ("ix_swaps_provider_status_created", "swaps", ["provider_id", "status", "created_at"]),
+    ("ix_swaps_status_created", "swaps", ["status", "created_at"]),
+    ("ix_swaps_created", "swaps", ["created_at"]),
+    ("ix_feedback_receiver_created", "feedback", ["receiver_id", "created_at"]),
+    ("ix_feedback_giver_created", "feedback", ["giver_id", "created_at"]),
+    ("ix_feedback_swap_giver", "feedback", ["swap_id", "giver_id"]),
+    ("ix_skills_offered_user_id", "skills_offered", ["user_id"]),
+    ("ix_skills_offered_status", "skills_offered", ["status"]),
+    ("ix_skills_wanted_user_id", "skills_wanted", ["user_id"]),
+]
+
+
+def upgrade() -> None:
+    # Some of these were created at startup before migrations existed
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,137 @@
+"""platform counters
+
+Counters table for the admin dashboard, maintained by triggers inside the
+transactions that insert, update or delete users, skills and swaps.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 02:52:07.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SWAP_STATUSES = ["PENDING", "ACCEPTED", "REJECTED", "CANCELLED", "COMPLETED"]
+
+COUNTERS = ["users", "active_users", "skills_offered", "skills_wanted"] + [
+    f"swaps_{status}" for status in SWAP_STATUSES
+]
+
+# A user becomes active with their first swap and inactive when their last
+# swap is deleted; both checks are index lookups on requester_id/provider_id
+NO_OTHER_SWAPS = """
+    NOT EXISTS (SELECT 1 FROM swaps WHERE requester_id = {user} AND id <> {swap})
+    AND NOT EXISTS (SELECT 1 FROM swaps WHERE provider_id = {user} AND id <> {swap})
+"""
+
+COUNTER_TRIGGERS = {
+    "users_counter_insert": """
+        CREATE TRIGGER users_counter_insert AFTER INSERT ON users BEGIN
+            UPDATE platform_counters SET value = value + 1 WHERE name = 'users';
+        END
+    """,
+    "users_counter_delete": """
+        CREATE TRIGGER users_counter_delete AFTER DELETE ON users BEGIN
+            UPDATE platform_counters SET value = value - 1 WHERE name = 'users';
+        END
+    """,
+    "skills_offered_counter_insert": """
+        CREATE TRIGGER skills_offered_counter_insert AFTER INSERT ON skills_offered BEGIN
+            UPDATE platform_counters SET value = value + 1 WHERE name = 'skills_offered';
+        END
+    """,
+    "skills_offered_counter_delete": """
+        CREATE TRIGGER skills_offered_counter_delete AFTER DELETE ON skills_offered BEGIN
+            UPDATE platform_counters SET value = value - 1 WHERE name = 'skills_offered';
+        END
+    """,
+    "skills_wanted_counter_insert": """
+        CREATE TRIGGER skills_wanted_counter_insert AFTER INSERT ON skills_wanted BEGIN
+            UPDATE platform_counters SET value = value + 1 WHERE name = 'skills_wanted';
+        END
+    """,
+    "skills_wanted_counter_delete": """
+        CREATE TRIGGER skills_wanted_counter_delete AFTER DELETE ON skills_wanted BEGIN
+            UPDATE platform_counters SET value = value - 1 WHERE name = 'skills_wanted';
+        END
+    """,
+    "swaps_counter_insert": f"""
+        CREATE TRIGGER swaps_counter_insert AFTER INSERT ON swaps BEGIN
+            UPDATE platform_counters SET value = value + 1 WHERE name = 'swaps_' || new.status;
+            UPDATE platform_counters SET value = value + 1 WHERE name = 'active_users'
+                AND {NO_OTHER_SWAPS.format(user="new.requester_id", swap="new.id")};
+            UPDATE platform_counters SET value = value + 1 WHERE name = 'active_users'
+                AND new.provider_id <> new.requester_id
+                AND {NO_OTHER_SWAPS.format(user="new.provider_id", swap="new.id")};
+        END
+    """,
+    "swaps_counter_update": """
+        CREATE TRIGGER swaps_counter_update AFTER UPDATE OF status ON swaps
+        WHEN old.status IS NOT new.status BEGIN
+            UPDATE platform_counters SET value = value - 1 WHERE name = 'swaps_' || old.status;
+            UPDATE platform_counters SET value = value + 1 WHERE name = 'swaps_' || new.status;
+        END
+    """,
+    "swaps_counter_delete": f"""
+        CREATE TRIGGER swaps_counter_delete AFTER DELETE ON swaps BEGIN
+            UPDATE platform_counters SET value = value - 1 WHERE name = 'swaps_' || old.status;
+            UPDATE platform_counters SET value = value - 1 WHERE name = 'active_users'
+                AND {NO_OTHER_SWAPS.format(user="old.requester_id", swap="old.id")};
+            UPDATE platform_counters SET value = value - 1 WHERE name = 'active_users'
+                AND old.provider_id <> old.requester_id
+                AND {NO_OTHER_SWAPS.format(user="old.provider_id", swap="old.id")};
+        END
+    """,
+}
+
+SEED_COUNTERS = [
+    "UPDATE platform_counters SET value = (SELECT count(*) FROM users) WHERE name = 'users'",
+    "UPDATE platform_counters SET value = (SELECT count(*) FROM skills_offered) WHERE name = 'skills_offered'",
+    "UPDATE platform_counters SET value = (SELECT count(*) FROM skills_wanted) WHERE name = 'skills_wanted'",
+    """
+    UPDATE platform_counters SET value = (
+        SELECT count(*) FROM (SELECT requester_id FROM swaps UNION SELECT provider_id FROM swaps)
+    ) WHERE name = 'active_users'
+    """,
+    """
+    UPDATE platform_counters SET value = (
+        SELECT count(*) FROM swaps WHERE 'swaps_' || swaps.status = platform_counters.name
+    ) WHERE name LIKE 'swaps\\_%' ESCAPE '\\'
+    """,
+]
+
+
+def upgrade() -> None:
+    counters = op.create_table('platform_counters',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(counters, [{"name": name, "value": 0} for name in COUNTERS])
+
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    for statement in SEED_COUNTERS:
+        op.execute(statement)
+
+    for statement in COUNTER_TRIGGERS.values():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in COUNTER_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+    op.drop_table('platform_counters')
@@ -0,0 +1,54 @@
+"""platform message outbox
+
+Outbox table for platform-wide admin messages, with per-job delivery
+progress and the lease used by the worker that is sending it.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 02:40:25.780879
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('platform_messages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'SENDING', 'COMPLETED', 'FAILED', name='messagestatus'), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('max_user_id', sa.Integer(), nullable=False),
+    sa.Column('total_recipients', sa.Integer(), nullable=False),
+    sa.Column('last_user_id', sa.Integer(), nullable=False),
+    sa.Column('delivered', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('platform_messages', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_platform_messages_id'), ['id'], unique=False)
+        batch_op.create_index('ix_platform_messages_status', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('platform_messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_platform_messages_status')
+        batch_op.drop_index(batch_op.f('ix_platform_messages_id'))
+
+    op.drop_table('platform_messages')
@@ -0,0 +1,85 @@
+"""user search index
+
+FTS5 trigram index over user names and usernames, kept in sync by
+triggers, for typo-tolerant user search. The rowid is users.id. Every word
+is stored padded with two leading spaces and one trailing space, so word
+starts and ends produce their own trigrams and short words still share
+trigrams with their misspellings. users_fts_vocab exposes how many users
+contain each trigram, so searches can skip the least selective ones.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 02:46:03.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+USER_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        name, username,
+        tokenize = 'trigram'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS users_fts_vocab USING fts5vocab(users_fts, 'row')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts (rowid, name, username) VALUES (
+            new.id,
+            '  ' || replace(new.name, ' ', '  ') || ' ',
+            '  ' || new.username || ' '
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_update AFTER UPDATE OF name, username ON users BEGIN
+        UPDATE users_fts SET
+            name = '  ' || replace(new.name, ' ', '  ') || ' ',
+            username = '  ' || new.username || ' '
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN
+        DELETE FROM users_fts WHERE rowid = old.id;
+    END
+    """,
+]
+
+USER_FTS_TRIGGERS = ["users_fts_insert", "users_fts_update", "users_fts_delete"]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    for statement in USER_FTS_DDL:
+        op.execute(statement)
+
+    op.execute("""
+        INSERT INTO users_fts (rowid, name, username)
+        SELECT id, '  ' || replace(name, ' ', '  ') || ' ', '  ' || username || ' ' FROM users
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    for trigger in USER_FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS users_fts_vocab")
+    op.execute("DROP TABLE IF EXISTS users_fts")
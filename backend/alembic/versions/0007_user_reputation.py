@@ -0,0 +1,64 @@
+"""user reputation
+
+Per-user rating aggregates (count, sum and a histogram by star) on the
+users table, backfilled from existing feedback. From here on they are kept
+up to date by create_feedback; `python -m app.cli rebuild-reputation`
+recomputes them. ix_users_rating orders users best rated first (mean,
+then number of ratings) so sorting by rating reads the index, not the table.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 02:57:05.575369
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+RATING_COLUMNS = ['rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+
+# Stars are ratings rounded half up, as in app.core.reputation.star
+BACKFILL = """
+    UPDATE users SET
+        rating_count = (SELECT count(*) FROM feedback WHERE receiver_id = users.id),
+        rating_sum = (SELECT coalesce(sum(rating), 0) FROM feedback WHERE receiver_id = users.id),
+        rating_1 = (SELECT count(*) FROM feedback WHERE receiver_id = users.id AND rating < 1.5),
+        rating_2 = (SELECT count(*) FROM feedback WHERE receiver_id = users.id AND rating >= 1.5 AND rating < 2.5),
+        rating_3 = (SELECT count(*) FROM feedback WHERE receiver_id = users.id AND rating >= 2.5 AND rating < 3.5),
+        rating_4 = (SELECT count(*) FROM feedback WHERE receiver_id = users.id AND rating >= 3.5 AND rating < 4.5),
+        rating_5 = (SELECT count(*) FROM feedback WHERE receiver_id = users.id AND rating >= 4.5)
+    WHERE id IN (SELECT receiver_id FROM feedback)
+"""
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_sum', sa.Float(), server_default='0', nullable=False))
+        for column in RATING_COLUMNS:
+            batch_op.add_column(sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(BACKFILL)
+    op.create_index(
+        'ix_users_rating', 'users',
+        [sa.text('(rating_sum / nullif(rating_count, 0)) DESC'), sa.text('rating_count DESC'), 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_rating', table_name='users')
+    # Drop in place: recreating users would lose the triggers on it
+    with op.batch_alter_table('users', schema=None, recreate='never') as batch_op:
+        for column in reversed(RATING_COLUMNS):
+            batch_op.drop_column(column)
+        batch_op.drop_column('rating_sum')
+        batch_op.drop_column('rating_count')
@@ -0,0 +1,34 @@
+"""swap version
+
+A version on every swap, incremented by each status transition. Together
+with the status it is the precondition of the conditional UPDATE in
+update_swap, so concurrent transitions of the same swap cannot both
+succeed, and clients can send back the version they saw.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 03:36:55.520694
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # In place: recreating swaps would lose the triggers on it
+    with op.batch_alter_table('swaps', schema=None, recreate='never') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('swaps', schema=None, recreate='never') as batch_op:
+        batch_op.drop_column('version')
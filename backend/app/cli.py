@@ -0,0 +1,81 @@
+"""
+Maintenance commands
+
+Usage:
+    python -m app.cli recount-stats [--check]
+    python -m app.cli rebuild-reputation [--check]
+"""
+import argparse
+import sys
+
+from .database import engine
+
+
+def recount_stats(args) -> int:
+    """Recompute the admin dashboard counters from the base tables"""
+    from .core.stats import recount
+
+    with engine.begin() as connection:
+        drift = recount(connection, dry_run=args.check)
+
+    if not drift:
+        print("Counters are consistent")
+        return 0
+
+    for name, (stored, actual) in sorted(drift.items()):
+        print(f"{name}: stored={stored} actual={actual}")
+
+    if args.check:
+        print(f"{len(drift)} counter(s) out of date")
+        return 1
+
+    print(f"Repaired {len(drift)} counter(s)")
+    return 0
+
+
+def rebuild_reputation(args) -> int:
+    """Recompute every user's rating aggregates from the feedback table"""
+    from .core.reputation import rebuild
+
+    with engine.begin() as connection:
+        drift = rebuild(connection, dry_run=args.check)
+
+    if not drift:
+        print("Reputation aggregates are consistent")
+        return 0
+
+    for user_id, (stored, actual) in sorted(drift.items())[:20]:
+        print(f"user {user_id}: stored count={stored[0]} sum={stored[1]:g} actual count={actual[0]} sum={actual[1]:g}")
+    if len(drift) > 20:
+        print(f"... and {len(drift) - 20} more")
+
+    if args.check:
+        print(f"{len(drift)} user(s) out of date")
+        return 1
+
+    print(f"Repaired {len(drift)} user(s)")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    recount_parser = commands.add_parser("recount-stats", help=recount_stats.__doc__)
+    recount_parser.add_argument(
+        "--check", action="store_true", help="Only report drift, exit 1 if any"
+    )
+    recount_parser.set_defaults(func=recount_stats)
+
+    reputation_parser = commands.add_parser("rebuild-reputation", help=rebuild_reputation.__doc__)
+    reputation_parser.add_argument(
+        "--check", action="store_true", help="Only report drift, exit 1 if any"
+    )
+    reputation_parser.set_defaults(func=rebuild_reputation)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,5 @@
 from pydantic_settings import BaseSettings
-import os
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -9,6 +8,31 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./skill_swap.db"
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL when unset
+    DB_ASYNC: bool = True  # False runs routers on the blocking sync engine (for benchmarking)
+    
+    # SQLite connection profile, set on every new connection (ignored for other databases)
+    SQLITE_PRAGMAS: bool = True  # False keeps SQLite's defaults (for benchmarking)
+    SQLITE_BUSY_TIMEOUT: int = 5000  # Milliseconds to wait for a lock before "database is locked"
+    SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST"] = "WAL"  # WAL: readers never block the writer
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"  # NORMAL is durable enough under WAL
+    SQLITE_CACHE_SIZE: int = -64000  # Page cache per connection, in pages or (negative) KiB
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # Bytes of the file read through a memory map
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"  # Sorts and temp indexes
+    SQLITE_FOREIGN_KEYS: bool = True  # Enforce foreign keys and their ON DELETE actions
+    
+    # Read replicas, used by GET routes that tolerate replication lag
+    READ_REPLICA_URLS: list[str] = []  # e.g. ["sqlite:///file:skill_swap.db?mode=ro&uri=true"]
+    READ_REPLICA_RETRY_SECONDS: float = 30.0  # A replica that failed to connect is skipped this long
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # Callers who just wrote read from the primary this long
+    
+    # Worker processes (python -m app.serve) and their startup warmup
+    WORKERS: int = 0  # 0 starts one per CPU
+    WORKER_TIMEOUT: float = 60.0  # Seconds to warm up, or without a heartbeat, before a worker is replaced
+    WORKER_GRACEFUL_TIMEOUT: float = 30.0  # Seconds a stopping worker gets to finish its requests
+    VALIDATE_SCHEMA: bool = True  # Refuse to start unless the database is at the latest migration
+    WARMUP_CONNECTIONS: int = 5  # Pool connections opened before accepting traffic
+    WARMUP_PRINCIPALS: int = 1000  # Principals of the most recently active users cached up front
     
     # JWT Authentication
     SECRET_KEY: str = "your-secret-key-change-in-production"  # Change in production!
@@ -18,9 +42,65 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:5173"]
     
+    # Cursor pagination
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
+    
+    # Serialize large list responses straight to JSON bytes in pydantic-core
+    FAST_JSON_RESPONSES: bool = True
+    
+    # Observability
+    METRICS_ENABLED: bool = True  # Per-route latency and SQL metrics at /api/metrics
+    
+    # Platform message outbox
+    MESSAGE_BATCH_SIZE: int = 500  # Recipients delivered per batch
+    MESSAGE_POLL_INTERVAL: float = 5.0  # Seconds between checks for queued messages
+    MESSAGE_LEASE_SECONDS: float = 60.0  # A job whose worker stops renewing is resumed after this
+    
+    # Real-time events (/api/events, server-sent events)
+    EVENTS_BACKEND: str = "local"  # "local" (this worker only), "unix" (all workers on this host) or "module:Class"
+    EVENTS_SOCKET_DIR: str = "/tmp/skill-swap-events"  # Where the unix backend's workers find each other
+    EVENTS_BUFFER_SIZE: int = 64  # Undelivered events per connection; a client further behind is told to resync
+    EVENTS_MAX_CONNECTIONS: int = 20000  # Open streams per worker; beyond this new ones get 503
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0  # Comment sent on idle streams so proxies keep them open
+    EVENTS_MAX_STREAM_SECONDS: float = 900.0  # Streams end after this; clients reconnect and re-authenticate
+    EVENTS_RETRY_MS: int = 3000  # Reconnection delay suggested to EventSource clients
+    
+    # Bulk endpoints
+    BULK_MAX_ITEMS: int = 1000  # Skills created or moderated per request
+    
+    # User search and autocomplete
+    USER_SEARCH_THRESHOLD: float = 0.3  # Minimum trigram similarity for a fuzzy match
+    USER_SEARCH_CANDIDATES: int = 200  # Index hits re-ranked per search
+    AUTOCOMPLETE_LIMIT: int = 10  # Most suggestions of each kind per prefix
+    
+    # Streaming exports
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched and encoded per chunk
+    
+    # Authenticated principal cache (per worker process)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: int = 60  # Seconds; a backstop should a cross-worker invalidation be lost
+    
     # File uploads
     UPLOAD_DIR: str = "app/static/uploads"
     MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5MB
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024  # Bytes read per chunk while streaming an upload
+    PHOTO_WORKERS: int = 2  # Processes rendering profile photo thumbnails
+    
+    # Load shedding: requests admitted at once per route class and worker (see app.core.shedding),
+    # with a short queue each; beyond it, or after waiting too long, requests get 503 + Retry-After
+    LOAD_SHEDDING: bool = True
+    # Keep the sum of the limits under the connection pool (15 by default), so cheap routes always find a connection
+    CONCURRENCY_LIMITS: dict[str, int] = {"auth": 4, "search": 4, "listings": 4, "writes": 2}
+    CONCURRENCY_QUEUE_SIZES: dict[str, int] = {"auth": 16, "search": 16, "listings": 16, "writes": 32}
+    CONCURRENCY_QUEUE_TIMEOUTS: dict[str, float] = {"auth": 2.0, "search": 0.5, "listings": 0.5, "writes": 2.0}  # Seconds
+    LOAD_SHED_RETRY_AFTER: int = 1  # Seconds
+    
+    # Password hashing worker pool
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Reject with 503 beyond this many queued operations
+    PASSWORD_HASH_RETRY_AFTER: int = 1  # Seconds
     
     class Config:
         env_file = ".env"
@@ -28,6 +108,3 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
-
-# Ensure upload directory exists
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
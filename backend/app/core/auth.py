@@ -3,33 +3,47 @@ from typing import Optional, Union, Any
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import settings
-from ..database import get_db
+from ..database import get_async_db
 from ..models.user import User, UserRole
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .cache import Principal, principal_cache
+from .hashing import HashingOverloaded, password_hasher
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _hashing_overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please try again shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)},
+    )
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except HashingOverloaded:
+        raise _hashing_overloaded()
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    try:
+        return await password_hasher.hash(password)
+    except HashingOverloaded:
+        raise _hashing_overloaded()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
+    from jose import jwt  # deferred: slow to import, and only needed at login
+    
     to_encode = data.copy()
     
     if expires_delta:
@@ -43,30 +57,55 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+async def load_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """Get a user's principal from the cache, falling back to a single-row query"""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    
+    version = principal_cache.version(user_id)
+    row = (await db.execute(
+        select(User.id, User.role, User.is_active, User.is_banned).where(User.id == user_id)
+    )).first()
+    
+    if row is None:
+        return None
+    
+    principal = Principal(
+        id=row.id,
+        role=row.role,
+        is_active=row.is_active,
+        is_banned=row.is_banned,
+        version=version
+    )
+    principal_cache.put(principal)
+    
+    return principal
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current user from JWT token"""
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Get the current user's principal from JWT token"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    from jose import JWTError, jwt  # deferred to first use, see create_access_token
+    
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        user_id: str = payload.get("sub")
-        
-        if user_id is None:
-            raise credentials_exception
+        user_id = int(payload.get("sub"))
         
-    except JWTError:
+    except (JWTError, TypeError, ValueError):
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await load_principal(db, user_id)
     
     if user is None:
         raise credentials_exception
@@ -87,15 +126,15 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """Get the current active user"""
     return current_user
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """Get the current admin user"""
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
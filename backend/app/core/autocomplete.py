@@ -0,0 +1,228 @@
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from ..config import settings
+from ..models.skill import SkillOffered, SkillStatus, SkillWanted
+from ..models.user import ProfileVisibility, User
+from .matching import normalize_skill
+
+
+class _Node:
+    __slots__ = ("children", "entries", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.entries: Dict[Hashable, tuple] = {}  # item -> rank, for keys ending here
+        self.top: Optional[List[Tuple[tuple, Hashable]]] = None  # best (rank, item) below, cached
+
+
+class PrefixTrie:
+    """
+    Character trie mapping keys to ranked items (lower rank is better).
+
+    Every node caches the best `size` items in its subtree. A write clears
+    the cache along its key's path only, and a lookup rebuilds missing
+    caches from the children's, so a keystroke costs one walk down the
+    prefix plus a merge of at most `size` items per child on the way.
+
+    Keys are cut to MAX_KEY_LENGTH characters, which bounds the depth of
+    that merge; longer prefixes match on their first MAX_KEY_LENGTH only.
+    """
+
+    MAX_KEY_LENGTH = 64
+
+    def __init__(self, size: int):
+        self.size = size
+        self.root = _Node()
+        self.nodes = 1
+
+    def insert(self, key: str, item: Hashable, rank: tuple) -> None:
+        key = key[:self.MAX_KEY_LENGTH]
+        node = self.root
+        node.top = None
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+                self.nodes += 1
+            node = child
+            node.top = None
+        node.entries[item] = rank
+
+    def remove(self, key: str, item: Hashable) -> None:
+        key = key[:self.MAX_KEY_LENGTH]
+        path = [self.root]
+        for char in key:
+            child = path[-1].children.get(char)
+            if child is None:
+                return
+            path.append(child)
+
+        if path[-1].entries.pop(item, None) is None:
+            return
+
+        for node in path:
+            node.top = None
+
+        # Prune the branch back to the last node still in use
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if node.children or node.entries:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+            self.nodes -= 1
+
+    def _top(self, node: _Node) -> List[Tuple[tuple, Hashable]]:
+        if node.top is None:
+            candidates = [(rank, item) for item, rank in node.entries.items()]
+            for child in node.children.values():
+                candidates.extend(self._top(child))
+
+            # One item can sit under several keys of the subtree (e.g. a
+            # user's name and username), so skip repeats
+            top, seen = [], set()
+            for rank, item in sorted(candidates):
+                if item not in seen:
+                    seen.add(item)
+                    top.append((rank, item))
+                    if len(top) == self.size:
+                        break
+            node.top = top
+        return node.top
+
+    def search(self, prefix: str, limit: int) -> List[Hashable]:
+        node = self.root
+        for char in prefix[:self.MAX_KEY_LENGTH]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [item for _, item in self._top(node)[:limit]]
+
+    def clear(self) -> None:
+        self.root = _Node()
+        self.nodes = 1
+
+
+def _user_keys(name: str, username: str) -> List[str]:
+    """The full name, each later word of it (so "smi" finds "John Smith") and the username"""
+    words = normalize_skill(name).split()
+    keys = {" ".join(words[i:]) for i in range(len(words))}
+    keys.add(normalize_skill(username))
+    keys.discard("")
+    return sorted(keys)
+
+
+class AutocompleteIndex:
+    """
+    In-memory prefix index of skill names and visible users for
+    /api/autocomplete.
+
+    Built once at startup and updated incrementally by the profile and
+    skill write handlers, alongside the skill match index. Skills rank by
+    how many users offer (approved) or want them, users by name.
+    """
+
+    def __init__(self, size: int = 10):
+        self.skills = PrefixTrie(size)
+        self.users = PrefixTrie(size)
+        self.skill_counts: Counter = Counter()
+        self.user_names: Dict[int, Tuple[str, str]] = {}
+        self.ready = False
+
+    async def build(self, db) -> None:
+        self.skills.clear()
+        self.users.clear()
+        self.skill_counts.clear()
+        self.user_names.clear()
+
+        offered = await db.execute(
+            select(SkillOffered.name).where(SkillOffered.status == SkillStatus.APPROVED)
+        )
+        wanted = await db.execute(select(SkillWanted.name))
+        counts = Counter(normalize_skill(name) for name in [*offered.scalars(), *wanted.scalars()])
+        counts.pop("", None)
+        for term, count in counts.items():
+            self.skill_counts[term] = count
+            self.skills.insert(term, term, (-count, term))
+
+        users = await db.execute(
+            select(User.id, User.name, User.username).where(
+                User.visibility == ProfileVisibility.PUBLIC,
+                User.is_active == True,
+                User.is_banned == False
+            )
+        )
+        for user_id, name, username in users:
+            self._add_user(user_id, name, username)
+
+        self.ready = True
+
+    def add_skill(self, name: str) -> None:
+        self._count_skill(normalize_skill(name), 1)
+
+    def remove_skill(self, name: str) -> None:
+        self._count_skill(normalize_skill(name), -1)
+
+    def recount_skills(self, old: Counter, new: Counter) -> None:
+        """Apply a change of some users' skill terms (see SkillMatchIndex.replace_user)"""
+        for term in old.keys() | new.keys():
+            if new[term] != old[term]:
+                self._count_skill(term, new[term] - old[term])
+
+    def _count_skill(self, term: str, delta: int) -> None:
+        if not term:
+            return
+        count = self.skill_counts[term] + delta
+        if count > 0:
+            self.skill_counts[term] = count
+            self.skills.insert(term, term, (-count, term))
+        else:
+            self.skill_counts.pop(term, None)
+            self.skills.remove(term, term)
+
+    def update_user(self, user: User) -> None:
+        """Re-index a user after a write that may change their name or visibility"""
+        self.remove_user(user.id)
+        if user.visibility == ProfileVisibility.PUBLIC and user.is_active and not user.is_banned:
+            self._add_user(user.id, user.name, user.username)
+
+    def remove_user(self, user_id: int) -> None:
+        names = self.user_names.pop(user_id, None)
+        if names is not None:
+            for key in _user_keys(*names):
+                self.users.remove(key, user_id)
+
+    def _add_user(self, user_id: int, name: str, username: str) -> None:
+        self.user_names[user_id] = (name, username)
+        rank = (normalize_skill(name), user_id)
+        for key in _user_keys(name, username):
+            self.users.insert(key, user_id, rank)
+
+    def suggest(self, prefix: str, limit: int) -> dict:
+        prefix = normalize_skill(prefix)
+        if not prefix:
+            return {"skills": [], "users": []}
+
+        return {
+            "skills": [
+                {"name": term, "count": self.skill_counts[term]}
+                for term in self.skills.search(prefix, limit)
+            ],
+            "users": [
+                {"id": user_id, "name": self.user_names[user_id][0], "username": self.user_names[user_id][1]}
+                for user_id in self.users.search(prefix, limit)
+            ],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "skills": len(self.skill_counts),
+            "users": len(self.user_names),
+            "nodes": self.skills.nodes + self.users.nodes,
+        }
+
+
+autocomplete_index = AutocompleteIndex(settings.AUTOCOMPLETE_LIMIT)
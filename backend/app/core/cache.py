@@ -0,0 +1,117 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import settings
+from ..models.user import UserRole
+from .events import Event, event_hub
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The subset of a user that authentication and authorization need"""
+    id: int
+    role: UserRole
+    is_active: bool
+    is_banned: bool
+    version: int = 0
+
+
+class PrincipalCache:
+    """
+    In-process LRU + TTL cache of principals keyed by user id.
+
+    Every invalidation bumps a per-user version counter. A principal loaded
+    before the invalidation carries the old version and is refused by put(),
+    so a lookup racing with a ban can never re-cache the pre-ban state.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, tuple[float, Principal]]" = OrderedDict()
+        self._versions: "OrderedDict[int, int]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def version(self, user_id: int) -> int:
+        """Current version for a user; loads must be tagged with it"""
+        return self._versions.get(user_id, 0)
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, principal = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return principal
+
+    def put(self, principal: Principal) -> None:
+        if principal.version != self.version(principal.id):
+            # Invalidated while this principal was being loaded
+            return
+
+        self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's principal; call after committing any auth-relevant change"""
+        self._entries.pop(user_id, None)
+        self._versions[user_id] = self.version(user_id) + 1
+        self._versions.move_to_end(user_id)
+        while len(self._versions) > self.max_size:
+            self._versions.popitem(last=False)
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
+
+# Broadcast to the other workers when a user's principal changes
+PRINCIPAL_INVALIDATED = "principal.invalidated"
+
+
+async def invalidate_principal(user_id: int) -> None:
+    """Drop a user's principal in every worker; call after committing any auth-relevant change"""
+    principal_cache.invalidate(user_id)
+    await event_hub.broadcast(PRINCIPAL_INVALIDATED, {"user_id": user_id})
+
+
+def _principal_invalidated(event: Event) -> None:
+    principal_cache.invalidate(event.data["user_id"])
+
+
+event_hub.on(PRINCIPAL_INVALIDATED, _principal_invalidated)
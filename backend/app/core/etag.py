@@ -0,0 +1,67 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_db
+from .auth import get_current_user
+from .cache import Principal
+
+# Returns a small tuple that changes whenever the response would, e.g.
+# (count, max(updated_at)) for a collection, or None if the resource is
+# missing, in which case the endpoint runs normally (and reports the 404)
+VersionFunc = Callable[[AsyncSession, Principal, Request], Awaitable[Optional[tuple]]]
+
+NO_CACHE = "private, no-cache"
+
+
+def make_etag(request: Request, principal: Principal, version: tuple) -> str:
+    """Weak ETag over the URL (path and query), the caller and the version tuple"""
+    key = repr((str(request.url.path), str(request.url.query), principal.id, version))
+    return 'W/"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_get(version: VersionFunc, cache_control: str = NO_CACHE,
+                    session_dependency: Callable = get_async_db) -> Any:
+    """
+    Dependency adding an ETag and Cache-Control to a GET endpoint.
+
+    When the client's If-None-Match matches, the request ends here with a
+    304 and the endpoint never runs, so only the version query is paid.
+    The session is the one the endpoint receives, as FastAPI shares
+    dependencies within a request; pass the endpoint's session_dependency
+    (e.g. get_read_db) so the version and the body come from one database.
+    """
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(session_dependency),
+        current_user: Principal = Depends(get_current_user)
+    ) -> None:
+        current = await version(db, current_user, request)
+        if current is None:
+            return
+
+        etag = make_etag(request, current_user, current)
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+
+    return Depends(dependency)
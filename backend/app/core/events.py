@@ -0,0 +1,355 @@
+import asyncio
+import importlib
+import json
+import logging
+import os
+import socket
+import time
+from collections import defaultdict, deque
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Event types published by the swap routes
+SWAP_CREATED = "swap.created"
+SWAP_STATUS_CHANGED = "swap.status_changed"
+FEEDBACK_RECEIVED = "feedback.received"
+
+# Sent instead of the events a slow connection's buffer dropped
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+class Event:
+    """
+    One notification for a set of users. The SSE frame is encoded once at
+    publish time and shared by every connection it is delivered to.
+    """
+
+    __slots__ = ("type", "data", "user_ids", "frame")
+
+    def __init__(self, type: str, data: dict, user_ids: Iterable[int]):
+        self.type = type
+        self.data = data
+        self.user_ids = sorted(set(user_ids))
+        self.frame = f"event: {type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({"type": self.type, "data": self.data, "user_ids": self.user_ids}).encode()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "Event":
+        message = json.loads(payload)
+        return cls(message["type"], message["data"], message["user_ids"])
+
+
+class Subscription:
+    """
+    One open /api/events connection: the frames waiting to be written,
+    at most `size` of them. When the client falls behind, the oldest are
+    dropped and it is told to resync (refetch) instead.
+    """
+
+    __slots__ = ("user_id", "size", "pending", "dropped", "closed", "wakeup")
+
+    def __init__(self, user_id: int, size: int):
+        self.user_id = user_id
+        self.size = size
+        self.pending: deque = deque()
+        self.dropped = 0
+        self.closed = False
+        self.wakeup = asyncio.Event()
+
+    def push(self, frame: bytes) -> bool:
+        """Queue a frame; False when it displaced an older one"""
+        displaced = len(self.pending) >= self.size
+        if displaced:
+            self.pending.popleft()
+            self.dropped += 1
+        self.pending.append(frame)
+        self.wakeup.set()
+        return not displaced
+
+    def close(self) -> None:
+        self.closed = True
+        self.wakeup.set()
+
+    def drain(self) -> bytes:
+        """Everything queued since the last call, as one chunk"""
+        frames = [RESYNC_FRAME] if self.dropped else []
+        frames.extend(self.pending)
+        self.pending.clear()
+        self.dropped = 0
+        self.wakeup.clear()
+        return b"".join(frames)
+
+
+class EventBackend:
+    """
+    Carries events to the other worker processes. publish() is called
+    for every event this worker publishes; events from other workers are
+    handed to the `deliver` callback given to start(). The default keeps
+    events within this process, which is all a single worker needs.
+    """
+
+    async def start(self, deliver: Callable[[Event], None]) -> None:
+        pass
+
+    async def publish(self, event: Event) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "local"}
+
+
+class UnixSocketBackend(EventBackend):
+    """
+    Workers on one host, each bound to a datagram socket in `directory`;
+    an event is sent to every other socket there. A socket nobody listens
+    on any more (its worker died) is removed, and an event a busy peer
+    has no room for is dropped rather than blocking the publisher. A new
+    worker greets the others with an empty datagram, so they see it at
+    once instead of at their next directory listing.
+    """
+
+    PEERS_TTL = 1.0  # Seconds the directory listing is reused
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.sock")
+        self.sock: Optional[socket.socket] = None
+        self._peers: List[str] = []
+        self._peers_listed = 0.0
+
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+
+    async def start(self, deliver: Callable[[Event], None]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sock.bind(self.path)
+
+        def receive() -> None:
+            while True:
+                try:
+                    payload, sender = self.sock.recvfrom(65536)
+                except BlockingIOError:
+                    return
+                if sender not in self._peers:
+                    self._peers_listed = 0.0
+                if not payload:
+                    continue
+                self.received += 1
+                try:
+                    deliver(Event.from_bytes(payload))
+                except (ValueError, KeyError):
+                    logger.warning("Ignoring a malformed event from another worker")
+
+        asyncio.get_running_loop().add_reader(self.sock.fileno(), receive)
+        self.send(b"")
+
+    def peers(self) -> List[str]:
+        now = time.monotonic()
+        if now - self._peers_listed > self.PEERS_TTL:
+            self._peers = [
+                entry.path for entry in os.scandir(self.directory)
+                if entry.name.endswith(".sock") and entry.path != self.path
+            ]
+            self._peers_listed = now
+        return self._peers
+
+    async def publish(self, event: Event) -> None:
+        self.send(event.to_bytes())
+
+    def send(self, payload: bytes) -> None:
+        for path in self.peers():
+            try:
+                self.sock.sendto(payload, path)
+                self.sent += 1
+            except OSError as e:
+                if isinstance(e, (ConnectionRefusedError, FileNotFoundError)):
+                    # The worker behind it is gone
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                    self._peers_listed = 0.0
+                self.dropped += 1
+
+    async def stop(self) -> None:
+        if self.sock is not None:
+            asyncio.get_running_loop().remove_reader(self.sock.fileno())
+            self.sock.close()
+            self.sock = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "backend": "unix",
+            "peers": len(self._peers),
+            "sent": self.sent,
+            "received": self.received,
+            "dropped": self.dropped,
+        }
+
+
+def create_backend(name: str) -> EventBackend:
+    """EVENTS_BACKEND: "local", "unix", or a "module:Class" taking no arguments"""
+    if name == "local":
+        return EventBackend()
+    if name == "unix":
+        return UnixSocketBackend(settings.EVENTS_SOCKET_DIR)
+    module, _, attribute = name.partition(":")
+    return getattr(importlib.import_module(module), attribute)()
+
+
+class EventHub:
+    """
+    In-process pub/sub behind /api/events.
+
+    Subscriptions are indexed by user, so publishing costs one push per
+    connection of each recipient however many connections are open. Each
+    connection buffers at most `buffer_size` frames (see Subscription).
+    Events published here are also handed to the backend, which delivers
+    them to the hubs of the other workers. Workers also use it to tell
+    each other about changes to their own state (broadcast()); those
+    events go to the handler registered for their type, not to clients.
+    """
+
+    def __init__(self, buffer_size: int, max_connections: int, backend: Optional[EventBackend] = None):
+        self.buffer_size = buffer_size
+        self.max_connections = max_connections
+        self._backend = backend
+        self.subscriptions: Dict[int, Set[Subscription]] = defaultdict(set)
+        self.handlers: Dict[str, Callable[[Event], None]] = {}
+        self.connections = 0
+        self.closing = False
+
+        # Metrics
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def backend(self) -> EventBackend:
+        if self._backend is None:
+            self._backend = create_backend(settings.EVENTS_BACKEND)
+        return self._backend
+
+    async def start(self) -> None:
+        self.closing = False
+        await self.backend.start(self.receive)
+
+    async def stop(self) -> None:
+        self.close()
+        await self.backend.stop()
+
+    def close(self) -> None:
+        """End every open stream (the clients reconnect to another worker)"""
+        self.closing = True
+        for subscriptions in self.subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    def subscribe(self, user_id: int) -> Optional[Subscription]:
+        """A new subscription, or None when this worker is full or stopping"""
+        if self.closing or self.connections >= self.max_connections:
+            return None
+        subscription = Subscription(user_id, self.buffer_size)
+        self.subscriptions[user_id].add(subscription)
+        self.connections += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self.subscriptions.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self.subscriptions[subscription.user_id]
+        self.connections -= 1
+
+    def on(self, type: str, handler: Callable[[Event], None]) -> None:
+        """Hand events of `type` from other workers to `handler`"""
+        self.handlers[type] = handler
+
+    def receive(self, event: Event) -> None:
+        """An event from another worker"""
+        handler = self.handlers.get(event.type)
+        if handler is None:
+            self.deliver(event)
+        else:
+            handler(event)
+
+    def deliver(self, event: Event) -> None:
+        """Push an event to this worker's connections of its recipients"""
+        for user_id in event.user_ids:
+            for subscription in self.subscriptions.get(user_id, ()):
+                if subscription.push(event.frame):
+                    self.delivered += 1
+                else:
+                    self.dropped += 1
+
+    async def publish(self, type: str, data: dict, user_ids: Iterable[int]) -> None:
+        event = Event(type, data, user_ids)
+        self.published += 1
+        self.deliver(event)
+        try:
+            await self.backend.publish(event)
+        except Exception:
+            # A notification is never worth failing the request that caused it
+            logger.exception("Could not forward event %s to other workers", type)
+
+    async def broadcast(self, type: str, data: dict) -> None:
+        """Send an event to the handlers of the other workers (no clients)"""
+        try:
+            await self.backend.publish(Event(type, data, ()))
+        except Exception:
+            logger.exception("Could not forward event %s to other workers", type)
+
+    async def stream(self, subscription: Subscription, heartbeat: float, max_seconds: float):
+        """The SSE body of one connection, ending after max_seconds or on close()"""
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield f"retry: {settings.EVENTS_RETRY_MS}\n\n".encode()
+            while not subscription.closed:
+                timeout = min(heartbeat, deadline - time.monotonic())
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(subscription.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT_FRAME
+                    continue
+                chunk = subscription.drain()
+                if chunk:
+                    yield chunk
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "users": len(self.subscriptions),
+            "max_connections": self.max_connections,
+            "buffer_size": self.buffer_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            **self.backend.stats(),
+        }
+
+
+event_hub = EventHub(settings.EVENTS_BUFFER_SIZE, settings.EVENTS_MAX_CONNECTIONS)
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+
+from ..config import settings
+
+
+@lru_cache(maxsize=None)
+def password_context():
+    """passlib's bcrypt context, imported on first use as passlib is slow to import"""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _hash(password: str) -> str:
+    return password_context().hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return password_context().verify(plain_password, hashed_password)
+
+
+class HashingOverloaded(Exception):
+    """Raised when the hashing queue is full and the call is rejected"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification in a dedicated, bounded worker pool
+    so a burst of logins cannot stall the event loop.
+
+    A job holds its pending slot until the job itself ends, not until its
+    caller stops waiting: a request cancelled mid-hash cannot stop the work
+    already running, so releasing the slot then would let real work exceed
+    max_pending.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, executor: str = "thread"):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor_type = executor
+        self._executor: Optional[Executor] = None
+
+        # Metrics (only touched from the event loop, so no locking needed)
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingOverloaded(f"{self.pending} password operations already queued")
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        future = self._get_executor().submit(func, *args)
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+
+        def done(future) -> None:
+            # Called in a pool thread; the metrics belong to the event loop
+            try:
+                loop.call_soon_threadsafe(self._finished, future, started)
+            except RuntimeError:
+                pass  # The loop is already closed (shutdown)
+
+        future.add_done_callback(done)
+        # Cancelling the caller cancels the job only if it has not started
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, future, started: float) -> None:
+        self.pending -= 1
+        if future.cancelled():
+            self.cancelled += 1
+        elif future.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+            self.total_seconds += time.perf_counter() - started
+
+    async def hash(self, password: str) -> str:
+        """Hash a password in the worker pool"""
+        return await self._run(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash in the worker pool"""
+        return await self._run(_verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Snapshot of pool size, queue depth and throughput counters"""
+        return {
+            "executor": self.executor_type,
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": min(self.pending, self.max_workers),
+            "queue_depth": max(self.pending - self.max_workers, 0),
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "avg_seconds": self.total_seconds / self.completed if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+from ..config import settings
+
+# Square variants rendered for every profile photo, by edge length in pixels
+PHOTO_SIZES = (64, 256, 512)
+
+# Pillow format name -> file extension
+PHOTO_FORMATS = {"JPEG": "jpg", "WEBP": "webp"}
+
+PHOTO_CONTENT_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+}
+
+PHOTO_URL_PREFIX = "/static/uploads/"
+
+# Room in a multipart body for the boundaries and part headers around the file
+MULTIPART_OVERHEAD = 16 * 1024
+
+# Photos uploaded with variants are stored as user_<id>_<token>.<ext>; older
+# uploads (user_<id>_profile.<ext>) have no variants
+_MANAGED_PHOTO = re.compile(r"^/static/uploads/(?P<stem>user_\d+_[0-9a-f]{12})\.\w+$")
+
+
+class InvalidImage(Exception):
+    """Raised by the worker when an upload cannot be decoded as an image"""
+
+
+def variant_name(stem: str, size: int, extension: str) -> str:
+    return f"{stem}_{size}.{extension}"
+
+
+def photo_variant_urls(photo: Optional[str]) -> Optional[Dict[str, Dict[str, str]]]:
+    """{"64": {"jpg": url, "webp": url}, ...} for a managed photo, else None"""
+    match = _MANAGED_PHOTO.match(photo or "")
+    if not match:
+        return None
+
+    stem = match.group("stem")
+    return {
+        str(size): {
+            extension: PHOTO_URL_PREFIX + variant_name(stem, size, extension)
+            for extension in PHOTO_FORMATS.values()
+        }
+        for size in PHOTO_SIZES
+    }
+
+
+def photo_files(photo: Optional[str]) -> List[str]:
+    """Paths on disk of a stored photo and its variants"""
+    if not photo or not photo.startswith(PHOTO_URL_PREFIX):
+        return []
+
+    files = [os.path.join(settings.UPLOAD_DIR, os.path.basename(photo))]
+    for sizes in (photo_variant_urls(photo) or {}).values():
+        files.extend(os.path.join(settings.UPLOAD_DIR, os.path.basename(url)) for url in sizes.values())
+    return files
+
+
+def remove_files(paths: List[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def render_variants(source_path: str, upload_dir: str, stem: str) -> List[str]:
+    """
+    Decode the upload once and write every size/format variant next to it.
+    Runs in a worker process; each file is written to a temp name and
+    renamed so readers never see a partial image.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(source_path) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            else:
+                image = image.convert("RGB")
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        raise InvalidImage(str(exc)) from None
+
+    written = []
+    for size in PHOTO_SIZES:
+        variant = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        for image_format, extension in PHOTO_FORMATS.items():
+            path = os.path.join(upload_dir, variant_name(stem, size, extension))
+            variant.save(path + ".tmp", image_format, quality=85)
+            os.replace(path + ".tmp", path)
+            written.append(path)
+
+    return written
+
+
+def _too_large_detail(max_size: int) -> str:
+    return f"File size exceeds {max_size // 1024 // 1024}MB"
+
+
+async def save_upload(file: UploadFile, path: str, max_size: int) -> int:
+    """
+    Copy an upload to path in chunks, aborting with 413 as soon as it
+    grows past max_size. File writes run in the thread pool.
+    """
+    written = 0
+    handle = await run_in_threadpool(open, path, "wb")
+    try:
+        while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > max_size:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=_too_large_detail(max_size)
+                )
+            await run_in_threadpool(handle.write, chunk)
+    except BaseException:
+        await run_in_threadpool(handle.close)
+        remove_files([path])
+        raise
+
+    await run_in_threadpool(handle.close)
+    return written
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware capping the request body of upload routes before the
+    form is parsed and spooled to disk. A Content-Length over the limit is
+    refused with 413 without reading the body; a body without one (chunked)
+    is cut off with 413 as soon as it passes the limit. save_upload still
+    checks the file itself.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits  # path -> file size limit, for POST requests
+
+    async def __call__(self, scope, receive, send):
+        limit = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            limit = self.limits.get(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        max_body = limit + MULTIPART_OVERHEAD
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > max_body:
+            # Close the connection rather than receive the rest of the body
+            response = JSONResponse(
+                {"detail": _too_large_detail(limit)},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                headers={"Connection": "close"},
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=_too_large_detail(limit),
+                        headers={"Connection": "close"},
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class PhotoProcessor:
+    """Renders photo variants in a lazily started process pool"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def render(self, source_path: str, stem: str) -> List[str]:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, render_variants, source_path, settings.UPLOAD_DIR, stem
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+photo_processor = PhotoProcessor(max_workers=settings.PHOTO_WORKERS)
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select
+
+from ..database import async_session_scope
+from ..models.skill import SkillOffered, SkillStatus, SkillWanted
+from ..models.user import User
+from .autocomplete import autocomplete_index
+from .events import Event, event_hub
+from .matching import skill_index
+
+logger = logging.getLogger(__name__)
+
+# Broadcast to the other workers after a write that changed users' index entries
+USERS_CHANGED = "indexes.users_changed"
+
+
+async def refresh_users(db, user_ids: List[int]) -> None:
+    """Replace the index entries of these users with what the database holds now"""
+    offered: Dict[int, List[str]] = defaultdict(list)
+    rows = await db.execute(
+        select(SkillOffered.user_id, SkillOffered.name).where(
+            SkillOffered.user_id.in_(user_ids),
+            SkillOffered.status == SkillStatus.APPROVED
+        )
+    )
+    for user_id, name in rows:
+        offered[user_id].append(name)
+
+    wanted: Dict[int, List[str]] = defaultdict(list)
+    rows = await db.execute(
+        select(SkillWanted.user_id, SkillWanted.name).where(SkillWanted.user_id.in_(user_ids))
+    )
+    for user_id, name in rows:
+        wanted[user_id].append(name)
+
+    users = {
+        user.id: user
+        for user in await db.execute(
+            select(User.id, User.name, User.username, User.visibility, User.is_active, User.is_banned)
+            .where(User.id.in_(user_ids))
+        )
+    }
+
+    # No awaits from here on, so no request sees a user half replaced
+    for user_id in user_ids:
+        old, new = skill_index.replace_user(user_id, offered[user_id], wanted[user_id])
+        autocomplete_index.recount_skills(old, new)
+        if user_id in users:
+            autocomplete_index.update_user(users[user_id])
+        else:
+            autocomplete_index.remove_user(user_id)
+
+
+class IndexSync:
+    """
+    Keeps the skill match and autocomplete indexes of every worker current.
+
+    A write updates the indexes of the worker that handled it, then
+    broadcasts the ids of the users it touched through the event hub. The
+    other workers reload those users' rows and replace their entries.
+    A refresh reads the current rows, so it is idempotent and order does
+    not matter: ids that arrive while the indexes are being built, or
+    that change again while being refreshed, are simply refreshed (again)
+    afterwards.
+    """
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+        self.pending: Set[int] = set()
+        self.building = False
+        self._task: Optional[asyncio.Task] = None
+        event_hub.on(USERS_CHANGED, self.receive)
+
+        # Metrics
+        self.broadcasts = 0
+        self.received = 0
+        self.refreshed = 0
+        self.failed = 0
+
+    async def build(self, db) -> None:
+        """Build both indexes from scratch; start the event hub first, so no change is missed"""
+        self.building = True
+        try:
+            await skill_index.build(db)
+            await autocomplete_index.build(db)
+        finally:
+            self.building = False
+        self._schedule()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def changed(self, *user_ids: int) -> None:
+        """Tell the other workers; call after updating this worker's indexes for the write"""
+        if self._task is not None and not self._task.done():
+            # A refresh in flight may have read these users before the write
+            self.pending.update(user_ids)
+        self.broadcasts += 1
+        await event_hub.broadcast(USERS_CHANGED, {"user_ids": sorted(set(user_ids))})
+
+    def receive(self, event: Event) -> None:
+        self.received += 1
+        self.pending.update(event.data["user_ids"])
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self.pending and not self.building and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        while self.pending:
+            user_ids = sorted(self.pending)[:self.batch_size]
+            self.pending.difference_update(user_ids)
+            try:
+                async with async_session_scope() as db:
+                    await refresh_users(db, user_ids)
+                self.refreshed += len(user_ids)
+            except Exception:
+                self.failed += len(user_ids)
+                logger.exception("Could not refresh the search index entries of %s users", len(user_ids))
+
+    def stats(self) -> dict:
+        return {
+            "broadcasts": self.broadcasts,
+            "received": self.received,
+            "pending": len(self.pending),
+            "refreshed_users": self.refreshed,
+            "failed_users": self.failed,
+        }
+
+
+index_sync = IndexSync()
@@ -0,0 +1,170 @@
+import heapq
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import select
+
+from ..models.skill import SkillOffered, SkillWanted, SkillStatus
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_skill(name: str) -> str:
+    """Canonical form used as the index term: "  Python-Programming " -> "python programming" """
+    name = unicodedata.normalize("NFKC", name).casefold()
+    return _NON_WORD.sub(" ", name).strip()
+
+
+@dataclass
+class Match:
+    user_id: int
+    they_offer: List[str]
+    they_want: List[str]
+
+    @property
+    def score(self) -> int:
+        return len(self.they_offer) + len(self.they_want)
+
+
+class _Side:
+    """term -> users holding it, and user -> terms held, both as multisets"""
+
+    def __init__(self):
+        self.users_by_term: Dict[str, Counter] = defaultdict(Counter)
+        self.terms_by_user: Dict[int, Counter] = defaultdict(Counter)
+
+    def add(self, user_id: int, name: str) -> None:
+        term = normalize_skill(name)
+        if not term:
+            return
+        self.users_by_term[term][user_id] += 1
+        self.terms_by_user[user_id][term] += 1
+
+    def remove(self, user_id: int, name: str) -> None:
+        term = normalize_skill(name)
+        users = self.users_by_term.get(term)
+        if not users or not users[user_id]:
+            return
+
+        users[user_id] -= 1
+        if users[user_id] <= 0:
+            del users[user_id]
+            if not users:
+                del self.users_by_term[term]
+
+        terms = self.terms_by_user[user_id]
+        terms[term] -= 1
+        if terms[term] <= 0:
+            del terms[term]
+            if not terms:
+                del self.terms_by_user[user_id]
+
+    def replace(self, user_id: int, names: Iterable[str]) -> Tuple[Counter, Counter]:
+        """Set a user's terms to those of `names`; (old terms, new terms)"""
+        old = self.terms_by_user.pop(user_id, Counter())
+        for term in old:
+            users = self.users_by_term[term]
+            del users[user_id]
+            if not users:
+                del self.users_by_term[term]
+        for name in names:
+            self.add(user_id, name)
+        return old, Counter(self.terms_by_user.get(user_id, ()))
+
+    def clear(self) -> None:
+        self.users_by_term.clear()
+        self.terms_by_user.clear()
+
+
+class SkillMatchIndex:
+    """
+    In-memory inverted index of approved offered skills and wanted skills.
+
+    Built once at startup and updated incrementally by the skill write
+    handlers, so a match costs a few dict lookups per skill the caller has,
+    independent of how many skills exist in total.
+    """
+
+    def __init__(self):
+        self.offered = _Side()
+        self.wanted = _Side()
+        self.ready = False
+
+    async def build(self, db) -> None:
+        self.offered.clear()
+        self.wanted.clear()
+
+        offered = await db.execute(
+            select(SkillOffered.user_id, SkillOffered.name).where(
+                SkillOffered.status == SkillStatus.APPROVED
+            )
+        )
+        for user_id, name in offered:
+            self.offered.add(user_id, name)
+
+        wanted = await db.execute(select(SkillWanted.user_id, SkillWanted.name))
+        for user_id, name in wanted:
+            self.wanted.add(user_id, name)
+
+        self.ready = True
+
+    def add_offered(self, user_id: int, name: str) -> None:
+        self.offered.add(user_id, name)
+
+    def remove_offered(self, user_id: int, name: str) -> None:
+        self.offered.remove(user_id, name)
+
+    def add_wanted(self, user_id: int, name: str) -> None:
+        self.wanted.add(user_id, name)
+
+    def remove_wanted(self, user_id: int, name: str) -> None:
+        self.wanted.remove(user_id, name)
+
+    def replace_user(self, user_id: int, offered: Iterable[str], wanted: Iterable[str]) -> Tuple[Counter, Counter]:
+        """
+        Set a user's approved offered and wanted skills at once; the user's
+        (old, new) terms over both sides, as the autocomplete index counts them
+        """
+        old_offered, new_offered = self.offered.replace(user_id, offered)
+        old_wanted, new_wanted = self.wanted.replace(user_id, wanted)
+        return old_offered + old_wanted, new_offered + new_wanted
+
+    def matches(self, user_id: int, limit: int) -> List[Match]:
+        """Users who offer something I want and want something I offer, best first"""
+        they_offer: Dict[int, List[str]] = defaultdict(list)
+        for term in self.wanted.terms_by_user.get(user_id, ()):
+            for other in self.offered.users_by_term.get(term, ()):
+                if other != user_id:
+                    they_offer[other].append(term)
+
+        they_want: Dict[int, List[str]] = defaultdict(list)
+        for term in self.offered.terms_by_user.get(user_id, ()):
+            for other in self.wanted.users_by_term.get(term, ()):
+                if other in they_offer:
+                    they_want[other].append(term)
+
+        candidates = (
+            Match(user_id=other, they_offer=sorted(they_offer[other]), they_want=sorted(terms))
+            for other, terms in they_want.items()
+        )
+
+        # Highest overlap first; prefer balanced exchanges, then older accounts
+        return heapq.nlargest(
+            limit,
+            candidates,
+            key=lambda match: (match.score, min(len(match.they_offer), len(match.they_want)), -match.user_id),
+        )
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "offered_terms": len(self.offered.users_by_term),
+            "wanted_terms": len(self.wanted.users_by_term),
+            "users": len(self.offered.terms_by_user.keys() | self.wanted.terms_by_user.keys()),
+        }
+
+
+skill_index = SkillMatchIndex()
@@ -0,0 +1,239 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Prometheus text exposition, implemented in-process: a handful of counters
+# and histograms keyed by label tuples. Everything is updated from the event
+# loop thread, so no locking is needed and recording costs a dict lookup and
+# a bisect per observation.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        registry.append(self)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values: Dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, labels: tuple, value: float) -> None:
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self.series: Dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+registry: List[Metric] = []
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in registry for line in metric.render()) + "\n"
+
+
+ROUTE_LABELS = ("method", "route")
+
+http_requests = Counter(
+    "http_requests_total", "Requests handled, by route template and status code",
+    ROUTE_LABELS + ("status",)
+)
+http_in_progress = Gauge(
+    "http_requests_in_progress", "Requests currently being handled", ("method",)
+)
+http_latency = Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ROUTE_LABELS
+)
+db_queries = Histogram(
+    "http_request_db_queries", "SQL statements executed per request", ROUTE_LABELS,
+    buckets=QUERY_COUNT_BUCKETS
+)
+db_time = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per request", ROUTE_LABELS
+)
+
+# Load shedding (app.core.shedding), by route class
+concurrency_limit = Gauge(
+    "http_concurrency_limit", "Requests of a route class admitted at once", ("route_class",)
+)
+concurrency_in_flight = Gauge(
+    "http_concurrency_in_flight", "Admitted requests still being handled", ("route_class",)
+)
+concurrency_queued = Gauge(
+    "http_concurrency_queued", "Requests waiting to be admitted", ("route_class",)
+)
+requests_shed = Counter(
+    "http_requests_shed_total", "Requests rejected with 503 (queue_full or timeout)", ("route_class", "reason")
+)
+queue_wait = Histogram(
+    "http_queue_wait_seconds", "Time queued requests waited to be admitted or shed", ("route_class",),
+    buckets=QUEUE_WAIT_BUCKETS
+)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set by the middleware for the duration of a request; SQL hooks add to it
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Stored on the per-statement context so a failed statement leaves nothing behind
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - context._metrics_started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute SQL statements run on engine to the current request (once per engine)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_template(scope) -> str:
+    """The path as declared on the route ("/api/swaps/{swap_id}"), never the raw URL"""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        # Mounted apps such as /static
+        return scope.get("root_path") or "unmatched"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and SQL usage per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_progress.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            http_in_progress.dec((method,))
+
+            labels = (method, route_template(scope))
+            http_requests.inc(labels + (str(status_code),))
+            http_latency.observe(labels, elapsed)
+            db_queries.observe(labels, stats.queries)
+            db_time.observe(labels, stats.db_seconds)
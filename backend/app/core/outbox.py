@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import or_, select, update
+
+from ..config import settings
+from ..database import async_session_scope
+from ..models.message import MessageStatus, PlatformMessage
+from ..models.user import User
+
+logger = logging.getLogger(__name__)
+
+# A sender receives the job and one batch of (id, email, name) rows
+Sender = Callable[[PlatformMessage, List[tuple]], Awaitable[None]]
+
+
+async def log_sender(job: PlatformMessage, recipients: List[tuple]) -> None:
+    # In a real application, this would send emails or push notifications
+    logger.info(
+        "Message %s '%s': delivered to users %s..%s (%s)",
+        job.id, job.title, recipients[0][0], recipients[-1][0], len(recipients)
+    )
+
+
+def recipients_filter():
+    return (User.is_active == True, User.is_banned == False)
+
+
+class MessageOutbox:
+    """
+    Delivers queued platform messages in keyset batches of active users.
+
+    A job is claimed with a lease that is renewed after every batch. If the
+    process dies, the lease expires and any worker picks the job up again at
+    last_user_id, so at most one batch is delivered twice.
+    """
+
+    def __init__(self, batch_size: int, poll_interval: float, lease_seconds: float,
+                 sender: Sender = log_sender):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease_seconds)
+        self.sender = sender
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.current_job: Optional[int] = None
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.batches = 0
+        self.delivered = 0
+        self.busy_seconds = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        """Wake the worker now instead of at the next poll"""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                while await self.process_next():
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Message outbox worker failed; retrying")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim(self, db) -> Optional[PlatformMessage]:
+        now = datetime.utcnow()
+        claimable = (
+            PlatformMessage.status.in_([MessageStatus.PENDING, MessageStatus.SENDING]),
+            or_(PlatformMessage.locked_until == None, PlatformMessage.locked_until < now),
+        )
+
+        job_id = await db.scalar(
+            select(PlatformMessage.id).where(*claimable).order_by(PlatformMessage.id).limit(1)
+        )
+        if job_id is None:
+            return None
+
+        # Conditional update, so two workers racing for the same job can't both win
+        result = await db.execute(
+            update(PlatformMessage)
+            .where(PlatformMessage.id == job_id, *claimable)
+            .values(
+                status=MessageStatus.SENDING,
+                locked_by=self.worker_id,
+                locked_until=now + self.lease,
+            )
+        )
+        await db.commit()
+        if result.rowcount != 1:
+            return None
+
+        job = await db.get(PlatformMessage, job_id, populate_existing=True)
+        if job.started_at is None:
+            job.started_at = now
+            await db.commit()
+        return job
+
+    async def process_next(self) -> bool:
+        """Deliver one claimed job to completion; False when nothing is queued"""
+        async with async_session_scope() as db:
+            job = await self._claim(db)
+            if job is None:
+                return False
+
+            self.current_job = job.id
+            try:
+                await self._deliver(db, job)
+            except Exception as exc:
+                await db.rollback()
+                await db.execute(
+                    update(PlatformMessage)
+                    .where(PlatformMessage.id == job.id, PlatformMessage.locked_by == self.worker_id)
+                    .values(status=MessageStatus.FAILED, error=str(exc), locked_until=None)
+                )
+                await db.commit()
+                self.jobs_failed += 1
+                logger.exception("Message %s failed after %s deliveries", job.id, job.delivered)
+            finally:
+                self.current_job = None
+
+        return True
+
+    async def _deliver(self, db, job: PlatformMessage) -> None:
+        last_user_id = job.last_user_id
+        while True:
+            started = time.perf_counter()
+            recipients = (await db.execute(
+                select(User.id, User.email, User.name)
+                .where(*recipients_filter(), User.id > last_user_id, User.id <= job.max_user_id)
+                .order_by(User.id)
+                .limit(self.batch_size)
+            )).all()
+
+            if not recipients:
+                await db.execute(
+                    update(PlatformMessage)
+                    .where(PlatformMessage.id == job.id, PlatformMessage.locked_by == self.worker_id)
+                    .values(
+                        status=MessageStatus.COMPLETED,
+                        completed_at=datetime.utcnow(),
+                        locked_by=None,
+                        locked_until=None,
+                    )
+                )
+                await db.commit()
+                self.jobs_completed += 1
+                return
+
+            await self.sender(job, recipients)
+            last_user_id = recipients[-1][0]
+
+            # Record progress and renew the lease; losing the lease means another
+            # worker has taken over, so stop without touching the job further
+            result = await db.execute(
+                update(PlatformMessage)
+                .where(PlatformMessage.id == job.id, PlatformMessage.locked_by == self.worker_id)
+                .values(
+                    last_user_id=last_user_id,
+                    delivered=PlatformMessage.delivered + len(recipients),
+                    locked_until=datetime.utcnow() + self.lease,
+                )
+            )
+            await db.commit()
+
+            self.batches += 1
+            self.delivered += len(recipients)
+            self.busy_seconds += time.perf_counter() - started
+
+            if result.rowcount != 1:
+                logger.warning("Lost the lease on message %s", job.id)
+                return
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "current_job": self.current_job,
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "batches": self.batches,
+            "delivered": self.delivered,
+            "delivered_per_second": self.delivered / self.busy_seconds if self.busy_seconds else 0.0,
+        }
+
+
+message_outbox = MessageOutbox(
+    batch_size=settings.MESSAGE_BATCH_SIZE,
+    poll_interval=settings.MESSAGE_POLL_INTERVAL,
+    lease_seconds=settings.MESSAGE_LEASE_SECONDS,
+)
@@ -0,0 +1,70 @@
+import base64
+import json
+from typing import Any, Tuple, Union
+
+from fastapi import HTTPException, status
+from sqlalchemy import String, literal, tuple_, type_coerce
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _has_type(value: Any, expected: Union[type, Tuple[type, ...]]) -> bool:
+    # JSON true/false decode to bool, which is an int subclass
+    return isinstance(value, expected) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str, types: Tuple[Union[type, Tuple[type, ...]], ...]) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor, rejecting malformed input:
+    it must hold one value per entry of types, each an instance of it
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        or not all(_has_type(value, expected) for value, expected in zip(values, types))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    return tuple(values)
+
+
+async def paginate_newest_first(db, query, model, limit: int, cursor=None) -> dict:
+    """
+    Keyset-paginate an ORM query on (created_at, id), newest first.
+
+    The cursor carries created_at exactly as stored, so the comparison is
+    made against the raw column and stays index-friendly and exact.
+    """
+    sort_key = type_coerce(model.created_at, String)
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, (str, int))
+        query = query.where(
+            tuple_(sort_key, model.id) < tuple_(literal(created_at, String), literal(row_id))
+        )
+
+    query = query.add_columns(sort_key.label("cursor_created_at")).order_by(
+        model.created_at.desc(), model.id.desc()
+    ).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, last_created_at = rows[-1]
+        next_cursor = encode_cursor(last_created_at, last.id)
+
+    return {"items": [row[0] for row in rows], "next_cursor": next_cursor}
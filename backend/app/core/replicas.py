@@ -0,0 +1,196 @@
+import hashlib
+import itertools
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import Headers
+
+from ..config import settings
+from ..database import (
+    SyncSessionAdapter, apply_sqlite_pragmas, async_database_url, async_session_scope,
+    connect_args, sqlite_pragmas
+)
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def replica_pragmas() -> list:
+    """The connection profile minus the journal mode, which only the primary sets, plus query_only"""
+    pragmas = [(name, value) for name, value in sqlite_pragmas() if name != "journal_mode"]
+    return pragmas + [("query_only", "ON")]
+
+
+class Replica:
+    """Engines and session factories for one read-only database"""
+
+    def __init__(self, url: str):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = create_engine(url, connect_args=connect_args(url))
+        self.async_engine = create_async_engine(async_database_url(url))
+        if settings.SQLITE_PRAGMAS:
+            apply_sqlite_pragmas(self.engine, replica_pragmas())
+            apply_sqlite_pragmas(self.async_engine.sync_engine, replica_pragmas())
+
+        self.SessionLocal = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+        self.AsyncSessionLocal = async_sessionmaker(
+            bind=self.async_engine, autoflush=False, expire_on_commit=False
+        )
+
+        self.down_until = 0.0
+        self.sessions = 0
+        self.failures = 0
+
+    def session(self):
+        if settings.DB_ASYNC:
+            return self.AsyncSessionLocal()
+        return SyncSessionAdapter(self.SessionLocal())
+
+
+def _caller_key(authorization: str) -> bytes:
+    # Keep digests rather than bearer tokens in memory
+    return hashlib.blake2b(authorization.encode(), digest_size=16).digest()
+
+
+class ReadRouter:
+    """
+    Picks the database for read-only sessions.
+
+    Replicas take turns (round-robin). One that fails to connect is skipped
+    for `retry_seconds`, and when none is available the read goes to the
+    primary. Callers who wrote within the last `pin_seconds` (recognised by
+    their Authorization header, see ReadYourWritesMiddleware) read from the
+    primary too, so replication lag never hides their own changes. Pins are
+    per worker process.
+    """
+
+    def __init__(self, urls: List[str], retry_seconds: float, pin_seconds: float):
+        self.urls = urls
+        self._replicas: Optional[List[Replica]] = None
+        self.retry_seconds = retry_seconds
+        self.pin_seconds = pin_seconds
+        self._turn = itertools.count()
+        self._pinned: "OrderedDict[bytes, float]" = OrderedDict()  # caller -> pinned until, oldest first
+        self.primary_reads = 0
+
+    @property
+    def replicas(self) -> List[Replica]:
+        """A Replica per URL, created on first use"""
+        if self._replicas is None:
+            self._replicas = [Replica(url) for url in self.urls]
+        return self._replicas
+
+    def pin(self, authorization: str) -> None:
+        now = time.monotonic()
+        key = _caller_key(authorization)
+        self._pinned.pop(key, None)
+        self._pinned[key] = now + self.pin_seconds
+
+        # Every pin lasts as long, so the expired ones are at the front
+        while self._pinned:
+            key, until = next(iter(self._pinned.items()))
+            if until > now:
+                break
+            del self._pinned[key]
+
+    def is_pinned(self, authorization: Optional[str]) -> bool:
+        if not authorization or not self._pinned:
+            return False
+        until = self._pinned.get(_caller_key(authorization))
+        return until is not None and until > time.monotonic()
+
+    def candidates(self) -> List[Replica]:
+        """Available replicas, starting from the one whose turn it is"""
+        if not self.replicas:
+            return []
+        start = next(self._turn) % len(self.replicas)
+        now = time.monotonic()
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.down_until <= now]
+
+    @asynccontextmanager
+    async def session(self, authorization: Optional[str] = None):
+        if not self.is_pinned(authorization):
+            for replica in self.candidates():
+                db = replica.session()
+                try:
+                    # Connect now, so an unavailable replica is skipped before any query runs
+                    await db.connection()
+                except (DBAPIError, OSError):
+                    await db.close()
+                    replica.failures += 1
+                    replica.down_until = time.monotonic() + self.retry_seconds
+                    continue
+
+                replica.sessions += 1
+                try:
+                    yield db
+                finally:
+                    await db.close()
+                return
+
+        self.primary_reads += 1
+        async with async_session_scope() as db:
+            yield db
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "replicas": [
+                {
+                    "url": replica.name,
+                    "available": replica.down_until <= now,
+                    "sessions": replica.sessions,
+                    "failures": replica.failures,
+                }
+                for replica in self.replicas
+            ],
+            "primary_reads": self.primary_reads,
+            "pinned_callers": len(self._pinned),
+        }
+
+
+read_router = ReadRouter(
+    settings.READ_REPLICA_URLS, settings.READ_REPLICA_RETRY_SECONDS, settings.READ_YOUR_WRITES_SECONDS
+)
+
+
+async def get_read_db(request: Request):
+    """
+    Get a read-only database session for GET routes that tolerate
+    replication lag; the primary when no replica is configured or available
+    """
+    async with read_router.session(request.headers.get("authorization")) as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware pinning callers to the primary after a successful write"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        authorization = Headers(scope=scope).get("authorization")
+        if authorization is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            # Before the client sees the response, so its next read is pinned
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                read_router.pin(authorization)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,121 @@
+from typing import Dict, Tuple
+
+from sqlalchemy import Float, bindparam, case, func, literal_column, or_, select, update
+from sqlalchemy.engine import Connection
+
+from ..models.swap import Feedback
+from ..models.user import User
+
+# Histogram columns on users, by star
+STAR_COLUMNS = {
+    1: User.rating_1,
+    2: User.rating_2,
+    3: User.rating_3,
+    4: User.rating_4,
+    5: User.rating_5,
+}
+
+# Average rating, NULL for users nobody has rated yet. Spelled out in SQL to
+# match the ix_users_rating expression index (migration 0007) exactly, which
+# the operator form would not (it adds a cast and binds the 0)
+rating_mean = literal_column("(users.rating_sum / nullif(users.rating_count, 0))", Float)
+
+
+def star(rating: float) -> int:
+    """The histogram bucket for a rating: 1-5, rounded half up"""
+    return min(5, max(1, int(rating + 0.5)))
+
+
+def star_expression(rating):
+    """star() in SQL, written with CASE so it behaves the same on every backend"""
+    return case(
+        (rating < 1.5, 1), (rating < 2.5, 2), (rating < 3.5, 3), (rating < 4.5, 4),
+        else_=5
+    )
+
+
+def record_rating(receiver_id: int, rating: float):
+    """
+    Statement adding one rating to the receiver's aggregates. It increments
+    in SQL rather than read-modify-write, so concurrent feedback for the same
+    user cannot lose updates; run it in the transaction creating the feedback.
+    """
+    column = STAR_COLUMNS[star(rating)]
+    return (
+        update(User)
+        .where(User.id == receiver_id)
+        .values({
+            User.rating_count: User.rating_count + 1,
+            User.rating_sum: User.rating_sum + rating,
+            column: column + 1,
+        })
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rating_order(rating_sum: float, rating_count: int) -> Tuple:
+    """Sort key, ascending: rated users first, then by mean and number of ratings"""
+    if not rating_count:
+        return (1, 0.0, 0)
+    return (0, -rating_sum / rating_count, -rating_count)
+
+
+# (count, sum, stars 1-5) for one user
+Aggregates = Tuple[int, float, int, int, int, int, int]
+
+_EMPTY: Aggregates = (0, 0.0, 0, 0, 0, 0, 0)
+
+
+def compute_aggregates(connection: Connection) -> Dict[int, Aggregates]:
+    """Recompute every user's aggregates from the feedback table, in one pass"""
+    bucket = star_expression(Feedback.rating)
+    rows = connection.execute(
+        select(
+            Feedback.receiver_id,
+            func.count(),
+            func.sum(Feedback.rating),
+            *(func.sum(case((bucket == n, 1), else_=0)) for n in STAR_COLUMNS),
+        ).group_by(Feedback.receiver_id)
+    )
+    return {row[0]: (row[1], float(row[2]), *row[3:]) for row in rows}
+
+
+def read_aggregates(connection: Connection) -> Dict[int, Aggregates]:
+    """Stored aggregates of every user that has any"""
+    rows = connection.execute(
+        select(User.id, User.rating_count, User.rating_sum, *STAR_COLUMNS.values()).where(
+            or_(User.rating_count != 0, User.rating_sum != 0)
+        )
+    )
+    return {row[0]: (row[1], float(row[2]), *row[3:]) for row in rows}
+
+
+def _same(a: Aggregates, b: Aggregates) -> bool:
+    # Sums are compared loosely as they may have been added in another order
+    return a[0] == b[0] and abs(a[1] - b[1]) < 1e-6 and a[2:] == b[2:]
+
+
+def rebuild(connection: Connection, dry_run: bool = False) -> Dict[int, Tuple[Aggregates, Aggregates]]:
+    """
+    Compare stored aggregates with a full recomputation and, unless
+    dry_run, overwrite them. Returns {user_id: (stored, actual)} for users
+    whose aggregates drifted.
+    """
+    stored = read_aggregates(connection)
+    actual = compute_aggregates(connection)
+
+    drift = {}
+    for user_id in stored.keys() | actual.keys():
+        old, new = stored.get(user_id, _EMPTY), actual.get(user_id, _EMPTY)
+        if not _same(old, new):
+            drift[user_id] = (old, new)
+
+    if not dry_run and drift:
+        columns = ["rating_count", "rating_sum", *(column.key for column in STAR_COLUMNS.values())]
+        statement = User.__table__.update().where(User.__table__.c.id == bindparam("user_key"))
+        connection.execute(statement, [
+            {"user_key": user_id, **dict(zip(columns, new))}
+            for user_id, (_, new) in drift.items()
+        ])
+
+    return drift
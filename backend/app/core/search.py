@@ -0,0 +1,175 @@
+import functools
+import re
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, text
+
+from ..models.skill import SkillStatus
+from ..models.user import ProfileVisibility
+from .matching import normalize_skill
+
+# One FTS5 index (skills_fts, created by migration 0002) covers both skill
+# tables. The rowid encodes the source row: skills_offered.id * 2 for offered
+# skills, skills_wanted.id * 2 + 1 for wanted skills, so triggers and joins
+# address the index by rowid instead of scanning.
+#
+# Matches in the skill name weigh ten times more than matches in the description
+SKILL_SEARCH_SQL = """
+    SELECT
+        f.rowid AS fts_rowid,
+        bm25(skills_fts, 10.0, 1.0) AS score,
+        CASE f.rowid & 1 WHEN 0 THEN 'offered' ELSE 'wanted' END AS skill_type,
+        f.rowid >> 1 AS skill_id,
+        f.name AS name,
+        f.description AS description,
+        u.id AS user_id,
+        u.username AS username,
+        u.name AS user_name
+    FROM skills_fts AS f
+    LEFT JOIN skills_offered AS so
+        ON (f.rowid & 1) = 0 AND so.id = f.rowid >> 1 AND so.status = :approved
+    LEFT JOIN skills_wanted AS sw
+        ON (f.rowid & 1) = 1 AND sw.id = f.rowid >> 1
+    JOIN users AS u
+        ON u.id = coalesce(so.user_id, sw.user_id)
+    WHERE skills_fts MATCH :match
+        AND u.is_active = 1
+        AND u.is_banned = 0
+        {filters}
+    ORDER BY score, fts_rowid
+    LIMIT :limit
+"""
+
+SKILL_TYPE_PARITY = {"offered": 0, "wanted": 1}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query: every word must match, and the last
+    word matches as a prefix so results update while the user is typing.
+    """
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return None
+
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def build_skill_search(
+    match: str,
+    skill_type: Optional[str],
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+):
+    """Build the ranked, keyset-paginated search statement and its parameters"""
+    filters: List[str] = []
+    params = {"match": match, "approved": SkillStatus.APPROVED.name, "limit": limit}
+
+    if skill_type:
+        filters.append("AND (f.rowid & 1) = :parity")
+        params["parity"] = SKILL_TYPE_PARITY[skill_type]
+
+    if after is not None:
+        filters.append("AND (bm25(skills_fts, 10.0, 1.0), f.rowid) > (:after_score, :after_rowid)")
+        params["after_score"], params["after_rowid"] = after
+
+    statement = text(SKILL_SEARCH_SQL.format(filters="\n        ".join(filters)))
+    return statement, params
+
+
+# Typo-tolerant user search over users_fts (migration 0006), a trigram index
+# of names and usernames with every word padded as "  word ". Users sharing
+# any of the query's trigrams are candidates; bm25 keeps the pool to those
+# sharing the most (and rarest), which are then re-ranked by similarity in
+# Python. bm25 costs a little for every user matched, so trigrams found in
+# many users (like "  j" for every John and Jane) are left out of the match
+# once the rarer ones already cover enough users, see select_trigrams.
+USER_SEARCH_SQL = """
+    SELECT f.rowid AS user_id, u.name AS name, u.username AS username,
+        u.rating_sum AS rating_sum, u.rating_count AS rating_count
+    FROM users_fts AS f
+    JOIN users AS u ON u.id = f.rowid
+    WHERE users_fts MATCH :match
+        AND u.visibility = :public
+        AND u.is_active = 1
+        AND u.is_banned = 0
+    ORDER BY bm25(users_fts), f.rowid
+    LIMIT :limit
+"""
+
+TRIGRAM_FREQUENCY_SQL = text(
+    "SELECT term, doc FROM users_fts_vocab WHERE term IN :terms"
+).bindparams(bindparam("terms", expanding=True))
+
+# Users matched per candidate slot before common trigrams are dropped
+TRIGRAM_BUDGET_FACTOR = 10
+
+
+# Names repeat a lot (first names, surnames), so both steps are memoized
+@functools.lru_cache(maxsize=65536)
+def name_words(value: str) -> Tuple[str, ...]:
+    """Normalized words of a name or search query"""
+    return tuple(normalize_skill(value).split())
+
+
+@functools.lru_cache(maxsize=65536)
+def trigrams(word: str) -> FrozenSet[str]:
+    """Trigrams of one normalized word, padded the way users_fts stores it"""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def word_similarity(query: str, word: str) -> float:
+    """
+    Dice coefficient over padded trigrams, so "jonh" scores 0.4 against
+    "john". A word the query is contained in scores at least the fraction
+    of it that was typed, keeping substring matches like "ank" in "sanket".
+    """
+    if query == word:
+        return 1.0
+    a, b = trigrams(query), trigrams(word)
+    score = 2 * len(a & b) / (len(a) + len(b))
+    if query in word:
+        score = max(score, len(query) / len(word))
+    return score
+
+
+def name_similarity(query_words: Sequence[str], name: str, username: str) -> float:
+    """Mean over the query's words of their best match among the user's words"""
+    words = name_words(name) + name_words(username)
+    if not query_words or not words:
+        return 0.0
+    return sum(max(word_similarity(q, w) for w in words) for q in query_words) / len(query_words)
+
+
+def select_trigrams(frequencies: Dict[str, int], budget: int) -> List[str]:
+    """
+    Rarest trigrams first, stopping before the users they match add up to
+    more than budget. The rarest one that matches anybody is always kept.
+    """
+    selected, total = [], 0
+    for gram, count in sorted(frequencies.items(), key=lambda item: (item[1], item[0])):
+        if count and total + count > budget and total:
+            break
+        selected.append(gram)
+        total += count
+    return selected
+
+
+async def find_user_candidates(db, query_words: Sequence[str], pool: int):
+    """Up to pool visible users sharing the query's most selective trigrams"""
+    grams = sorted(set().union(*(trigrams(word) for word in query_words)))
+    frequencies = dict.fromkeys(grams, 0)
+    frequencies.update((await db.execute(TRIGRAM_FREQUENCY_SQL, {"terms": grams})).all())
+
+    selected = select_trigrams(frequencies, pool * TRIGRAM_BUDGET_FACTOR)
+    if not any(frequencies[gram] for gram in selected):
+        return []
+
+    match = " OR ".join('"' + gram.replace('"', '""') + '"' for gram in selected)
+    params = {"match": match, "public": ProfileVisibility.PUBLIC.name, "limit": pool}
+    return (await db.execute(text(USER_SEARCH_SQL), params)).all()
@@ -0,0 +1,64 @@
+import functools
+import inspect
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from ..config import settings
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Name of the Response parameter injected into wrapped endpoints, used to carry
+# headers set by dependencies (e.g. ETag) over to the rendered response
+_SUB_RESPONSE = "fast_json_sub_response"
+
+
+def render_json(adapter: TypeAdapter, content: Any) -> bytes:
+    """
+    Validate ORM objects (or dicts of them) into the response type and dump
+    them straight to JSON bytes in pydantic-core, in one pass each.
+
+    Produces the same bytes as FastAPI's response_model path, which instead
+    dumps to Python objects and re-encodes them with the stdlib json module.
+    """
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+
+
+def fast_json(response_type: Any, status_code: int = 200):
+    """
+    Opt an endpoint into the fast serializer for response_type, which should
+    match the route's response_model (still used for the OpenAPI schema).
+
+    Disabled globally with FAST_JSON_RESPONSES=false, which leaves the
+    endpoint untouched so both paths can be compared.
+    """
+    adapter = TypeAdapter(response_type)
+
+    def decorator(endpoint):
+        if not settings.FAST_JSON_RESPONSES:
+            return endpoint
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            sub_response: Response = kwargs.pop(_SUB_RESPONSE)
+            content = await endpoint(*args, **kwargs)
+            if isinstance(content, Response):
+                return content
+
+            response = Response(
+                render_json(adapter, content),
+                status_code=sub_response.status_code or status_code,
+                media_type=JSON_MEDIA_TYPE,
+            )
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+
+        signature = inspect.signature(endpoint)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter(_SUB_RESPONSE, inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+        ])
+        return wrapper
+
+    return decorator
@@ -0,0 +1,204 @@
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from ..config import settings
+from .metrics import (
+    concurrency_in_flight, concurrency_limit, concurrency_queued, queue_wait, requests_shed
+)
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# (class, read-only?, path pattern); the first match wins. Requests matching
+# none (health, metrics, event streams, exports, single-object reads) are
+# never limited: they are cheap, or long-lived by design.
+ROUTE_CLASSES: List[Tuple[str, Optional[bool], "re.Pattern"]] = [
+    ("auth", None, re.compile(r"^/api/auth/")),
+    ("search", True, re.compile(r"^/api/(users/?|skills/search|autocomplete|matches)$")),
+    ("listings", True, re.compile(
+        r"^/api/(swaps(/sent|/received|/feedback/received|/feedback/given)?"
+        r"|skills/(offered|wanted)|admin/(users|swaps|skills/pending|messages))$"
+    )),
+    ("writes", False, re.compile(r"^/api/")),
+]
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    read_only = method in SAFE_METHODS
+    for name, reads, pattern in ROUTE_CLASSES:
+        if (reads is None or reads == read_only) and pattern.match(path):
+            return name
+    return None
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ConcurrencyLimit:
+    """
+    At most `limit` requests of a class in flight, and at most `queue_size`
+    waiting for a slot, each for no longer than `timeout` seconds. Beyond
+    that requests are rejected at once, so under overload the queue (and
+    the latency it adds) stays bounded instead of growing until clients
+    time out.
+
+    Waiters are admitted oldest first, until the queue has not been empty
+    for `timeout` seconds: then the overload is sustained, the oldest
+    waiters are the likeliest to be abandoned by their clients anyway, and
+    the newest are admitted first (adaptive LIFO).
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiters: deque = deque()
+        self.last_empty = time.monotonic()
+
+        # Metrics (only touched from the event loop, so no locking needed)
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.lifo_admissions = 0
+        concurrency_limit.set((name,), limit)
+
+    def _set_gauges(self) -> None:
+        concurrency_in_flight.set((self.name,), self.in_flight)
+        concurrency_queued.set((self.name,), len(self.waiters))
+
+    def _shed(self, reason: str) -> Overloaded:
+        requests_shed.inc((self.name, reason))
+        return Overloaded(reason)
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.limit and not self.waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            self._set_gauges()
+            return
+
+        if len(self.waiters) >= self.queue_size:
+            self.rejected += 1
+            raise self._shed("queue_full")
+
+        if not self.waiters:
+            self.last_empty = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.queued += 1
+        self._set_gauges()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise self._shed("timeout")
+        except BaseException:
+            # Cancelled (client gone) just as release() handed us the slot
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self.waiters.remove(waiter)
+                except ValueError:
+                    pass
+            queue_wait.observe((self.name,), time.perf_counter() - started)
+            self._set_gauges()
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        now = time.monotonic()
+        lifo = now - self.last_empty > self.timeout
+        while self.waiters:
+            waiter = self.waiters.pop() if lifo else self.waiters.popleft()
+            if waiter.done():
+                continue
+            waiter.set_result(None)
+            self.in_flight += 1
+            self.admitted += 1
+            self.lifo_admissions += lifo
+            break
+        if not self.waiters:
+            self.last_empty = now
+        self._set_gauges()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "queue_timeout_seconds": self.timeout,
+            "in_flight": self.in_flight,
+            "waiting": len(self.waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected,
+            "rejected_timeout": self.timed_out,
+            "lifo_admissions": self.lifo_admissions,
+        }
+
+
+class LoadShedder:
+    """The ConcurrencyLimit of every configured route class"""
+
+    def __init__(self, limits: Dict[str, int], queue_sizes: Dict[str, int], timeouts: Dict[str, float]):
+        self.limits = {
+            name: ConcurrencyLimit(name, limit, queue_sizes.get(name, 0), timeouts.get(name, 0.0))
+            for name, limit in limits.items()
+        }
+
+    def limit_for(self, method: str, path: str) -> Optional[ConcurrencyLimit]:
+        name = route_class(method, path)
+        return self.limits.get(name) if name is not None else None
+
+    def stats(self) -> dict:
+        return {name: limit.stats() for name, limit in self.limits.items()}
+
+
+load_shedder = LoadShedder(
+    settings.CONCURRENCY_LIMITS, settings.CONCURRENCY_QUEUE_SIZES, settings.CONCURRENCY_QUEUE_TIMEOUTS
+)
+
+
+class LoadSheddingMiddleware:
+    """ASGI middleware admitting requests through their route class's ConcurrencyLimit"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        limit = None
+        if scope["type"] == "http":
+            limit = load_shedder.limit_for(scope["method"], scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limit.acquire()
+        except Overloaded as e:
+            response = JSONResponse(
+                {"detail": "Server is busy, please try again shortly"},
+                status_code=503,
+                headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER), "X-Load-Shed": e.reason},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limit.release()
@@ -0,0 +1,94 @@
+from typing import Dict
+
+from sqlalchemy import func, select, union, update
+from sqlalchemy.engine import Connection
+
+from ..models.skill import SkillOffered, SkillWanted
+from ..models.stats import PlatformCounter
+from ..models.swap import Swap, SwapStatus
+from ..models.user import User
+
+# Counter names as written by the triggers in migration 0004. Swap counters
+# are keyed by the stored enum name, e.g. "swaps_PENDING".
+USERS = "users"
+ACTIVE_USERS = "active_users"
+SKILLS_OFFERED = "skills_offered"
+SKILLS_WANTED = "skills_wanted"
+SWAPS_PREFIX = "swaps_"
+
+
+def swap_counter(status: SwapStatus) -> str:
+    return f"{SWAPS_PREFIX}{status.name}"
+
+
+def stats_from_counters(counters: Dict[str, int]) -> dict:
+    """Shape counter rows into the admin stats response"""
+    swaps_by_status = {
+        status.value: counters.get(swap_counter(status), 0) for status in SwapStatus
+    }
+
+    return {
+        "total_users": counters.get(USERS, 0),
+        "active_users": counters.get(ACTIVE_USERS, 0),
+        "total_skills_offered": counters.get(SKILLS_OFFERED, 0),
+        "total_skills_wanted": counters.get(SKILLS_WANTED, 0),
+        "swaps_by_status": swaps_by_status,
+        "total_swaps": sum(swaps_by_status.values())
+    }
+
+
+def compute_counters(connection: Connection) -> Dict[str, int]:
+    """Recompute every counter from the base tables"""
+    counters = {
+        USERS: connection.scalar(select(func.count()).select_from(User)),
+        SKILLS_OFFERED: connection.scalar(select(func.count()).select_from(SkillOffered)),
+        SKILLS_WANTED: connection.scalar(select(func.count()).select_from(SkillWanted)),
+    }
+
+    # One pass over swaps for all statuses
+    counters.update({swap_counter(status): 0 for status in SwapStatus})
+    for status, count in connection.execute(
+        select(Swap.status, func.count()).group_by(Swap.status)
+    ):
+        if status is not None:
+            counters[swap_counter(status)] = count
+
+    participants = union(
+        select(Swap.requester_id.label("user_id")),
+        select(Swap.provider_id.label("user_id")),
+    ).subquery()
+    counters[ACTIVE_USERS] = connection.scalar(
+        select(func.count()).select_from(participants)
+    )
+
+    return counters
+
+
+def read_counters(connection: Connection) -> Dict[str, int]:
+    return dict(connection.execute(select(PlatformCounter.name, PlatformCounter.value)).all())
+
+
+def recount(connection: Connection, dry_run: bool = False) -> Dict[str, tuple]:
+    """
+    Compare stored counters with a full recomputation and, unless dry_run,
+    overwrite them. Returns {name: (stored, actual)} for counters that drifted.
+    """
+    stored = read_counters(connection)
+    actual = compute_counters(connection)
+
+    drift = {
+        name: (stored.get(name), value)
+        for name, value in actual.items()
+        if stored.get(name) != value
+    }
+
+    if not dry_run:
+        for name, (stored_value, value) in drift.items():
+            if stored_value is None:
+                connection.execute(PlatformCounter.__table__.insert().values(name=name, value=value))
+            else:
+                connection.execute(
+                    update(PlatformCounter).where(PlatformCounter.name == name).values(value=value)
+                )
+
+    return drift
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import os
+import time
+from typing import List, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
+
+from ..config import settings
+from ..database import async_session_scope, engines
+from ..models.user import User
+from .cache import Principal, principal_cache
+from .replicas import read_router
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "alembic.ini")
+
+HEARTBEAT_INTERVAL = 1.0  # Seconds
+
+# Worker table columns, and the states a slot goes through
+FIELDS = ("pid", "state", "generation", "started", "heartbeat")
+FREE, STARTING, READY, STOPPING = 0, 1, 2, 3
+STATE_NAMES = {STARTING: "starting", READY: "ready", STOPPING: "stopping"}
+
+
+class WorkerTable:
+    """
+    Status of every worker process, in shared memory (a flat
+    multiprocessing Array of doubles, one row of FIELDS per slot). The
+    launcher (app.serve) allocates it and assigns slots; each worker keeps
+    its own row up to date, and any of them can read the whole table.
+    """
+
+    def __init__(self, array):
+        self.array = array
+        self.slots = len(array) // len(FIELDS)
+
+    @classmethod
+    def create(cls, slots: int, context) -> "WorkerTable":
+        return cls(context.Array("d", slots * len(FIELDS)))
+
+    def get(self, slot: int) -> dict:
+        start = slot * len(FIELDS)
+        with self.array.get_lock():
+            values = self.array[start:start + len(FIELDS)]
+        return dict(zip(FIELDS, values))
+
+    def update(self, slot: int, **values) -> None:
+        start = slot * len(FIELDS)
+        with self.array.get_lock():
+            for name, value in values.items():
+                self.array[start + FIELDS.index(name)] = value
+
+    def clear(self, slot: int) -> None:
+        self.update(slot, **{name: 0 for name in FIELDS})
+
+    def free_slot(self) -> Optional[int]:
+        for slot in range(self.slots):
+            if self.get(slot)["state"] == FREE:
+                return slot
+        return None
+
+    def rows(self) -> List[dict]:
+        now = time.time()
+        rows = []
+        for slot in range(self.slots):
+            row = self.get(slot)
+            if row["state"] == FREE:
+                continue
+            rows.append({
+                "slot": slot,
+                "pid": int(row["pid"]),
+                "state": STATE_NAMES[int(row["state"])],
+                "generation": int(row["generation"]),
+                "uptime_seconds": round(now - row["started"], 1),
+                "heartbeat_age_seconds": round(now - row["heartbeat"], 1),
+            })
+        return rows
+
+
+class WorkerState:
+    """
+    This process's lifecycle: ready once the startup warmup has finished,
+    then heartbeating into its WorkerTable row when run by app.serve. Under
+    plain uvicorn there is no table and only this process is reported.
+    """
+
+    def __init__(self):
+        self.table: Optional[WorkerTable] = None
+        self.slot: Optional[int] = None
+        self.generation = 0
+        self.started = time.time()
+        self.ready = False
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def attach(self, table: WorkerTable, slot: int, generation: int) -> None:
+        self.table, self.slot, self.generation = table, slot, generation
+        table.update(slot, pid=os.getpid(), started=self.started, heartbeat=time.time())
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        if self.table is not None:
+            self.table.update(self.slot, state=READY, heartbeat=time.time())
+            self._heartbeat = asyncio.create_task(self._beat())
+
+    async def _beat(self) -> None:
+        # Runs on the event loop, so a stalled loop shows as a stale heartbeat
+        while True:
+            self.table.update(self.slot, heartbeat=time.time())
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    async def stop(self) -> None:
+        self.ready = False
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+
+    def health(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "slot": self.slot,
+            "generation": self.generation,
+            "ready": self.ready,
+            "uptime_seconds": round(time.time() - self.started, 1),
+        }
+
+    def workers(self) -> List[dict]:
+        if self.table is None:
+            return [self.health()]
+        return self.table.rows()
+
+
+worker_state = WorkerState()
+
+
+async def check_schema() -> None:
+    """Refuse to start on a database that is not at the migrations' head"""
+    # Alembic is only needed here, so keep it out of the import of the app
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory.from_config(Config(ALEMBIC_INI))
+    expected = set(script.get_heads())
+
+    def current_heads(connection):
+        return set(MigrationContext.configure(connection).get_current_heads())
+
+    async with engines().async_engine.connect() as connection:
+        current = await connection.run_sync(current_heads)
+
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at {sorted(current) or 'no revision'}, expected {sorted(expected)}; "
+            "run `alembic upgrade head`"
+        )
+
+
+async def _open_async(target, count: int) -> None:
+    connections = [await target.connect() for _ in range(count)]
+    for connection in connections:
+        await connection.execute(text("SELECT 1"))
+        await connection.close()
+
+
+def _open_sync(target, count: int) -> None:
+    connections = [target.connect() for _ in range(count)]
+    for connection in connections:
+        connection.execute(text("SELECT 1"))
+        connection.close()
+
+
+async def open_connections(count: int) -> None:
+    """Fill the connection pools the routers will use, replicas included"""
+    if settings.DB_ASYNC:
+        await _open_async(engines().async_engine, count)
+    else:
+        _open_sync(engines().engine, count)
+
+    for replica in read_router.replicas:
+        try:
+            if settings.DB_ASYNC:
+                await _open_async(replica.async_engine, count)
+            else:
+                _open_sync(replica.engine, count)
+        except (DBAPIError, OSError) as e:
+            # Not fatal: the read router falls back to the primary
+            logger.warning("Replica %s unavailable during warmup: %s", replica.name, e)
+
+
+def load_deferred_modules() -> None:
+    """Import what the app defers to first use (JWT, bcrypt), so no request pays for it"""
+    import jose.jwt  # noqa: F401
+
+    from .hashing import password_context
+    password_context()
+
+
+async def warm_principals(limit: int) -> int:
+    """Cache the principals of the most recently active users"""
+    if limit <= 0:
+        return 0
+
+    async with async_session_scope() as db:
+        rows = (await db.execute(
+            select(User.id, User.role, User.is_active, User.is_banned)
+            .order_by(func.coalesce(User.updated_at, User.created_at).desc())
+            .limit(min(limit, settings.PRINCIPAL_CACHE_SIZE))
+        )).all()
+
+    for row in rows:
+        principal_cache.put(Principal(
+            id=row.id,
+            role=row.role,
+            is_active=row.is_active,
+            is_banned=row.is_banned,
+            version=principal_cache.version(row.id)
+        ))
+    return len(rows)
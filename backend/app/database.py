@@ -1,35 +1,246 @@
-from sqlalchemy import create_engine
+from typing import List, Optional, Tuple
+
+from sqlalchemy import DateTime, create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from contextlib import contextmanager
+from sqlalchemy.sql.expression import FunctionElement
+from contextlib import asynccontextmanager, contextmanager
 
 from .config import settings
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL, connect_args={"check_same_thread": False}
-)
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def sqlite_pragmas() -> List[Tuple[str, object]]:
+    """The configured connection profile as (pragma, value), in the order it is set"""
+    return [
+        # First, so switching the journal mode waits for other connections
+        ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT),
+        ("journal_mode", settings.SQLITE_JOURNAL_MODE),
+        ("synchronous", settings.SQLITE_SYNCHRONOUS),
+        ("cache_size", settings.SQLITE_CACHE_SIZE),
+        ("mmap_size", settings.SQLITE_MMAP_SIZE),
+        ("temp_store", settings.SQLITE_TEMP_STORE),
+        ("foreign_keys", "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF"),
+    ]
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: List[Tuple[str, object]]) -> None:
+    """Set pragmas on every new DBAPI connection of engine; no-op for other databases"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    statements = [f"PRAGMA {name} = {value}" for name, value in pragmas]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+
+def connect_args(url: str) -> dict:
+    """Driver arguments for a sync URL; SQLite connections are shared across threads"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"check_same_thread": False}
+    return {}
+
+
+# Async drivers for the sync URLs we accept in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """The same database as a sync URL, on its async driver"""
+    url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def get_async_database_url() -> str:
+    """Async URL, either configured explicitly or derived from DATABASE_URL"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return async_database_url(settings.DATABASE_URL)
+
+
+class Engines:
+    """
+    The primary database's engines and session factories: a sync pair, and
+    an async pair used when DB_ASYNC is enabled
+    """
+
+    def __init__(self):
+        self.engine = create_engine(
+            settings.DATABASE_URL, connect_args=connect_args(settings.DATABASE_URL)
+        )
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        self.async_engine = create_async_engine(get_async_database_url())
+        self.AsyncSessionLocal = async_sessionmaker(
+            bind=self.async_engine, autoflush=False, expire_on_commit=False
+        )
+
+        if settings.SQLITE_PRAGMAS:
+            apply_sqlite_pragmas(self.engine, sqlite_pragmas())
+            apply_sqlite_pragmas(self.async_engine.sync_engine, sqlite_pragmas())
+
+
+_engines: Optional[Engines] = None
+
+
+def engines() -> Engines:
+    """The primary's engines, created on first use rather than at import"""
+    global _engines
+    if _engines is None:
+        _engines = Engines()
+    return _engines
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection, e.g. at shutdown; later use reconnects"""
+    if _engines is not None:
+        await _engines.async_engine.dispose()
+        _engines.engine.dispose()
+
+
+def __getattr__(name: str):
+    # `from app.database import engine` (and the session factories) keeps
+    # working, but only creates the engines when something asks for them
+    if name in ("engine", "SessionLocal", "async_engine", "AsyncSessionLocal"):
+        return getattr(engines(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Base class for models
 Base = declarative_base()
 
 
+class utcnow(FunctionElement):
+    """
+    Current time with sub-second precision, for updated_at columns. ETags are
+    derived from updated_at, so two edits within the same second must differ.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP has whole seconds on SQLite; %f adds milliseconds
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+class SyncSessionAdapter:
+    """
+    Exposes a blocking Session through the AsyncSession API, so routers can be
+    written once and still run on the sync engine when DB_ASYNC is disabled.
+    Queries run directly on the event loop, exactly like the old sync path.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, params=None, **kwargs):
+        return self.sync_session.execute(statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return self.sync_session.scalar(statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return self.sync_session.scalars(statement, params, **kwargs)
+
+    async def stream(self, statement, params=None, **kwargs):
+        return SyncStreamResult(self.sync_session.execute(statement, params, **kwargs))
+
+    async def get(self, entity, ident, **kwargs):
+        return self.sync_session.get(entity, ident, **kwargs)
+
+    async def delete(self, instance) -> None:
+        self.sync_session.delete(instance)
+
+    async def connection(self, **kwargs):
+        return self.sync_session.connection(**kwargs)
+
+    async def flush(self, objects=None) -> None:
+        self.sync_session.flush(objects)
+
+    async def refresh(self, instance, attribute_names=None) -> None:
+        self.sync_session.refresh(instance, attribute_names)
+
+    async def commit(self) -> None:
+        self.sync_session.commit()
+
+    async def rollback(self) -> None:
+        self.sync_session.rollback()
+
+    async def close(self) -> None:
+        self.sync_session.close()
+
+
+class SyncStreamResult:
+    """Async iteration over a buffered-per-partition sync Result"""
+
+    def __init__(self, result):
+        self.result = result
+
+    async def partitions(self, size=None):
+        for partition in self.result.partitions(size):
+            yield partition
+
+
 def get_db():
     """Get database session"""
-    db = SessionLocal()
+    db = engines().SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
 
+@asynccontextmanager
+async def async_session_scope():
+    """
+    Open an AsyncSession, or the sync session behind the same API when
+    DB_ASYNC is disabled (kept for benchmarking the two paths)
+    """
+    if settings.DB_ASYNC:
+        async with engines().AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SyncSessionAdapter(engines().SessionLocal(expire_on_commit=False))
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
+async def get_async_db():
+    """Get database session for async routers"""
+    async with async_session_scope() as db:
+        yield db
+
+
 @contextmanager
 def get_db_context():
     """Context manager for database session"""
-    db = SessionLocal()
+    db = engines().SessionLocal()
     try:
         yield db
         db.commit()
@@ -38,8 +249,3 @@ def get_db_context():
         raise
     finally:
         db.close()
-
-
-# Import models here to ensure they are registered with SQLAlchemy
-# This avoids circular imports
-from app.models import user, skill, swap  # noqa
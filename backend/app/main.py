@@ -1,21 +1,93 @@
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from .config import settings
-from .database import engine, Base
-from .routes import auth_router, users_router, skills_router, swaps_router, admin_router
+from .core.events import event_hub
+from .core.hashing import password_hasher
+from .core.indexes import index_sync
+from .core.images import UploadLimitMiddleware, photo_processor
+from .core.metrics import CONTENT_TYPE, MetricsMiddleware, instrument_engine, render_metrics
+from .core.outbox import message_outbox
+from .core.replicas import ReadYourWritesMiddleware, read_router
+from .core.shedding import LoadSheddingMiddleware
+from .core.workers import (
+    check_schema, load_deferred_modules, open_connections, warm_principals, worker_state
+)
+from .database import async_session_scope, dispose_engines, engines
+from .routes import (
+    auth_router, users_router, skills_router, swaps_router, admin_router, matches_router,
+    autocomplete_router, events_router
+)
+
+# The schema is managed by Alembic (alembic upgrade head); startup runs no DDL
+
+
+def instrument_engines() -> None:
+    """Record SQL usage of the primary's and the replicas' engines for /api/metrics"""
+    instrument_engine(engines().engine)
+    instrument_engine(engines().async_engine.sync_engine)
+    for replica in read_router.replicas:
+        instrument_engine(replica.engine)
+        instrument_engine(replica.async_engine.sync_engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown. Importing this module only builds the app;
+    everything touching the disk, the database or other processes happens
+    here, in order, and a worker accepts traffic once startup is done.
+    """
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    if settings.METRICS_ENABLED:
+        instrument_engines()
+    if settings.VALIDATE_SCHEMA:
+        await check_schema()
+
+    # The hub first: index changes other workers make meanwhile are applied after the build
+    await event_hub.start()
+    async with async_session_scope() as db:
+        await index_sync.build(db)
+
+    message_outbox.start()
+
+    # Warm up, so the first requests after a (re)start are not the slow ones
+    await open_connections(settings.WARMUP_CONNECTIONS)
+    load_deferred_modules()
+    await warm_principals(settings.WARMUP_PRINCIPALS)
+    worker_state.mark_ready()
+
+    yield
+
+    await worker_state.stop()
+    await event_hub.stop()
+    await index_sync.stop()
+    await message_outbox.stop()
+    password_hasher.shutdown()
+    photo_processor.shutdown()
+    await dispose_engines()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
-    description="Skill Swap Platform API"
+    description="Skill Swap Platform API",
+    lifespan=lifespan
 )
 
+# Refuse oversized uploads before their body is received and spooled
+app.add_middleware(UploadLimitMiddleware, limits={"/api/users/me/profile-photo": settings.MAX_UPLOAD_SIZE})
+
+# Cap concurrent requests per route class; inside CORS, so 503s carry its headers
+if settings.LOAD_SHEDDING:
+    app.add_middleware(LoadSheddingMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -25,8 +97,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# Record per-route latency, status codes and SQL usage for /api/metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Keep callers who just wrote on the primary while replicas catch up
+if settings.READ_REPLICA_URLS:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Mount static files (uploads live below; the lifespan creates the directory)
+app.mount("/static", StaticFiles(directory="app/static", check_dir=False), name="static")
 
 # Include routers
 app.include_router(auth_router, prefix="/api")
@@ -34,6 +114,9 @@ app.include_router(users_router, prefix="/api")
 app.include_router(skills_router, prefix="/api")
 app.include_router(swaps_router, prefix="/api")
 app.include_router(admin_router, prefix="/api")
+app.include_router(matches_router, prefix="/api")
+app.include_router(autocomplete_router, prefix="/api")
+app.include_router(events_router, prefix="/api")
 
 
 @app.get("/api/health")
@@ -41,7 +124,23 @@ async def health_check():
     """
     Health check endpoint
     """
-    return {"status": "ok", "version": settings.PROJECT_VERSION}
+    return {"status": "ok", "version": settings.PROJECT_VERSION, "worker": worker_state.health()}
+
+
+@app.get("/api/health/workers")
+async def workers_health():
+    """
+    Status of every worker process (only this one outside app.serve)
+    """
+    return {"workers": worker_state.workers()}
+
+
+@app.get("/api/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics in text exposition format
+    """
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
 from .user import User, UserRole, UserAvailability, ProfileVisibility
 from .skill import SkillOffered, SkillWanted, SkillStatus
 from .swap import Swap, Feedback, SwapStatus
+from .stats import PlatformCounter
+from .message import PlatformMessage, MessageStatus
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Enum, Index
+from sqlalchemy.sql import func
+import enum
+
+from ..database import Base
+
+
+class MessageStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class PlatformMessage(Base):
+    """
+    Outbox row for a platform-wide admin message.
+
+    The worker delivers to active users in id order, recording the last id
+    delivered after every batch, so a job interrupted by a restart resumes
+    from that point instead of starting over or being lost.
+    """
+    __tablename__ = "platform_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String, nullable=False)
+    message = Column(Text, nullable=False)
+    status = Column(Enum(MessageStatus), default=MessageStatus.PENDING, nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    # Recipients are the active users with id <= max_user_id at enqueue time
+    max_user_id = Column(Integer, nullable=False, default=0)
+    total_recipients = Column(Integer, nullable=False, default=0)
+
+    # Progress, written after each delivered batch
+    last_user_id = Column(Integer, nullable=False, default=0)
+    delivered = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+    # Lease held by the worker currently sending this job
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_platform_messages_status", "status", "id"),
+    )
@@ -3,7 +3,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
-from ..database import Base
+from ..database import Base, utcnow
 
 
 class SkillStatus(str, enum.Enum):
@@ -16,14 +16,14 @@ class SkillOffered(Base):
     __tablename__ = "skills_offered"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(Enum(SkillStatus), default=SkillStatus.APPROVED)
+    status = Column(Enum(SkillStatus), default=SkillStatus.APPROVED, index=True)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow())
     
     # Relationships
     user = relationship("User", back_populates="skills_offered")
@@ -34,13 +34,13 @@ class SkillWanted(Base):
     __tablename__ = "skills_wanted"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow())
     
     # Relationships
     user = relationship("User", back_populates="skills_wanted")
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+
+from ..database import Base
+
+
+class PlatformCounter(Base):
+    """
+    Platform-wide totals for the admin dashboard, one row per counter.
+
+    Rows are maintained by triggers (migration 0004) in the same transaction
+    as the user, skill and swap writes they count; `python -m app.cli
+    recount-stats` recomputes them from scratch.
+    """
+    __tablename__ = "platform_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
@@ -1,9 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, DateTime, Enum, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, DateTime, Enum, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
-from ..database import Base
+from ..database import Base, utcnow
 
 
 class SwapStatus(str, enum.Enum):
@@ -30,10 +30,11 @@ class Swap(Base):
     # Swap details
     message = Column(Text, nullable=True)
     status = Column(Enum(SwapStatus), default=SwapStatus.PENDING)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Incremented by every transition
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow())
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
@@ -42,6 +43,17 @@ class Swap(Base):
     skill_offered = relationship("SkillOffered", back_populates="swaps")
     skill_wanted = relationship("SkillWanted", back_populates="swaps")
     feedback = relationship("Feedback", back_populates="swap", cascade="all, delete-orphan")
+    
+    # Indexes matched to the listing queries: newest first per participant,
+    # optionally filtered by status, and platform-wide for admins
+    __table_args__ = (
+        Index("ix_swaps_requester_created", "requester_id", "created_at"),
+        Index("ix_swaps_provider_created", "provider_id", "created_at"),
+        Index("ix_swaps_requester_status_created", "requester_id", "status", "created_at"),
+        Index("ix_swaps_provider_status_created", "provider_id", "status", "created_at"),
+        Index("ix_swaps_status_created", "status", "created_at"),
+        Index("ix_swaps_created", "created_at"),
+    )
 
 
 class Feedback(Base):
@@ -60,9 +72,15 @@ class Feedback(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow())
     
     # Relationships
     swap = relationship("Swap", back_populates="feedback")
     giver = relationship("User", foreign_keys=[giver_id], back_populates="given_feedback")
     receiver = relationship("User", foreign_keys=[receiver_id], back_populates="received_feedback")
+    
+    __table_args__ = (
+        Index("ix_feedback_receiver_created", "receiver_id", "created_at"),
+        Index("ix_feedback_giver_created", "giver_id", "created_at"),
+        Index("ix_feedback_swap_giver", "swap_id", "giver_id"),
+    )
@@ -1,9 +1,9 @@
-from sqlalchemy import Boolean, Column, String, Integer, DateTime, Enum, Text
+from sqlalchemy import Boolean, Column, String, Integer, DateTime, Enum, Float, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
-from ..database import Base
+from ..database import Base, utcnow
 
 
 class UserRole(str, enum.Enum):
@@ -47,9 +47,20 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     is_banned = Column(Boolean, default=False)
     
+    # Reputation aggregates, maintained by create_feedback (see app.core.reputation).
+    # Migration 0007 also creates ix_users_rating, an expression index in
+    # best-rated-first order that autogenerate cannot compare on SQLite.
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Float, nullable=False, default=0, server_default="0")
+    rating_1 = Column(Integer, nullable=False, default=0, server_default="0")  # Feedback by star, rounded
+    rating_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5 = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow())
     
     # Relationships
     skills_offered = relationship("SkillOffered", back_populates="user", cascade="all, delete-orphan")
@@ -3,3 +3,6 @@ from .users import router as users_router
 from .skills import router as skills_router
 from .swaps import router as swaps_router
 from .admin import router as admin_router
+from .matches import router as matches_router
+from .autocomplete import router as autocomplete_router
+from .events import router as events_router
@@ -1,44 +1,104 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from ..core.auth import get_current_admin_user
-from ..database import get_db
+from ..core.autocomplete import autocomplete_index
+from ..core.cache import Principal, invalidate_principal, principal_cache
+from ..core.events import event_hub
+from ..core.export import EXPORT_MEDIA_TYPES, resolve_columns, stream_export
+from ..core.hashing import password_hasher
+from ..core.indexes import index_sync
+from ..core.matching import skill_index
+from ..core.outbox import message_outbox, recipients_filter
+from ..core.pagination import paginate_newest_first
+from ..core.replicas import read_router
+from ..core.serialization import fast_json
+from ..core.shedding import load_shedder
+from ..core.stats import stats_from_counters
+from ..config import settings
+from ..database import get_async_db
 from ..models.user import User, UserRole
-from ..models.skill import SkillOffered, SkillWanted, SkillStatus
-from ..models.swap import Swap, SwapStatus
+from ..models.skill import SkillOffered, SkillStatus
+from ..models.swap import Swap
+from ..models.stats import PlatformCounter
+from ..models.message import PlatformMessage
 from ..schemas.user import UserProfile
-from ..schemas.skill import SkillOfferedInDB
+from ..schemas.skill import SkillBulkModeration, SkillModerationResult, SkillOfferedInDB
 from ..schemas.swap import SwapWithDetails
+from ..schemas.pagination import Page
+from ..schemas.message import PlatformMessageCreate, PlatformMessageJob
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
+async def _moderate_skills(db: AsyncSession, ids: List[int], new_status: SkillStatus) -> List[dict]:
+    """
+    Set the status of many skills offered with a single UPDATE ... WHERE id IN
+    and report the outcome for each id, in request order
+    """
+    ids = list(dict.fromkeys(ids))
+    previous = dict((await db.execute(
+        select(SkillOffered.id, SkillOffered.status).where(SkillOffered.id.in_(ids))
+    )).all())
+    
+    # Skills already in the target state are left alone, keeping updated_at
+    changed = (await db.execute(
+        update(SkillOffered)
+        .where(SkillOffered.id.in_(ids), SkillOffered.status != new_status)
+        .values(status=new_status)
+        .returning(SkillOffered.id, SkillOffered.user_id, SkillOffered.name)
+        .execution_options(synchronize_session=False)
+    )).all()
+    await db.commit()
+    
+    for skill_id, user_id, name in changed:
+        if new_status == SkillStatus.APPROVED:
+            skill_index.add_offered(user_id, name)
+            autocomplete_index.add_skill(name)
+        elif previous.get(skill_id) == SkillStatus.APPROVED:
+            skill_index.remove_offered(user_id, name)
+            autocomplete_index.remove_skill(name)
+    if changed:
+        await index_sync.changed(*{user_id for _, user_id, _ in changed})
+    
+    changed_ids = {skill_id for skill_id, _, _ in changed}
+    return [
+        {"id": skill_id, "result": "updated", "status": new_status} if skill_id in changed_ids
+        else {"id": skill_id, "result": "unchanged", "status": previous[skill_id]} if skill_id in previous
+        else {"id": skill_id, "result": "not_found", "status": None}
+        for skill_id in ids
+    ]
+
+
 # User management
 @router.get("/users", response_model=List[UserProfile])
+@fast_json(List[UserProfile])
 async def get_all_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
     Get all users (admin only)
     """
-    return db.query(User).offset(skip).limit(limit).all()
+    return (await db.scalars(select(User).offset(skip).limit(limit))).all()
 
 
 @router.put("/users/{user_id}/ban", response_model=UserProfile)
 async def ban_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
     Ban a user (admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if not user:
         raise HTTPException(
@@ -54,8 +114,11 @@ async def ban_user(
     
     user.is_banned = True
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.id)
+    autocomplete_index.update_user(user)
+    await index_sync.changed(user.id)
     
     return user
 
@@ -63,13 +126,13 @@ async def ban_user(
 @router.put("/users/{user_id}/unban", response_model=UserProfile)
 async def unban_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
     Unban a user (admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if not user:
         raise HTTPException(
@@ -79,8 +142,11 @@ async def unban_user(
     
     user.is_banned = False
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.id)
+    autocomplete_index.update_user(user)
+    await index_sync.changed(user.id)
     
     return user
 
@@ -88,13 +154,13 @@ async def unban_user(
 @router.put("/users/{user_id}/make-admin", response_model=UserProfile)
 async def make_user_admin(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
     Make a user an admin (admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if not user:
         raise HTTPException(
@@ -104,8 +170,9 @@ async def make_user_admin(
     
     user.role = UserRole.ADMIN
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.id)
     
     return user
 
@@ -113,25 +180,52 @@ async def make_user_admin(
 # Skill moderation
 @router.get("/skills/pending", response_model=List[SkillOfferedInDB])
 async def get_pending_skills(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
     Get all pending skills (admin only)
     """
-    return db.query(SkillOffered).filter(SkillOffered.status == SkillStatus.PENDING).all()
+    return (await db.scalars(
+        select(SkillOffered).where(SkillOffered.status == SkillStatus.PENDING)
+    )).all()
+
+
+# Declared before /skills/{skill_id}/... so "bulk" is not taken for an id
+@router.put("/skills/bulk/approve", response_model=List[SkillModerationResult])
+async def approve_skills(
+    moderation: SkillBulkModeration,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Approve several skills in one transaction (admin only)
+    """
+    return await _moderate_skills(db, moderation.ids, SkillStatus.APPROVED)
+
+
+@router.put("/skills/bulk/reject", response_model=List[SkillModerationResult])
+async def reject_skills(
+    moderation: SkillBulkModeration,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Reject several skills in one transaction (admin only)
+    """
+    return await _moderate_skills(db, moderation.ids, SkillStatus.REJECTED)
 
 
 @router.put("/skills/{skill_id}/approve", response_model=SkillOfferedInDB)
 async def approve_skill(
     skill_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
     Approve a skill (admin only)
     """
-    skill = db.query(SkillOffered).filter(SkillOffered.id == skill_id).first()
+    skill = await db.scalar(select(SkillOffered).where(SkillOffered.id == skill_id))
     
     if not skill:
         raise HTTPException(
@@ -139,10 +233,16 @@ async def approve_skill(
             detail="Skill not found"
         )
     
+    was_approved = skill.status == SkillStatus.APPROVED
     skill.status = SkillStatus.APPROVED
     db.add(skill)
-    db.commit()
-    db.refresh(skill)
+    await db.commit()
+    await db.refresh(skill)
+    
+    if not was_approved:
+        skill_index.add_offered(skill.user_id, skill.name)
+        autocomplete_index.add_skill(skill.name)
+        await index_sync.changed(skill.user_id)
     
     return skill
 
@@ -150,13 +250,13 @@ async def approve_skill(
 @router.put("/skills/{skill_id}/reject", response_model=SkillOfferedInDB)
 async def reject_skill(
     skill_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
     Reject a skill (admin only)
     """
-    skill = db.query(SkillOffered).filter(SkillOffered.id == skill_id).first()
+    skill = await db.scalar(select(SkillOffered).where(SkillOffered.id == skill_id))
     
     if not skill:
         raise HTTPException(
@@ -164,27 +264,34 @@ async def reject_skill(
             detail="Skill not found"
         )
     
+    was_approved = skill.status == SkillStatus.APPROVED
     skill.status = SkillStatus.REJECTED
     db.add(skill)
-    db.commit()
-    db.refresh(skill)
+    await db.commit()
+    await db.refresh(skill)
+    
+    if was_approved:
+        skill_index.remove_offered(skill.user_id, skill.name)
+        autocomplete_index.remove_skill(skill.name)
+        await index_sync.changed(skill.user_id)
     
     return skill
 
 
 # Swap monitoring
-@router.get("/swaps", response_model=List[SwapWithDetails])
+@router.get("/swaps", response_model=Page[SwapWithDetails])
+@fast_json(Page[SwapWithDetails])
 async def get_all_swaps(
     status: str = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
-    Get all swaps (admin only)
+    Get all swaps, newest first (admin only)
     """
-    query = db.query(Swap).options(
+    query = select(Swap).options(
         joinedload(Swap.requester),
         joinedload(Swap.provider),
         joinedload(Swap.skill_offered),
@@ -192,67 +299,129 @@ async def get_all_swaps(
     )
     
     if status:
-        query = query.filter(Swap.status == status)
+        query = query.where(Swap.status == status)
+    
+    return await paginate_newest_first(db, query, Swap, limit, cursor)
+
+
+# Compliance exports
+@router.get("/export/{dataset}")
+async def export_dataset(
+    dataset: str = Path(..., pattern="^(users|swaps|feedback)$"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    columns: Optional[str] = None,
+    current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Stream every row of a table as NDJSON or CSV, optionally projected to
+    a comma-separated list of columns (admin only)
+    """
+    names = resolve_columns(dataset, columns)
     
-    return query.offset(skip).limit(limit).all()
+    return StreamingResponse(
+        stream_export(dataset, names, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{format}"'}
+    )
 
 
 # Statistics
 @router.get("/stats")
 async def get_platform_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
     Get platform statistics (admin only)
     """
-    total_users = db.query(func.count(User.id)).scalar()
-    total_skills_offered = db.query(func.count(SkillOffered.id)).scalar()
-    total_skills_wanted = db.query(func.count(SkillWanted.id)).scalar()
-    
-    # Swaps by status
-    swaps_by_status = {}
-    for status_value in SwapStatus:
-        count = db.query(func.count(Swap.id)).filter(Swap.status == status_value).scalar()
-        swaps_by_status[status_value.value] = count
-    
-    # Active users (users with at least one swap)
-    active_users = db.query(func.count(User.id.distinct())).join(
-        Swap, (User.id == Swap.requester_id) | (User.id == Swap.provider_id)
-    ).scalar()
+    counters = dict((await db.execute(
+        select(PlatformCounter.name, PlatformCounter.value)
+    )).all())
     
+    return stats_from_counters(counters)
+
+
+@router.get("/runtime")
+async def get_runtime_stats(
+    current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Get in-process worker pool metrics (admin only)
+    """
     return {
-        "total_users": total_users,
-        "active_users": active_users,
-        "total_skills_offered": total_skills_offered,
-        "total_skills_wanted": total_skills_wanted,
-        "swaps_by_status": swaps_by_status,
-        "total_swaps": sum(swaps_by_status.values())
+        "password_hashing": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
+        "skill_match_index": skill_index.stats(),
+        "autocomplete_index": autocomplete_index.stats(),
+        "index_sync": index_sync.stats(),
+        "message_outbox": message_outbox.stats(),
+        "read_replicas": read_router.stats(),
+        "events": event_hub.stats(),
+        "load_shedding": load_shedder.stats()
     }
 
 
 # Platform-wide messaging
-@router.post("/message")
+@router.post("/message", response_model=PlatformMessageJob, status_code=status.HTTP_202_ACCEPTED)
 async def send_platform_message(
-    message: str,
-    title: str,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    message_in: PlatformMessageCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ) -> Any:
     """
-    Send a platform-wide message (admin only)
+    Queue a platform-wide message for delivery (admin only)
     """
-    # In a real application, this would send emails or push notifications
-    # Here we'll just simulate it with a background task
+    # Fix the recipient set now; users who register later are not included
+    max_user_id = await db.scalar(select(func.max(User.id))) or 0
+    total_recipients = await db.scalar(
+        select(func.count(User.id)).where(*recipients_filter(), User.id <= max_user_id)
+    )
+    
+    job = PlatformMessage(
+        title=message_in.title,
+        message=message_in.message,
+        created_by=current_user.id,
+        max_user_id=max_user_id,
+        total_recipients=total_recipients
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    
+    message_outbox.notify()
     
-    def send_messages():
-        # Get all active users
-        users = db.query(User).filter(User.is_active == True, User.is_banned == False).all()
-        
-        # In a real app, send messages to each user
-        print(f"Sending message '{title}' to {len(users)} users: {message}")
+    return job
+
+
+@router.get("/messages", response_model=List[PlatformMessageJob])
+async def get_platform_messages(
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Get recent platform-wide messages and their delivery progress (admin only)
+    """
+    return (await db.scalars(
+        select(PlatformMessage).order_by(PlatformMessage.id.desc()).limit(limit)
+    )).all()
+
+
+@router.get("/messages/{job_id}", response_model=PlatformMessageJob)
+async def get_platform_message(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Get delivery progress of a platform-wide message (admin only)
+    """
+    job = await db.get(PlatformMessage, job_id)
     
-    background_tasks.add_task(send_messages)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Message not found"
+        )
     
-    return {"status": "Message sending started", "recipients_count": db.query(func.count(User.id)).filter(User.is_active == True, User.is_banned == False).scalar()}
+    return job
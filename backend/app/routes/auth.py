@@ -3,10 +3,13 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.auth import create_access_token, get_password_hash, verify_password
-from ..database import get_db
+from ..core.autocomplete import autocomplete_index
+from ..core.indexes import index_sync
+from ..database import get_async_db
 from ..models.user import User, UserRole
 from ..schemas.user import UserCreate, UserInDB, Token, UserPublic
 
@@ -14,19 +17,19 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)) -> Any:
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)) -> Any:
     """
     Register a new user
     """
     # Check if email already exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    if await db.scalar(select(User.id).where(User.email == user_data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Check if username already exists
-    if db.query(User).filter(User.username == user_data.username).first():
+    if await db.scalar(select(User.id).where(User.username == user_data.username)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
@@ -41,13 +44,15 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)) -> Any:
         bio=user_data.bio,
         availability=user_data.availability,
         visibility=user_data.visibility,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash(user_data.password),
         role=UserRole.USER
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    autocomplete_index.update_user(user)
+    await index_sync.changed(user.id)
     
     return user
 
@@ -55,14 +60,14 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)) -> Any:
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -0,0 +1,22 @@
+from typing import Any
+from fastapi import APIRouter, Depends, Query
+
+from ..config import settings
+from ..core.auth import get_current_user
+from ..core.autocomplete import autocomplete_index
+from ..core.cache import Principal
+from ..schemas.autocomplete import Suggestions
+
+router = APIRouter(prefix="/autocomplete", tags=["search"])
+
+
+@router.get("", response_model=Suggestions)
+async def autocomplete(
+    prefix: str = Query(..., max_length=100),
+    limit: int = Query(settings.AUTOCOMPLETE_LIMIT, ge=1, le=settings.AUTOCOMPLETE_LIMIT),
+    current_user: Principal = Depends(get_current_user)
+) -> Any:
+    """
+    Suggest skills and users whose name starts with the prefix, served from memory
+    """
+    return autocomplete_index.suggest(prefix, limit)
@@ -0,0 +1,70 @@
+from typing import Any, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security.utils import get_authorization_scheme_param
+
+from ..config import settings
+from ..core.auth import get_current_user
+from ..core.events import Subscription, event_hub
+from ..database import async_session_scope
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+class EventStreamResponse(StreamingResponse):
+    """
+    A stream that releases its subscription however the response ends. The
+    stream generator's own cleanup only runs once it has been iterated, which
+    never happens if the client is gone, or sending the headers fails, first.
+    """
+
+    def __init__(self, subscription: Subscription, **kwargs):
+        super().__init__(
+            event_hub.stream(subscription, settings.EVENTS_HEARTBEAT_SECONDS, settings.EVENTS_MAX_STREAM_SECONDS),
+            media_type="text/event-stream",
+            **kwargs
+        )
+        self.subscription = subscription
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            event_hub.unsubscribe(self.subscription)
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    access_token: Optional[str] = Query(None, description="For EventSource, which cannot send headers")
+) -> Any:
+    """
+    Stream the current user's swap and feedback notifications (server-sent events)
+    """
+    scheme, token = get_authorization_scheme_param(request.headers.get("authorization"))
+    if scheme.lower() != "bearer":
+        token = access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # A session of its own, closed before streaming: a request-scoped one
+    # would hold its connection for as long as the stream stays open
+    async with async_session_scope() as db:
+        current_user = await get_current_user(token=token, db=db)
+
+    subscription = event_hub.subscribe(current_user.id)
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open event streams",
+            headers={"Retry-After": str(settings.EVENTS_RETRY_MS // 1000 or 1)},
+        )
+
+    return EventStreamResponse(
+        subscription,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,76 @@
+from typing import Any, List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.auth import get_current_user
+from ..core.cache import Principal
+from ..core.matching import skill_index
+from ..core.reputation import rating_order
+from ..database import get_async_db
+from ..models.user import User, ProfileVisibility
+from ..schemas.match import SkillMatch
+
+router = APIRouter(prefix="/matches", tags=["matches"])
+
+# Matches, by overlap, considered when sorting by rating
+RATING_SORT_POOL = 1000
+
+
+@router.get("", response_model=List[SkillMatch])
+async def get_matches(
+    limit: int = Query(20, ge=1, le=100),
+    sort: str = Query("overlap", pattern="^(overlap|rating)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+) -> Any:
+    """
+    Get users who offer a skill I want and want a skill I offer, ranked by overlap or rating
+    """
+    visible = (
+        User.visibility == ProfileVisibility.PUBLIC,
+        User.is_active == True,
+        User.is_banned == False
+    )
+    
+    if sort == "rating":
+        # Rank the best overlaps by the aggregates on users, then load the page
+        matches = skill_index.matches(current_user.id, RATING_SORT_POOL)
+        if not matches:
+            return []
+        ratings = {
+            row.id: row
+            for row in await db.execute(select(User.id, User.rating_sum, User.rating_count).where(
+                User.id.in_([match.user_id for match in matches]), *visible
+            ))
+        }
+        matches = sorted(
+            (match for match in matches if match.user_id in ratings),
+            key=lambda match: (
+                *rating_order(ratings[match.user_id].rating_sum, ratings[match.user_id].rating_count),
+                -match.score,
+                match.user_id
+            )
+        )[:limit]
+    else:
+        # Over-fetch a little so hidden or banned users don't leave the page short
+        matches = skill_index.matches(current_user.id, limit * 2)
+    
+    if not matches:
+        return []
+    
+    users = (await db.scalars(select(User).where(
+        User.id.in_([match.user_id for match in matches]), *visible
+    ))).all()
+    users_by_id = {user.id: user for user in users}
+    
+    return [
+        {
+            "user": users_by_id[match.user_id],
+            "score": match.score,
+            "they_offer": match.they_offer,
+            "they_want": match.they_want
+        }
+        for match in matches
+        if match.user_id in users_by_id
+    ][:limit]
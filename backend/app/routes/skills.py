@@ -1,27 +1,45 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+import math
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.auth import get_current_user
-from ..database import get_db
-from ..models.user import User
+from ..core.autocomplete import autocomplete_index
+from ..core.indexes import index_sync
+from ..core.cache import Principal
+from ..core.etag import conditional_get
+from ..core.matching import skill_index
+from ..core.pagination import decode_cursor, encode_cursor
+from ..core.replicas import get_read_db
+from ..core.search import build_match_query, build_skill_search
+from ..database import get_async_db
 from ..models.skill import SkillOffered, SkillWanted, SkillStatus
 from ..schemas.skill import (
     SkillOfferedCreate, SkillOfferedUpdate, SkillOfferedInDB,
     SkillWantedCreate, SkillWantedUpdate, SkillWantedInDB,
-    SkillSearch, SkillSearchResult
+    SkillSearch, SkillSearchResult, SkillOfferedBulkCreate, SkillWantedBulkCreate
 )
+from ..schemas.pagination import Page
 
 router = APIRouter(prefix="/skills", tags=["skills"])
 
 
+async def own_skills_offered_version(db: AsyncSession, current_user: Principal, request) -> Any:
+    return tuple((await db.execute(
+        select(
+            func.count(SkillOffered.id),
+            func.max(func.coalesce(SkillOffered.updated_at, SkillOffered.created_at))
+        ).where(SkillOffered.user_id == current_user.id)
+    )).one())
+
+
 # Skills offered routes
 @router.post("/offered", response_model=SkillOfferedInDB, status_code=status.HTTP_201_CREATED)
 async def create_skill_offered(
     skill: SkillOfferedCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Create a new skill offered
@@ -33,33 +51,72 @@ async def create_skill_offered(
     )
     
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
+    
+    if db_skill.status == SkillStatus.APPROVED:
+        skill_index.add_offered(db_skill.user_id, db_skill.name)
+        autocomplete_index.add_skill(db_skill.name)
+        await index_sync.changed(db_skill.user_id)
     
     return db_skill
 
 
-@router.get("/offered", response_model=List[SkillOfferedInDB])
+@router.post("/offered/bulk", response_model=List[SkillOfferedInDB], status_code=status.HTTP_201_CREATED)
+async def create_skills_offered(
+    skills: SkillOfferedBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+) -> Any:
+    """
+    Create several skills offered with one multi-row insert, returned in request order
+    """
+    db_skills = (await db.scalars(
+        insert(SkillOffered).returning(SkillOffered, sort_by_parameter_order=True),
+        [
+            {"user_id": current_user.id, "name": skill.name, "description": skill.description}
+            for skill in skills.items
+        ]
+    )).all()
+    await db.commit()
+    
+    for db_skill in db_skills:
+        if db_skill.status == SkillStatus.APPROVED:
+            skill_index.add_offered(db_skill.user_id, db_skill.name)
+            autocomplete_index.add_skill(db_skill.name)
+    if any(db_skill.status == SkillStatus.APPROVED for db_skill in db_skills):
+        await index_sync.changed(current_user.id)
+    
+    return db_skills
+
+
+@router.get(
+    "/offered",
+    response_model=List[SkillOfferedInDB],
+    dependencies=[conditional_get(own_skills_offered_version)]
+)
 async def get_current_user_skills_offered(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get all skills offered by current user
     """
-    return db.query(SkillOffered).filter(SkillOffered.user_id == current_user.id).all()
+    return (await db.scalars(
+        select(SkillOffered).where(SkillOffered.user_id == current_user.id)
+    )).all()
 
 
 @router.get("/offered/{skill_id}", response_model=SkillOfferedInDB)
 async def get_skill_offered(
     skill_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get a skill offered by ID
     """
-    skill = db.query(SkillOffered).filter(SkillOffered.id == skill_id).first()
+    skill = await db.scalar(select(SkillOffered).where(SkillOffered.id == skill_id))
     
     if not skill:
         raise HTTPException(
@@ -74,16 +131,16 @@ async def get_skill_offered(
 async def update_skill_offered(
     skill_id: int,
     skill_update: SkillOfferedUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Update a skill offered
     """
-    db_skill = db.query(SkillOffered).filter(
+    db_skill = await db.scalar(select(SkillOffered).where(
         SkillOffered.id == skill_id,
         SkillOffered.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_skill:
         raise HTTPException(
@@ -98,12 +155,23 @@ async def update_skill_offered(
     if "status" in update_data and current_user.role != "admin":
         del update_data["status"]
     
+    old_name, old_status = db_skill.name, db_skill.status
+    
     for field, value in update_data.items():
         setattr(db_skill, field, value)
     
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
+    
+    if old_status == SkillStatus.APPROVED:
+        skill_index.remove_offered(db_skill.user_id, old_name)
+        autocomplete_index.remove_skill(old_name)
+    if db_skill.status == SkillStatus.APPROVED:
+        skill_index.add_offered(db_skill.user_id, db_skill.name)
+        autocomplete_index.add_skill(db_skill.name)
+    if SkillStatus.APPROVED in (old_status, db_skill.status):
+        await index_sync.changed(db_skill.user_id)
     
     return db_skill
 
@@ -111,16 +179,16 @@ async def update_skill_offered(
 @router.delete("/offered/{skill_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_skill_offered(
     skill_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Response:
     """
     Delete a skill offered
     """
-    db_skill = db.query(SkillOffered).filter(
+    db_skill = await db.scalar(select(SkillOffered).where(
         SkillOffered.id == skill_id,
         SkillOffered.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_skill:
         raise HTTPException(
@@ -128,8 +196,13 @@ async def delete_skill_offered(
             detail="Skill not found or not owned by you"
         )
     
-    db.delete(db_skill)
-    db.commit()
+    await db.delete(db_skill)
+    await db.commit()
+    
+    if db_skill.status == SkillStatus.APPROVED:
+        skill_index.remove_offered(db_skill.user_id, db_skill.name)
+        autocomplete_index.remove_skill(db_skill.name)
+        await index_sync.changed(db_skill.user_id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -138,8 +211,8 @@ async def delete_skill_offered(
 @router.post("/wanted", response_model=SkillWantedInDB, status_code=status.HTTP_201_CREATED)
 async def create_skill_wanted(
     skill: SkillWantedCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Create a new skill wanted
@@ -151,33 +224,65 @@ async def create_skill_wanted(
     )
     
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
+    
+    skill_index.add_wanted(db_skill.user_id, db_skill.name)
+    autocomplete_index.add_skill(db_skill.name)
+    await index_sync.changed(db_skill.user_id)
     
     return db_skill
 
 
+@router.post("/wanted/bulk", response_model=List[SkillWantedInDB], status_code=status.HTTP_201_CREATED)
+async def create_skills_wanted(
+    skills: SkillWantedBulkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+) -> Any:
+    """
+    Create several skills wanted with one multi-row insert, returned in request order
+    """
+    db_skills = (await db.scalars(
+        insert(SkillWanted).returning(SkillWanted, sort_by_parameter_order=True),
+        [
+            {"user_id": current_user.id, "name": skill.name, "description": skill.description}
+            for skill in skills.items
+        ]
+    )).all()
+    await db.commit()
+    
+    for db_skill in db_skills:
+        skill_index.add_wanted(db_skill.user_id, db_skill.name)
+        autocomplete_index.add_skill(db_skill.name)
+    await index_sync.changed(current_user.id)
+    
+    return db_skills
+
+
 @router.get("/wanted", response_model=List[SkillWantedInDB])
 async def get_current_user_skills_wanted(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get all skills wanted by current user
     """
-    return db.query(SkillWanted).filter(SkillWanted.user_id == current_user.id).all()
+    return (await db.scalars(
+        select(SkillWanted).where(SkillWanted.user_id == current_user.id)
+    )).all()
 
 
 @router.get("/wanted/{skill_id}", response_model=SkillWantedInDB)
 async def get_skill_wanted(
     skill_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get a skill wanted by ID
     """
-    skill = db.query(SkillWanted).filter(SkillWanted.id == skill_id).first()
+    skill = await db.scalar(select(SkillWanted).where(SkillWanted.id == skill_id))
     
     if not skill:
         raise HTTPException(
@@ -192,16 +297,16 @@ async def get_skill_wanted(
 async def update_skill_wanted(
     skill_id: int,
     skill_update: SkillWantedUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Update a skill wanted
     """
-    db_skill = db.query(SkillWanted).filter(
+    db_skill = await db.scalar(select(SkillWanted).where(
         SkillWanted.id == skill_id,
         SkillWanted.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_skill:
         raise HTTPException(
@@ -211,13 +316,20 @@ async def update_skill_wanted(
     
     # Update skill
     update_data = skill_update.dict(exclude_unset=True)
+    old_name = db_skill.name
     
     for field, value in update_data.items():
         setattr(db_skill, field, value)
     
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
+    
+    skill_index.remove_wanted(db_skill.user_id, old_name)
+    autocomplete_index.remove_skill(old_name)
+    skill_index.add_wanted(db_skill.user_id, db_skill.name)
+    autocomplete_index.add_skill(db_skill.name)
+    await index_sync.changed(db_skill.user_id)
     
     return db_skill
 
@@ -225,16 +337,16 @@ async def update_skill_wanted(
 @router.delete("/wanted/{skill_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_skill_wanted(
     skill_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Response:
     """
     Delete a skill wanted (only by the user who added it)
     """
-    db_skill = db.query(SkillWanted).filter(
+    db_skill = await db.scalar(select(SkillWanted).where(
         SkillWanted.id == skill_id,
         SkillWanted.user_id == current_user.id
-    ).first()
+    ))
     
     if not db_skill:
         raise HTTPException(
@@ -242,63 +354,47 @@ async def delete_skill_wanted(
             detail="Skill not found or not owned by you"
         )
     
-    db.delete(db_skill)
-    db.commit()
+    await db.delete(db_skill)
+    await db.commit()
+    
+    skill_index.remove_wanted(db_skill.user_id, db_skill.name)
+    autocomplete_index.remove_skill(db_skill.name)
+    await index_sync.changed(db_skill.user_id)
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 
 # Skill search
-@router.get("/search", response_model=List[SkillSearchResult])
+@router.get("/search", response_model=Page[SkillSearchResult])
 async def search_skills(
     query: str,
-    skill_type: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    skill_type: Optional[str] = Query(None, pattern="^(offered|wanted)$"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
-    Search for skills by name
+    Full-text search over skill names and descriptions, ranked by relevance
     """
-    results = []
-    
-    # Search skills offered
-    if not skill_type or skill_type == "offered":
-        skills_offered = db.query(SkillOffered).join(User).filter(
-            SkillOffered.name.ilike(f"%{query}%"),
-            SkillOffered.status == SkillStatus.APPROVED,
-            User.is_active == True,
-            User.is_banned == False
-        ).all()
-        
-        for skill in skills_offered:
-            results.append({
-                "skill_id": skill.id,
-                "skill_type": "offered",
-                "name": skill.name,
-                "description": skill.description,
-                "user_id": skill.user_id,
-                "username": skill.user.username,
-                "user_name": skill.user.name
-            })
-    
-    # Search skills wanted
-    if not skill_type or skill_type == "wanted":
-        skills_wanted = db.query(SkillWanted).join(User).filter(
-            SkillWanted.name.ilike(f"%{query}%"),
-            User.is_active == True,
-            User.is_banned == False
-        ).all()
-        
-        for skill in skills_wanted:
-            results.append({
-                "skill_id": skill.id,
-                "skill_type": "wanted",
-                "name": skill.name,
-                "description": skill.description,
-                "user_id": skill.user_id,
-                "username": skill.user.username,
-                "user_name": skill.user.name
-            })
-    
-    return results
+    match = build_match_query(query)
+    if not match:
+        return {"items": [], "next_cursor": None}
+    
+    # (bm25 score, FTS rowid); JSON also decodes NaN and Infinity as floats
+    after = decode_cursor(cursor, ((int, float), int)) if cursor else None
+    if after is not None and not math.isfinite(after[0]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    statement, params = build_skill_search(match, skill_type, limit + 1, after)
+    rows = (await db.execute(statement, params)).mappings().all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["score"], rows[-1]["fts_rowid"])
+    
+    return {"items": rows, "next_cursor": next_cursor}
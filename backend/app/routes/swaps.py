@@ -1,32 +1,67 @@
-from typing import Any, List
+from typing import Any, List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload
 
 from ..core.auth import get_current_user
-from ..database import get_db
+from ..core.cache import Principal
+from ..core.etag import conditional_get
+from ..core.events import FEEDBACK_RECEIVED, SWAP_CREATED, SWAP_STATUS_CHANGED, event_hub
+from ..core.pagination import paginate_newest_first
+from ..core.replicas import get_read_db
+from ..core.reputation import record_rating
+from ..core.serialization import fast_json
+from ..config import settings
+from ..database import get_async_db
 from ..models.user import User
+from ..models.skill import SkillOffered, SkillWanted
 from ..models.swap import Swap, Feedback, SwapStatus
 from ..schemas.swap import (
     SwapCreate, SwapUpdate, SwapInDB, SwapWithDetails,
     FeedbackCreate, FeedbackInDB, FeedbackWithDetails
 )
+from ..schemas.pagination import Page
 
 router = APIRouter(prefix="/swaps", tags=["swaps"])
 
 
+async def own_swaps_version(db: AsyncSession, current_user: Principal, request) -> Any:
+    """
+    Changes when any of my swaps, or a user or skill embedded in them, does.
+    Covers every swap of mine, so it holds for any status filter or page.
+    """
+    requester, provider = aliased(User), aliased(User)
+    return tuple((await db.execute(
+        select(
+            func.count(Swap.id),
+            func.max(func.coalesce(Swap.updated_at, Swap.created_at)),
+            func.max(requester.updated_at),
+            func.max(provider.updated_at),
+            func.max(SkillOffered.updated_at),
+            func.max(SkillWanted.updated_at)
+        )
+        .join(requester, requester.id == Swap.requester_id)
+        .join(provider, provider.id == Swap.provider_id)
+        .outerjoin(SkillOffered, SkillOffered.id == Swap.skill_offered_id)
+        .outerjoin(SkillWanted, SkillWanted.id == Swap.skill_wanted_id)
+        .where(or_(Swap.requester_id == current_user.id, Swap.provider_id == current_user.id))
+    )).one())
+
+
 # Swap routes
 @router.post("", response_model=SwapInDB, status_code=status.HTTP_201_CREATED)
 async def create_swap(
     swap: SwapCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Create a new swap request
     """
     # Check if provider exists
-    provider = db.query(User).filter(User.id == swap.provider_id).first()
+    provider = await db.scalar(select(User).where(User.id == swap.provider_id))
     if not provider:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -35,7 +70,7 @@ async def create_swap(
     
     # Check if skill offered exists
     if swap.skill_offered_id:
-        skill_offered = db.query("SkillOffered").filter_by(id=swap.skill_offered_id).first()
+        skill_offered = await db.scalar(select(SkillOffered).where(SkillOffered.id == swap.skill_offered_id))
         if not skill_offered:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -44,7 +79,7 @@ async def create_swap(
     
     # Check if skill wanted exists
     if swap.skill_wanted_id:
-        skill_wanted = db.query("SkillWanted").filter_by(id=swap.skill_wanted_id).first()
+        skill_wanted = await db.scalar(select(SkillWanted).where(SkillWanted.id == swap.skill_wanted_id))
         if not skill_wanted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -62,22 +97,35 @@ async def create_swap(
     )
     
     db.add(db_swap)
-    db.commit()
-    db.refresh(db_swap)
+    await db.commit()
+    await db.refresh(db_swap)
+    
+    await event_hub.publish(
+        SWAP_CREATED,
+        {"swap_id": db_swap.id, "status": db_swap.status.value, "requester_id": db_swap.requester_id},
+        [db_swap.requester_id, db_swap.provider_id]
+    )
     
     return db_swap
 
 
-@router.get("", response_model=List[SwapWithDetails])
+@router.get(
+    "",
+    response_model=Page[SwapWithDetails],
+    dependencies=[conditional_get(own_swaps_version, session_dependency=get_read_db)]
+)
+@fast_json(Page[SwapWithDetails])
 async def get_current_user_swaps(
     status: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
-    Get all swaps for current user
+    Get swaps for current user, newest first
     """
-    query = db.query(Swap).filter(
+    query = select(Swap).where(
         (Swap.requester_id == current_user.id) | (Swap.provider_id == current_user.id)
     ).options(
         joinedload(Swap.requester),
@@ -87,21 +135,24 @@ async def get_current_user_swaps(
     )
     
     if status:
-        query = query.filter(Swap.status == status)
+        query = query.where(Swap.status == status)
     
-    return query.all()
+    return await paginate_newest_first(db, query, Swap, limit, cursor)
 
 
-@router.get("/sent", response_model=List[SwapWithDetails])
+@router.get("/sent", response_model=Page[SwapWithDetails])
+@fast_json(Page[SwapWithDetails])
 async def get_sent_swaps(
     status: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
-    Get all swaps sent by current user
+    Get swaps sent by current user, newest first
     """
-    query = db.query(Swap).filter(
+    query = select(Swap).where(
         Swap.requester_id == current_user.id
     ).options(
         joinedload(Swap.requester),
@@ -111,21 +162,24 @@ async def get_sent_swaps(
     )
     
     if status:
-        query = query.filter(Swap.status == status)
+        query = query.where(Swap.status == status)
     
-    return query.all()
+    return await paginate_newest_first(db, query, Swap, limit, cursor)
 
 
-@router.get("/received", response_model=List[SwapWithDetails])
+@router.get("/received", response_model=Page[SwapWithDetails])
+@fast_json(Page[SwapWithDetails])
 async def get_received_swaps(
     status: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
-    Get all swaps received by current user
+    Get swaps received by current user, newest first
     """
-    query = db.query(Swap).filter(
+    query = select(Swap).where(
         Swap.provider_id == current_user.id
     ).options(
         joinedload(Swap.requester),
@@ -135,21 +189,21 @@ async def get_received_swaps(
     )
     
     if status:
-        query = query.filter(Swap.status == status)
+        query = query.where(Swap.status == status)
     
-    return query.all()
+    return await paginate_newest_first(db, query, Swap, limit, cursor)
 
 
 @router.get("/{swap_id}", response_model=SwapWithDetails)
 async def get_swap(
     swap_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get a swap by ID
     """
-    swap = db.query(Swap).filter(
+    swap = await db.scalar(select(Swap).where(
         Swap.id == swap_id,
         ((Swap.requester_id == current_user.id) | (Swap.provider_id == current_user.id))
     ).options(
@@ -157,7 +211,7 @@ async def get_swap(
         joinedload(Swap.provider),
         joinedload(Swap.skill_offered),
         joinedload(Swap.skill_wanted)
-    ).first()
+    ))
     
     if not swap:
         raise HTTPException(
@@ -168,64 +222,111 @@ async def get_swap(
     return swap
 
 
-@router.put("/{swap_id}", response_model=SwapInDB)
-async def update_swap(
+# Status transitions: target status -> (the one status it is reached from, who may make it)
+REQUESTER, PROVIDER, PARTICIPANT = "requester", "provider", "participant"
+SWAP_TRANSITIONS = {
+    SwapStatus.ACCEPTED: (SwapStatus.PENDING, PROVIDER),
+    SwapStatus.REJECTED: (SwapStatus.PENDING, PROVIDER),
+    SwapStatus.CANCELLED: (SwapStatus.PENDING, REQUESTER),
+    SwapStatus.COMPLETED: (SwapStatus.ACCEPTED, PARTICIPANT),
+}
+
+
+def role_condition(role: str, user_id: int):
+    if role == REQUESTER:
+        return Swap.requester_id == user_id
+    if role == PROVIDER:
+        return Swap.provider_id == user_id
+    return or_(Swap.requester_id == user_id, Swap.provider_id == user_id)
+
+
+async def transition_error(
+    db: AsyncSession,
     swap_id: int,
     swap_update: SwapUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-) -> Any:
-    """
-    Update a swap status
-    """
-    swap = db.query(Swap).filter(Swap.id == swap_id).first()
+    user_id: int
+) -> HTTPException:
+    """Why a conditional transition matched no row, read once it has failed"""
+    source, role = SWAP_TRANSITIONS[swap_update.status]
+    swap = (await db.execute(
+        select(Swap.status, Swap.version, Swap.requester_id, Swap.provider_id).where(Swap.id == swap_id)
+    )).first()
     
-    if not swap:
-        raise HTTPException(
+    if swap is None:
+        return HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Swap not found"
         )
     
-    # Check permissions
-    if swap.status == SwapStatus.PENDING:
-        # Requester can cancel
-        if swap.requester_id == current_user.id and swap_update.status == SwapStatus.CANCELLED:
-            swap.status = SwapStatus.CANCELLED
-        
-        # Provider can accept or reject
-        elif swap.provider_id == current_user.id and swap_update.status in [SwapStatus.ACCEPTED, SwapStatus.REJECTED]:
-            swap.status = swap_update.status
-        
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to perform this action"
-            )
+    if user_id not in (swap.requester_id, swap.provider_id):
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to perform this action"
+        )
     
-    elif swap.status == SwapStatus.ACCEPTED:
-        # Either user can mark as completed
-        if (swap.requester_id == current_user.id or swap.provider_id == current_user.id) and swap_update.status == SwapStatus.COMPLETED:
-            swap.status = SwapStatus.COMPLETED
-            swap.completed_at = datetime.now()
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You don't have permission to perform this action"
-            )
+    if swap_update.version is not None and swap.version != swap_update.version:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Swap has changed since version {swap_update.version} (now {swap.status.value}, version {swap.version})"
+        )
+    
+    if swap.status != source:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Cannot change a swap from {swap.status.value} to {swap_update.status.value}"
+        )
     
-    else:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"Only the {role} can change this swap to {swap_update.status.value}"
+    )
+
+
+@router.put("/{swap_id}", response_model=SwapInDB)
+async def update_swap(
+    swap_id: int,
+    swap_update: SwapUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+) -> Any:
+    """
+    Update a swap status
+    """
+    transition = SWAP_TRANSITIONS.get(swap_update.status)
+    if transition is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot update swap with status {swap.status}"
+            detail=f"Cannot change a swap to {swap_update.status.value}"
         )
+    source, role = transition
     
-    # Update message if provided
+    values = {"status": swap_update.status, "version": Swap.version + 1}
+    if swap_update.status == SwapStatus.COMPLETED:
+        values["completed_at"] = datetime.now()
     if swap_update.message:
-        swap.message = swap_update.message
+        values["message"] = swap_update.message
+    
+    conditions = [Swap.id == swap_id, Swap.status == source, role_condition(role, current_user.id)]
+    if swap_update.version is not None:
+        conditions.append(Swap.version == swap_update.version)
+    
+    # The precondition is checked by the UPDATE itself, so of two concurrent
+    # transitions of a swap only one can match; no read-modify-write
+    swap = await db.scalar(
+        update(Swap).where(*conditions).values(**values).returning(Swap)
+    )
     
-    db.add(swap)
-    db.commit()
-    db.refresh(swap)
+    if swap is None:
+        await db.rollback()
+        raise await transition_error(db, swap_id, swap_update, current_user.id)
+    
+    await db.commit()
+    
+    await event_hub.publish(
+        SWAP_STATUS_CHANGED,
+        {"swap_id": swap.id, "status": swap.status.value, "previous_status": source.value},
+        [swap.requester_id, swap.provider_id]
+    )
     
     return swap
 
@@ -233,17 +334,17 @@ async def update_swap(
 @router.delete("/{swap_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_swap(
     swap_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Response:
     """
     Delete a swap (only if it's pending and you're the requester)
     """
-    swap = db.query(Swap).filter(
+    swap = await db.scalar(select(Swap).where(
         Swap.id == swap_id,
         Swap.requester_id == current_user.id,
         Swap.status == SwapStatus.PENDING
-    ).first()
+    ))
 
     if not swap:
         raise HTTPException(
@@ -251,8 +352,8 @@ async def delete_swap(
             detail="Swap not found, not owned by you, or not in pending status"
         )
 
-    db.delete(swap)
-    db.commit()
+    await db.delete(swap)
+    await db.commit()
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)  # ✅ MUST return explicit Response
 
@@ -262,18 +363,18 @@ async def delete_swap(
 @router.post("/feedback", response_model=FeedbackInDB, status_code=status.HTTP_201_CREATED)
 async def create_feedback(
     feedback: FeedbackCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Create feedback for a completed swap
     """
     # Check if swap exists and is completed
-    swap = db.query(Swap).filter(
+    swap = await db.scalar(select(Swap).where(
         Swap.id == feedback.swap_id,
         Swap.status == SwapStatus.COMPLETED,
         ((Swap.requester_id == current_user.id) | (Swap.provider_id == current_user.id))
-    ).first()
+    ))
     
     if not swap:
         raise HTTPException(
@@ -296,10 +397,10 @@ async def create_feedback(
         )
     
     # Check if feedback already exists
-    existing_feedback = db.query(Feedback).filter(
+    existing_feedback = await db.scalar(select(Feedback.id).where(
         Feedback.swap_id == feedback.swap_id,
         Feedback.giver_id == current_user.id
-    ).first()
+    ))
     
     if existing_feedback:
         raise HTTPException(
@@ -317,60 +418,71 @@ async def create_feedback(
     )
     
     db.add(db_feedback)
-    db.commit()
-    db.refresh(db_feedback)
+    
+    # Update the receiver's reputation in the same transaction
+    await db.execute(record_rating(feedback.receiver_id, feedback.rating))
+    await db.commit()
+    await db.refresh(db_feedback)
+    
+    await event_hub.publish(
+        FEEDBACK_RECEIVED,
+        {"feedback_id": db_feedback.id, "swap_id": db_feedback.swap_id, "rating": db_feedback.rating},
+        [db_feedback.receiver_id]
+    )
     
     return db_feedback
 
 
 @router.get("/feedback/received", response_model=List[FeedbackWithDetails])
+@fast_json(List[FeedbackWithDetails])
 async def get_received_feedback(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get all feedback received by current user
     """
-    return db.query(Feedback).filter(
+    return (await db.scalars(select(Feedback).where(
         Feedback.receiver_id == current_user.id
     ).options(
         joinedload(Feedback.giver),
         joinedload(Feedback.receiver),
         joinedload(Feedback.swap)
-    ).all()
+    ))).all()
 
 
 @router.get("/feedback/given", response_model=List[FeedbackWithDetails])
+@fast_json(List[FeedbackWithDetails])
 async def get_given_feedback(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get all feedback given by current user
     """
-    return db.query(Feedback).filter(
+    return (await db.scalars(select(Feedback).where(
         Feedback.giver_id == current_user.id
     ).options(
         joinedload(Feedback.giver),
         joinedload(Feedback.receiver),
         joinedload(Feedback.swap)
-    ).all()
+    ))).all()
 
 
 @router.get("/{swap_id}/feedback", response_model=List[FeedbackWithDetails])
 async def get_swap_feedback(
     swap_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get all feedback for a swap
     """
     # Check if swap exists and user is part of it
-    swap = db.query(Swap).filter(
+    swap = await db.scalar(select(Swap.id).where(
         Swap.id == swap_id,
         ((Swap.requester_id == current_user.id) | (Swap.provider_id == current_user.id))
-    ).first()
+    ))
     
     if not swap:
         raise HTTPException(
@@ -378,9 +490,9 @@ async def get_swap_feedback(
             detail="Swap not found or not accessible"
         )
     
-    return db.query(Feedback).filter(
+    return (await db.scalars(select(Feedback).where(
         Feedback.swap_id == swap_id
     ).options(
         joinedload(Feedback.giver),
         joinedload(Feedback.receiver)
-    ).all()
+    ))).all()
@@ -1,11 +1,24 @@
 from typing import Any, List
 import os
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+import secrets
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Form
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from ..core.auth import get_current_user, get_password_hash
-from ..database import get_db
+from ..core.autocomplete import autocomplete_index
+from ..core.indexes import index_sync
+from ..core.cache import Principal, invalidate_principal
+from ..core.etag import conditional_get
+from ..core.images import (
+    PHOTO_CONTENT_TYPES, InvalidImage, photo_files, photo_processor, remove_files, save_upload
+)
+from ..core.replicas import get_read_db
+from ..core.reputation import rating_mean, rating_order
+from ..core.search import find_user_candidates, name_similarity, name_words
+from ..core.serialization import fast_json
+from ..database import get_async_db
 from ..models.user import User, ProfileVisibility
 from ..schemas.user import UserProfile, UserUpdate, UserPublic
 from ..config import settings
@@ -13,36 +26,59 @@ from ..config import settings
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("/me", response_model=UserProfile)
+async def _user_version(db: AsyncSession, user_id: int):
+    version = await db.scalar(
+        select(func.coalesce(User.updated_at, User.created_at)).where(User.id == user_id)
+    )
+    return None if version is None else (version,)
+
+
+async def own_profile_version(db: AsyncSession, current_user: Principal, request) -> Any:
+    return await _user_version(db, current_user.id)
+
+
+async def profile_version(db: AsyncSession, current_user: Principal, request) -> Any:
+    # Runs before the path is validated; leave a malformed id to its 422
+    try:
+        user_id = int(request.path_params["user_id"])
+    except ValueError:
+        return None
+    return await _user_version(db, user_id)
+
+
+@router.get("/me", response_model=UserProfile, dependencies=[conditional_get(own_profile_version)])
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get current user profile
     """
-    return current_user
+    return await db.get(User, current_user.id)
 
 
 @router.put("/me", response_model=UserProfile)
 async def update_user_profile(
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Update current user profile
     """
+    user = await db.get(User, current_user.id)
+    
     # Check if email is being updated and already exists
-    if user_update.email and user_update.email != current_user.email:
-        if db.query(User).filter(User.email == user_update.email).first():
+    if user_update.email and user_update.email != user.email:
+        if await db.scalar(select(User.id).where(User.email == user_update.email)):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
     
     # Check if username is being updated and already exists
-    if user_update.username and user_update.username != current_user.username:
-        if db.query(User).filter(User.username == user_update.username).first():
+    if user_update.username and user_update.username != user.username:
+        if await db.scalar(select(User.id).where(User.username == user_update.username)):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
@@ -53,74 +89,87 @@ async def update_user_profile(
     
     # Hash password if it's being updated
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await get_password_hash(update_data.pop("password"))
     
     # Update user object
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(user, field, value)
     
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.id)
+    autocomplete_index.update_user(user)
+    await index_sync.changed(user.id)
     
-    return current_user
+    return user
 
 
 @router.post("/me/profile-photo", response_model=UserProfile)
 async def upload_profile_photo(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Upload profile photo
     """
-    # Check file size
-    contents = await file.read()
-    if len(contents) > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size exceeds {settings.MAX_UPLOAD_SIZE // 1024 // 1024}MB"
-        )
-    
     # Check file type
-    if file.content_type not in ["image/jpeg", "image/png", "image/gif"]:
+    extension = PHOTO_CONTENT_TYPES.get(file.content_type)
+    if extension is None:
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             detail="File type not supported. Please upload a JPEG, PNG, or GIF image."
         )
     
-    # Create upload directory if it doesn't exist
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-    
-    # Save file
-    file_extension = file.filename.split(".")[-1]
-    filename = f"user_{current_user.id}_profile.{file_extension}"
-    file_path = os.path.join(settings.UPLOAD_DIR, filename)
+    # Stream to a temp file, enforcing the size limit while copying
+    stem = f"user_{current_user.id}_{secrets.token_hex(6)}"
+    filename = f"{stem}.{extension}"
+    temp_path = os.path.join(settings.UPLOAD_DIR, f".{filename}.upload")
+    await save_upload(file, temp_path, settings.MAX_UPLOAD_SIZE)
+    
+    # Render thumbnails off the event loop; this also rejects non-images
+    try:
+        await photo_processor.render(temp_path, stem)
+    except InvalidImage:
+        remove_files([temp_path])
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="The uploaded file is not a valid image."
+        )
     
-    # Write file
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    os.replace(temp_path, os.path.join(settings.UPLOAD_DIR, filename))
     
     # Update user profile
-    current_user.profile_photo = f"/static/uploads/{filename}"
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    user = await db.get(User, current_user.id)
+    previous_photo = user.profile_photo
+    user.profile_photo = f"/static/uploads/{filename}"
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
     
-    return current_user
+    # Drop the replaced photo and its variants
+    await run_in_threadpool(remove_files, photo_files(previous_photo))
+    
+    return user
 
 
-@router.get("/{user_id}", response_model=UserPublic)
+@router.get(
+    "/{user_id}",
+    response_model=UserPublic,
+    dependencies=[conditional_get(
+        profile_version, cache_control="private, max-age=30", session_dependency=get_read_db
+    )]
+)
 async def get_user_profile(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
     Get user profile by ID
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     
     if not user:
         raise HTTPException(
@@ -139,31 +188,47 @@ async def get_user_profile(
 
 
 @router.get("/", response_model=List[UserPublic])
+@fast_json(List[UserPublic])
 async def search_users(
     query: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    threshold: float = Query(settings.USER_SEARCH_THRESHOLD, ge=0, le=1),
+    sort: str = Query("relevance", pattern="^(relevance|rating)$"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ) -> Any:
     """
-    Search users by name or username
+    Search users by name or username, tolerating typos, best match or best rated first
     """
-    if not query:
-        # Return all public users
-        users = db.query(User).filter(
-            User.visibility == ProfileVisibility.PUBLIC,
-            User.is_active == True,
-            User.is_banned == False
-        ).all()
+    visible = (
+        User.visibility == ProfileVisibility.PUBLIC,
+        User.is_active == True,
+        User.is_banned == False
+    )
+    
+    words = name_words(query or "")
+    if not words:
+        # Browse public users
+        order = (User.id,) if sort == "relevance" else (
+            rating_mean.desc().nulls_last(), User.rating_count.desc(), User.id
+        )
+        return (await db.scalars(select(User).where(*visible).order_by(*order).limit(limit))).all()
+    
+    # Re-rank the trigram index hits by similarity to the query, or by rating
+    candidates = await find_user_candidates(db, words, settings.USER_SEARCH_CANDIDATES)
+    hits = [
+        (name_similarity(words, row.name, row.username), row)
+        for row in candidates
+    ]
+    if sort == "relevance":
+        hits.sort(key=lambda hit: (-hit[0], hit[1].user_id))
     else:
-        # Search by name or username
-        users = db.query(User).filter(
-            or_(
-                User.name.ilike(f"%{query}%"),
-                User.username.ilike(f"%{query}%")
-            ),
-            User.visibility == ProfileVisibility.PUBLIC,
-            User.is_active == True,
-            User.is_banned == False
-        ).all()
-    
-    return users
+        hits.sort(key=lambda hit: (*rating_order(hit[1].rating_sum, hit[1].rating_count), -hit[0], hit[1].user_id))
+    ids = [row.user_id for score, row in hits if score >= threshold][:limit]
+    if not ids:
+        return []
+    
+    users = (await db.scalars(select(User).where(User.id.in_(ids), *visible))).all()
+    users_by_id = {user.id: user for user in users}
+    
+    return [users_by_id[user_id] for user_id in ids if user_id in users_by_id]
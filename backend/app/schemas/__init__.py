@@ -1,13 +1,17 @@
 from .user import (
-    UserBase, UserCreate, UserUpdate, UserInDB, UserPublic, UserProfile,
+    UserBase, UserCreate, UserUpdate, UserInDB, UserPublic, UserProfile, Reputation,
     UserLogin, Token, TokenData
 )
 from .skill import (
     SkillBase, SkillOfferedCreate, SkillOfferedUpdate, SkillOfferedInDB,
     SkillWantedCreate, SkillWantedUpdate, SkillWantedInDB,
-    SkillSearch, SkillSearchResult
+    SkillSearch, SkillSearchResult, SkillOfferedBulkCreate, SkillWantedBulkCreate,
+    SkillBulkModeration, SkillModerationResult
 )
 from .swap import (
     SwapBase, SwapCreate, SwapUpdate, SwapInDB, SwapWithDetails,
     FeedbackBase, FeedbackCreate, FeedbackInDB, FeedbackWithDetails
 )
+from .pagination import Page
+from .message import PlatformMessageCreate, PlatformMessageJob
+from .autocomplete import SkillSuggestion, UserSuggestion, Suggestions
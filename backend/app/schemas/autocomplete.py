@@ -0,0 +1,21 @@
+from typing import List
+from pydantic import BaseModel
+
+
+# Schema for a suggested skill and how many users offer or want it
+class SkillSuggestion(BaseModel):
+    name: str
+    count: int
+
+
+# Schema for a suggested user
+class UserSuggestion(BaseModel):
+    id: int
+    name: str
+    username: str
+
+
+# Schema for the suggestions matching a prefix
+class Suggestions(BaseModel):
+    skills: List[SkillSuggestion]
+    users: List[UserSuggestion]
@@ -0,0 +1,12 @@
+from typing import List
+from pydantic import BaseModel
+
+from .user import UserPublic
+
+
+# Schema for a mutual skill match
+class SkillMatch(BaseModel):
+    user: UserPublic
+    score: int
+    they_offer: List[str]  # Skills I want that they offer
+    they_want: List[str]  # Skills I offer that they want
@@ -0,0 +1,34 @@
+from typing import Optional
+from pydantic import BaseModel, Field, computed_field
+from datetime import datetime
+
+from ..models.message import MessageStatus
+
+
+# Schema for queuing a platform-wide message
+class PlatformMessageCreate(BaseModel):
+    title: str = Field(..., min_length=1)
+    message: str = Field(..., min_length=1)
+
+
+# Schema for a message job and its delivery progress
+class PlatformMessageJob(BaseModel):
+    id: int
+    title: str
+    status: MessageStatus
+    total_recipients: int
+    delivered: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    @computed_field
+    @property
+    def progress(self) -> float:
+        if self.status == MessageStatus.COMPLETED or not self.total_recipients:
+            return 1.0 if self.status == MessageStatus.COMPLETED else 0.0
+        return min(self.delivered / self.total_recipients, 1.0)
+
+    class Config:
+        from_attributes = True
@@ -2,6 +2,7 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+from ..config import settings
 from ..models.skill import SkillStatus
 
 
@@ -57,6 +58,28 @@ class SkillWantedInDB(SkillBase):
         from_attributes = True
 
 
+# Schema for creating several skills offered in one request
+class SkillOfferedBulkCreate(BaseModel):
+    items: List[SkillOfferedCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+# Schema for creating several skills wanted in one request
+class SkillWantedBulkCreate(BaseModel):
+    items: List[SkillWantedCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+# Schema for moderating several skills in one request
+class SkillBulkModeration(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+# Schema for the outcome of moderating one skill
+class SkillModerationResult(BaseModel):
+    id: int
+    result: str  # "updated", "unchanged" or "not_found"
+    status: Optional[SkillStatus] = None
+
+
 # Schema for skill search
 class SkillSearch(BaseModel):
     query: str = Field(..., min_length=1)
@@ -24,6 +24,7 @@ class SwapCreate(SwapBase):
 class SwapUpdate(BaseModel):
     status: SwapStatus
     message: Optional[str] = None
+    version: Optional[int] = None  # The version last seen; 409 if the swap changed since
 
 
 # Schema for swap in DB
@@ -35,6 +36,7 @@ class SwapInDB(BaseModel):
     skill_wanted_id: Optional[int] = None
     message: Optional[str] = None
     status: SwapStatus
+    version: int
     created_at: datetime
     updated_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
@@ -1,7 +1,8 @@
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Dict, Optional, List
+from pydantic import BaseModel, EmailStr, Field, computed_field, field_validator
 from datetime import datetime
 
+from ..core.images import photo_variant_urls
 from ..models.user import UserRole, UserAvailability, ProfileVisibility
 
 
@@ -61,6 +62,14 @@ class UserInDB(UserBase):
         from_attributes = True
 
 
+# Schema for a user's rating aggregates
+class Reputation(BaseModel):
+    count: int
+    sum: float
+    mean: Optional[float] = None
+    histogram: Dict[str, int]  # Feedback received by star, "1" to "5"
+
+
 # Schema for public user data
 class UserPublic(BaseModel):
     id: int
@@ -72,6 +81,34 @@ class UserPublic(BaseModel):
     availability: UserAvailability
     created_at: datetime
     
+    # Rating aggregates as stored on the user, published as `reputation`
+    rating_count: Optional[int] = Field(None, exclude=True)
+    rating_sum: Optional[float] = Field(None, exclude=True)
+    rating_1: Optional[int] = Field(None, exclude=True)
+    rating_2: Optional[int] = Field(None, exclude=True)
+    rating_3: Optional[int] = Field(None, exclude=True)
+    rating_4: Optional[int] = Field(None, exclude=True)
+    rating_5: Optional[int] = Field(None, exclude=True)
+    
+    @computed_field
+    @property
+    def reputation(self) -> Reputation:
+        count, total = self.rating_count or 0, self.rating_sum or 0.0
+        return Reputation(
+            count=count,
+            sum=total,
+            mean=round(total / count, 2) if count else None,
+            histogram={
+                str(n): getattr(self, f"rating_{n}") or 0 for n in range(1, 6)
+            },
+        )
+    
+    # Thumbnail URLs by size then format, e.g. profile_photo_variants["256"]["webp"]
+    @computed_field
+    @property
+    def profile_photo_variants(self) -> Optional[Dict[str, Dict[str, str]]]:
+        return photo_variant_urls(self.profile_photo)
+    
     class Config:
         from_attributes = True
 
@@ -0,0 +1,227 @@
+"""
+Production launcher: uvicorn worker processes sharing one listening socket
+
+Usage:
+    python -m app.serve [--host 0.0.0.0] [--port 8000] [--workers N]
+
+Workers are fresh interpreters, each running the app's startup warmup
+(schema check, search indexes, connection pools, principals) before it
+accepts connections; until then the others take them. Signals:
+    SIGHUP           rolling restart, one worker at a time
+    SIGTERM, SIGINT  graceful stop
+Workers that exit or stop heartbeating are replaced. Unless EVENTS_BACKEND
+is set, workers pass /api/events notifications and search index changes to
+each other through unix sockets in a directory private to this launcher.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import uvicorn
+
+from .config import settings
+from .core.workers import READY, STARTING, STOPPING, WorkerTable
+
+logger = logging.getLogger("app.serve")
+
+
+class WorkerServer(uvicorn.Server):
+    """
+    uvicorn, ending open /api/events streams as soon as it is told to stop:
+    they never finish on their own, so graceful shutdown would otherwise
+    wait for them until the launcher kills the worker
+    """
+
+    def handle_exit(self, sig, frame) -> None:
+        from .core.events import event_hub
+
+        event_hub.close()
+        super().handle_exit(sig, frame)
+
+
+def run_worker(config: dict, sockets: list, array, slot: int, generation: int) -> None:
+    """Entry point of a worker process"""
+    from .core.workers import worker_state
+
+    worker_state.attach(WorkerTable(array), slot, generation)
+    WorkerServer(uvicorn.Config(**config)).run(sockets=sockets)
+
+
+class Supervisor:
+    """
+    Starts `workers` processes and keeps them running. A rolling restart
+    starts a replacement, waits until it is ready, then stops one old
+    worker, so capacity never drops; if a replacement fails to warm up
+    (e.g. a broken deploy) the roll stops and the old workers keep serving.
+    """
+
+    def __init__(self, config: dict, workers: int, timeout: float, graceful_timeout: float):
+        self.config = config
+        self.workers = workers
+        self.timeout = timeout
+        self.graceful_timeout = graceful_timeout
+
+        self.context = multiprocessing.get_context("spawn")
+        # Room for a replacement next to every worker during a restart
+        self.table = WorkerTable.create(workers * 2, self.context)
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self.generation = 0
+        self.socket = None
+
+        self.should_exit = False
+        self.should_restart = False
+
+    def spawn(self) -> int:
+        slot = self.table.free_slot()
+        now = time.time()
+        self.table.update(slot, pid=0, state=STARTING, generation=self.generation, started=now, heartbeat=now)
+        process = self.context.Process(
+            target=run_worker,
+            args=(self.config, [self.socket], self.table.array, slot, self.generation),
+            name=f"worker-{slot}",
+        )
+        process.start()
+        self.processes[slot] = process
+        return slot
+
+    def wait_ready(self, slot: int) -> bool:
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline and not self.should_exit:
+            if self.table.get(slot)["state"] == READY:
+                return True
+            if not self.processes[slot].is_alive():
+                return False
+            time.sleep(0.1)
+        return False
+
+    def stop(self, slot: int) -> None:
+        """Stop a worker gracefully (uvicorn finishes its requests on SIGTERM), then forcibly"""
+        process = self.processes.pop(slot)
+        self.table.update(slot, state=STOPPING)
+        if process.is_alive():
+            process.terminate()
+            process.join(self.graceful_timeout)
+            if process.is_alive():
+                logger.warning("Worker %s did not stop in time, killing it", process.pid)
+                process.kill()
+                process.join()
+        self.table.clear(slot)
+
+    def rolling_restart(self) -> None:
+        self.generation += 1
+        logger.info("Rolling restart to generation %s", self.generation)
+        old = [slot for slot in self.processes if self.table.get(slot)["generation"] < self.generation]
+        for slot in old:
+            replacement = self.spawn()
+            if not self.wait_ready(replacement):
+                logger.error("Replacement worker failed to warm up; stopping the restart")
+                self.stop(replacement)
+                return
+            self.stop(slot)
+        logger.info("Rolling restart done")
+
+    def check_workers(self) -> None:
+        """Replace workers that exited or whose event loop stopped heartbeating"""
+        now = time.time()
+        for slot, process in list(self.processes.items()):
+            row = self.table.get(slot)
+            if not process.is_alive():
+                logger.warning("Worker %s exited with code %s, replacing it", process.pid, process.exitcode)
+            elif row["state"] == READY and now - row["heartbeat"] > self.timeout:
+                logger.warning("Worker %s stopped heartbeating, replacing it", process.pid)
+                process.kill()
+                process.join()
+            elif row["state"] == STARTING and now - row["started"] > self.timeout:
+                logger.warning("Worker %s did not warm up in time, replacing it", process.pid)
+                process.kill()
+                process.join()
+            else:
+                continue
+
+            del self.processes[slot]
+            self.table.clear(slot)
+            self.spawn()
+
+    def handle_signal(self, signum, frame) -> None:
+        if signum == signal.SIGHUP:
+            self.should_restart = True
+        else:
+            self.should_exit = True
+
+    def run(self) -> int:
+        self.socket = uvicorn.Config(**self.config).bind_socket()
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.handle_signal)
+
+        logger.info("Starting %s workers on %s:%s", self.workers, self.config["host"], self.config["port"])
+        slots = [self.spawn() for _ in range(self.workers)]
+        # Refuse to serve a deploy whose workers cannot start at all
+        if not all(self.wait_ready(slot) for slot in slots) and not self.should_exit:
+            logger.error("Workers failed to warm up; check their logs")
+            self.shutdown()
+            return 1
+        logger.info("All workers ready")
+
+        while not self.should_exit:
+            if self.should_restart:
+                self.should_restart = False
+                self.rolling_restart()
+            self.check_workers()
+            time.sleep(0.5)
+
+        self.shutdown()
+        return 0
+
+    def shutdown(self) -> None:
+        logger.info("Stopping workers")
+        for slot in list(self.processes):
+            self.stop(slot)
+        self.socket.close()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.serve")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--timeout", type=float, default=settings.WORKER_TIMEOUT,
+                        help="Seconds to warm up, or without a heartbeat, before a worker is replaced")
+    parser.add_argument("--graceful-timeout", type=float, default=settings.WORKER_GRACEFUL_TIMEOUT)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(message)s")
+
+    # Workers read this from the environment when they start
+    events_dir = None
+    if "EVENTS_BACKEND" not in os.environ:
+        events_dir = tempfile.mkdtemp(prefix="skill-swap-events-")
+        os.environ.update(EVENTS_BACKEND="unix", EVENTS_SOCKET_DIR=events_dir)
+    elif os.environ["EVENTS_BACKEND"] == "local" and args.workers > 1:
+        logger.warning("EVENTS_BACKEND=local: each worker's search indexes and event streams "
+                       "only see the writes it handles itself")
+
+    config = {
+        "app": "app.main:app",
+        "host": args.host,
+        "port": args.port,
+        "lifespan": "on",  # a worker whose startup fails exits instead of serving
+        "log_level": args.log_level,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+    }
+    try:
+        return Supervisor(config, args.workers, args.timeout, args.graceful_timeout).run()
+    finally:
+        if events_dir is not None:
+            shutil.rmtree(events_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+End-to-end API benchmarks
+
+Usage:
+    python -m benchmarks seed --db bench.db [--scale small]
+    python -m benchmarks run --db bench.db [--output results.json]
+    python -m benchmarks compare base.json head.json
+    python -m benchmarks serialization [--sizes 50 200 1000]
+"""
@@ -0,0 +1,288 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+def _use_database(path: str) -> None:
+    # Must happen before anything imports app.config
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(path)}"
+
+
+def seed(args) -> int:
+    """Create a fresh database at --db and fill it with synthetic data"""
+    if os.path.exists(args.db):
+        if not args.force:
+            print(f"{args.db} already exists (use --force to replace it)", file=sys.stderr)
+            return 1
+        os.remove(args.db)
+
+    _use_database(args.db)
+    subprocess.run(["alembic", "upgrade", "head"], check=True, env=os.environ)
+
+    from app.database import engine
+    from .seed import SCALES, DatasetGenerator, seed_database
+
+    users, skills, swaps, feedback = SCALES[args.scale]
+    generator = DatasetGenerator(
+        users=args.users or users,
+        skills=args.skills or skills,
+        swaps=args.swaps or swaps,
+        feedback=args.feedback or feedback,
+        seed=args.seed,
+    )
+    seed_database(engine, generator)
+    return 0
+
+
+def run(args) -> int:
+    """Run every scenario against --db and write a JSON report"""
+    _use_database(args.db)
+
+    from .runner import run_benchmarks
+
+    report = asyncio.run(run_benchmarks(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        sample_users=args.sample_users,
+        seed=args.seed,
+        only=args.only,
+        log=lambda line: print(line, file=sys.stderr),
+    ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+def serialization(args) -> int:
+    """Compare response serializers on the same swap pages"""
+    from .serialization import run_serialization
+
+    report = asyncio.run(run_serialization(
+        sizes=args.sizes, repeat=args.repeat, log=lambda line: print(line, file=sys.stderr)
+    ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+def concurrency(args) -> int:
+    """Compare SQLite read/write concurrency with and without the connection profile"""
+    from .concurrency import run_concurrency
+
+    report = run_concurrency(
+        db=args.db, readers=args.readers, writers=args.writers, duration=args.duration,
+        seed=args.seed, log=lambda line: print(line, file=sys.stderr),
+    )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+def events(args) -> int:
+    """Measure event hub fan-out over many idle connections"""
+    from .events import run_events
+
+    report = asyncio.run(run_events(
+        connections=args.connections, users=args.users, events=args.events,
+        buffer_size=args.buffer_size, seed=args.seed, log=lambda line: print(line, file=sys.stderr),
+    ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+def overload(args) -> int:
+    """Compare cheap-endpoint latency under overload with and without load shedding"""
+    _use_database(args.db)
+
+    from .overload import run_overload
+
+    report = asyncio.run(run_overload(
+        flood=args.flood, duration=args.duration, sample_users=args.sample_users,
+        seed=args.seed, log=lambda line: print(line, file=sys.stderr),
+    ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+def transitions(args) -> int:
+    """Race conflicting swap transitions and check that none is lost"""
+    with tempfile.TemporaryDirectory() as directory:
+        # The run creates and transitions swaps, so work on a copy
+        path = os.path.join(directory, "transitions.db")
+        shutil.copyfile(args.db, path)
+        _use_database(path)
+
+        from .transitions import run_transitions
+
+        report = asyncio.run(run_transitions(
+            swaps=args.swaps, contenders=args.contenders, users=args.users,
+            seed=args.seed, log=lambda line: print(line, file=sys.stderr),
+        ))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    for problem in report["problems"]:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    return 1 if report["problems"] else 0
+
+
+def startup(args) -> int:
+    """Time importing and starting the app; fail on import-time regressions"""
+    from .startup import check, run_startup
+
+    report = run_startup(
+        runs=args.runs, db=args.db, top=args.top, log=lambda line: print(line, file=sys.stderr)
+    )
+    problems = check(report, args.max_import_ms)
+    report["problems"] = problems
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+def compare(args) -> int:
+    """Show per-scenario changes between two reports"""
+    from .runner import compare as compare_reports
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    print("\n".join(compare_reports(base, head)))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help=seed.__doc__)
+    seed_parser.add_argument("--db", default="bench.db", help="SQLite file to create")
+    seed_parser.add_argument("--scale", choices=["tiny", "small", "full"], default="small")
+    seed_parser.add_argument("--users", type=int, help="Override the scale's user count")
+    seed_parser.add_argument("--skills", type=int, help="Override the scale's skill count")
+    seed_parser.add_argument("--swaps", type=int, help="Override the scale's swap count")
+    seed_parser.add_argument("--feedback", type=int, help="Override the scale's feedback count")
+    seed_parser.add_argument("--seed", type=int, default=42)
+    seed_parser.add_argument("--force", action="store_true", help="Replace an existing file")
+    seed_parser.set_defaults(func=seed)
+
+    run_parser = commands.add_parser("run", help=run.__doc__)
+    run_parser.add_argument("--db", default="bench.db")
+    run_parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    run_parser.add_argument("--concurrency", type=int, default=10)
+    run_parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario")
+    run_parser.add_argument("--sample-users", type=int, default=20, help="Users logged in up front")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--only", nargs="+", help="Scenario or router names to run")
+    run_parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    run_parser.set_defaults(func=run)
+
+    serialization_parser = commands.add_parser("serialization", help=serialization.__doc__)
+    serialization_parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    serialization_parser.add_argument("--repeat", type=int, default=50)
+    serialization_parser.add_argument("--output")
+    serialization_parser.set_defaults(func=serialization)
+
+    concurrency_parser = commands.add_parser("concurrency", help=concurrency.__doc__)
+    concurrency_parser.add_argument("--db", default="bench.db", help="Seeded database to copy (left untouched)")
+    concurrency_parser.add_argument("--readers", type=int, default=8)
+    concurrency_parser.add_argument("--writers", type=int, default=2)
+    concurrency_parser.add_argument("--duration", type=float, default=10.0, help="Seconds per profile")
+    concurrency_parser.add_argument("--seed", type=int, default=42)
+    concurrency_parser.add_argument("--output")
+    concurrency_parser.set_defaults(func=concurrency)
+
+    events_parser = commands.add_parser("events", help=events.__doc__)
+    events_parser.add_argument("--connections", type=int, default=20000, help="Idle subscriptions to open")
+    events_parser.add_argument("--users", type=int, default=10000, help="Users the connections belong to")
+    events_parser.add_argument("--events", type=int, default=10000, help="Events to publish")
+    events_parser.add_argument("--buffer-size", type=int, default=64)
+    events_parser.add_argument("--seed", type=int, default=42)
+    events_parser.add_argument("--output")
+    events_parser.set_defaults(func=events)
+
+    overload_parser = commands.add_parser("overload", help=overload.__doc__)
+    overload_parser.add_argument("--db", default="bench.db")
+    overload_parser.add_argument("--flood", type=int, default=100, help="Concurrent clients sending logins and listings")
+    overload_parser.add_argument("--duration", type=float, default=10.0, help="Seconds per profile")
+    overload_parser.add_argument("--sample-users", type=int, default=20, help="Users logged in up front")
+    overload_parser.add_argument("--seed", type=int, default=42)
+    overload_parser.add_argument("--output")
+    overload_parser.set_defaults(func=overload)
+
+    transitions_parser = commands.add_parser("transitions", help=transitions.__doc__)
+    transitions_parser.add_argument("--db", default="bench.db", help="Seeded database to copy (left untouched)")
+    transitions_parser.add_argument("--swaps", type=int, default=200, help="Swaps raced at once")
+    transitions_parser.add_argument("--contenders", type=int, default=3, help="Copies of each conflicting request")
+    transitions_parser.add_argument("--users", type=int, default=20, help="Users the swaps are between")
+    transitions_parser.add_argument("--seed", type=int, default=42)
+    transitions_parser.add_argument("--output")
+    transitions_parser.set_defaults(func=transitions)
+
+    startup_parser = commands.add_parser("startup", help=startup.__doc__)
+    startup_parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    startup_parser.add_argument("--db", help="Also time the lifespan startup against this database")
+    startup_parser.add_argument("--top", type=int, default=15, help="Modules and packages to list")
+    startup_parser.add_argument("--max-import-ms", type=float, help="Fail above this median import time")
+    startup_parser.add_argument("--output")
+    startup_parser.set_defaults(func=startup)
+
+    compare_parser = commands.add_parser("compare", help=compare.__doc__)
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
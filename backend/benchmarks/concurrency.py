@@ -0,0 +1,151 @@
+"""
+SQLite read/write concurrency benchmark.
+
+Copies a seeded database once per profile and hammers each copy from
+reader and writer threads for a fixed time, the way the app's sessions
+use it: readers list a user's swaps, writers read a user then add a wanted
+skill and touch their bio in one transaction. "default" is the engine as
+it was before the connection profile (rollback journal, SQLite defaults);
+"tuned" applies app.database.sqlite_pragmas(). Reports throughput, latency
+percentiles and "database is locked" errors for both.
+"""
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, func, or_, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import apply_sqlite_pragmas, sqlite_pragmas
+from app.models.skill import SkillWanted
+from app.models.swap import Swap
+from app.models.user import User
+
+from .runner import _percentile
+
+
+class Worker(threading.Thread):
+    def __init__(self, operation, deadline: float, seed: int):
+        super().__init__(daemon=True)
+        self.operation = operation
+        self.deadline = deadline
+        self.rng = random.Random(seed)
+        self.latencies: List[float] = []
+        self.locked = 0
+        self.failure: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            while time.perf_counter() < self.deadline:
+                started = time.perf_counter()
+                try:
+                    self.operation(self.rng)
+                except OperationalError as e:
+                    if "locked" not in str(e) and "busy" not in str(e):
+                        raise
+                    self.locked += 1
+                else:
+                    self.latencies.append(time.perf_counter() - started)
+        except BaseException as e:  # reported by the caller
+            self.failure = e
+
+
+def _summarize(workers: List[Worker], elapsed: float) -> dict:
+    latencies = [latency for worker in workers for latency in worker.latencies]
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "operations": len(latencies),
+        "locked_errors": sum(worker.locked for worker in workers),
+        "throughput_ops": round(len(latencies) / elapsed, 1),
+        "p50_ms": _percentile(quantiles, 50) if latencies else None,
+        "p95_ms": _percentile(quantiles, 95) if latencies else None,
+        "p99_ms": _percentile(quantiles, 99) if latencies else None,
+    }
+
+
+def run_profile(path: str, pragmas: Optional[list], readers: int, writers: int,
+                duration: float, seed: int) -> dict:
+    """One timed run against the database at path, with pragmas or SQLite's defaults"""
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False},
+        pool_size=readers + writers, max_overflow=0,
+    )
+    if pragmas is None:
+        # WAL is persistent in the file, so put the copy back in rollback mode
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA journal_mode = DELETE")
+    else:
+        apply_sqlite_pragmas(engine, pragmas)
+
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        user_ids = db.scalars(select(User.id)).all()
+
+    def read(rng: random.Random) -> None:
+        user_id = rng.choice(user_ids)
+        with Session() as db:
+            db.get(User, user_id)
+            db.scalars(
+                select(Swap)
+                .where(or_(Swap.requester_id == user_id, Swap.provider_id == user_id))
+                .order_by(Swap.created_at.desc(), Swap.id.desc())
+                .limit(50)
+            ).all()
+            db.scalar(select(func.count()).select_from(SkillWanted).where(SkillWanted.user_id == user_id))
+
+    def write(rng: random.Random) -> None:
+        with Session() as db:
+            user = db.get(User, rng.choice(user_ids))
+            db.add(SkillWanted(user_id=user.id, name="Benchmark skill", description="Concurrency benchmark"))
+            user.bio = f"Updated {rng.random()}"
+            db.commit()
+
+    # Warm the page cache so both profiles start from the same place
+    with engine.connect() as connection:
+        connection.execute(text("SELECT count(*) FROM swaps")).scalar()
+
+    started = time.perf_counter()
+    deadline = started + duration
+    reader_threads = [Worker(read, deadline, seed + i) for i in range(readers)]
+    writer_threads = [Worker(write, deadline, seed + readers + i) for i in range(writers)]
+    for worker in reader_threads + writer_threads:
+        worker.start()
+    for worker in reader_threads + writer_threads:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    for worker in reader_threads + writer_threads:
+        if worker.failure is not None:
+            raise worker.failure
+
+    return {"reads": _summarize(reader_threads, elapsed), "writes": _summarize(writer_threads, elapsed)}
+
+
+def run_concurrency(db: str, readers: int, writers: int, duration: float, seed: int, log=print) -> dict:
+    profiles = {"default": None, "tuned": sqlite_pragmas()}
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, pragmas in profiles.items():
+            path = os.path.join(directory, f"{name}.db")
+            shutil.copyfile(db, path)
+            results[name] = run_profile(path, pragmas, readers, writers, duration, seed)
+            for kind in ("reads", "writes"):
+                stats = results[name][kind]
+                log(f"{name:<8} {kind:<6} {stats['throughput_ops']:>8.1f} ops/s  "
+                    f"p50 {stats['p50_ms']}ms  p95 {stats['p95_ms']}ms  p99 {stats['p99_ms']}ms  "
+                    f"locked {stats['locked_errors']}")
+
+    return {
+        "readers": readers,
+        "writers": writers,
+        "duration_s": duration,
+        "pragmas": {name: value for name, value in profiles["tuned"]},
+        "profiles": results,
+    }
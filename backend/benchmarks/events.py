@@ -0,0 +1,79 @@
+"""
+Event hub fan-out benchmark.
+
+Opens `connections` idle subscriptions on one EventHub, spread over
+`users` users, each drained by the same stream generator /api/events
+serves, and reports the memory they hold and how long publishing to
+them takes. Every event goes to two users (like a swap's requester and
+provider), so the cost of a publish should not grow with the number of
+open connections. Finally one client stops reading, to check that its
+buffer stays bounded. HTTP and socket overhead are not included.
+"""
+import asyncio
+import random
+import statistics
+import time
+import tracemalloc
+from typing import List
+
+from app.core.events import EventBackend, EventHub
+
+from .runner import _percentile
+
+
+async def _drain(hub: EventHub, subscription, received: List[int]) -> None:
+    async for chunk in hub.stream(subscription, heartbeat=3600, max_seconds=3600):
+        received[0] += chunk.count(b"\ndata:")
+
+
+async def run_events(connections: int, users: int, events: int, buffer_size: int, seed: int, log=print) -> dict:
+    rng = random.Random(seed)
+    hub = EventHub(buffer_size, connections + 1, backend=EventBackend())
+    await hub.start()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    received = [0]
+    subscriptions = [hub.subscribe(i % users) for i in range(connections)]
+    tasks = [asyncio.create_task(_drain(hub, subscription, received)) for subscription in subscriptions]
+    await asyncio.sleep(0)  # let every stream reach its first wait
+    await asyncio.sleep(0)
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    log(f"{connections} idle connections: {memory / connections:.0f} bytes each")
+
+    latencies = []
+    for i in range(events):
+        started = time.perf_counter()
+        await hub.publish("swap.status_changed", {"swap_id": i, "status": "accepted"},
+                          [rng.randrange(users), rng.randrange(users)])
+        latencies.append(time.perf_counter() - started)
+    await asyncio.sleep(0.1)  # let the streams write what they were given
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    log(f"publish p50 {_percentile(quantiles, 50)}ms  p99 {_percentile(quantiles, 99)}ms  "
+        f"frames written {received[0]}")
+
+    # A client that stops reading keeps only its last buffer_size frames
+    stalled = hub.subscribe(users)
+    for i in range(buffer_size * 10):
+        await hub.publish("swap.created", {"swap_id": i}, [users])
+    stalled_pending = len(stalled.pending)
+    hub.unsubscribe(stalled)
+
+    stats = hub.stats()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await hub.stop()
+
+    return {
+        "connections": connections,
+        "users": users,
+        "events": events,
+        "bytes_per_connection": round(memory / connections),
+        "publish_p50_ms": _percentile(quantiles, 50),
+        "publish_p99_ms": _percentile(quantiles, 99),
+        "frames_written": received[0],
+        "stalled_client": {"buffer_size": buffer_size, "pending": stalled_pending},
+        "hub": stats,
+    }
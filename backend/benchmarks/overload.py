@@ -0,0 +1,109 @@
+"""
+Overload benchmark for load shedding.
+
+Floods the app in-process with far more concurrent logins (bcrypt) and
+large swap listings than it can serve, while a probe fetches the cheap
+/api/users/me one request at a time. Runs once with every route class
+unlimited, as before load shedding, and once with the configured
+CONCURRENCY_LIMITS, and reports the probe's latency, the flood's status
+codes and the latency of the flood requests that were admitted.
+"""
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+from app.core.shedding import load_shedder
+from app.main import app
+
+from .runner import _percentile, build_context
+from .seed import PASSWORD
+
+
+def _latency(latencies: List[float]) -> dict:
+    if len(latencies) < 2:
+        return {"requests": len(latencies)}
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "p50_ms": _percentile(quantiles, 50),
+        "p99_ms": _percentile(quantiles, 99),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+async def run_profile(client: httpx.AsyncClient, ctx, flood: int, duration: float, rng: random.Random) -> dict:
+    deadline = time.perf_counter() + duration
+    statuses: Counter = Counter()
+    admitted: Dict[str, List[float]] = {"login": [], "listing": []}
+    probe: List[float] = []
+    probe_statuses: Counter = Counter()
+
+    async def flooder(i: int) -> None:
+        while time.perf_counter() < deadline:
+            kind = "login" if i % 2 else "listing"
+            if kind == "login":
+                request = {"method": "POST", "url": "/api/auth/login",
+                           "data": {"username": rng.choice(ctx.emails), "password": PASSWORD}}
+            else:
+                request = {"method": "GET", "url": "/api/swaps", "params": {"limit": 200},
+                           "headers": {"Authorization": f"Bearer {rng.choice(ctx.tokens)}"}}
+            started = time.perf_counter()
+            response = await client.request(**request)
+            statuses[response.status_code] += 1
+            if response.status_code < 400:
+                admitted[kind].append(time.perf_counter() - started)
+            else:
+                # Back off as told, like a well-behaved client
+                await asyncio.sleep(float(response.headers.get("Retry-After", 0)))
+
+    async def prober() -> None:
+        headers = {"Authorization": f"Bearer {ctx.tokens[0]}"}
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get("/api/users/me", headers=headers)
+            probe.append(time.perf_counter() - started)
+            probe_statuses[response.status_code] += 1
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(prober(), *(flooder(i) for i in range(flood)))
+    return {
+        "probe_users_me": {
+            **_latency(probe),
+            "status_codes": {str(code): count for code, count in sorted(probe_statuses.items())},
+        },
+        "flood_admitted": {kind: _latency(latencies) for kind, latencies in admitted.items()},
+        "flood_status_codes": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def run_overload(flood: int, duration: float, sample_users: int, seed: int, log=print) -> dict:
+    rng = random.Random(seed)
+    configured = load_shedder.limits
+    results = {}
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            ctx = await build_context(client, sample_users, rng)
+            for name, limits in (("unlimited", {}), ("limited", configured)):
+                load_shedder.limits = limits
+                try:
+                    results[name] = await run_profile(client, ctx, flood, duration, rng)
+                finally:
+                    load_shedder.limits = configured
+                probe, admitted = results[name]["probe_users_me"], results[name]["flood_admitted"]
+                log(f"{name:<10} probe p50 {probe.get('p50_ms')}ms p99 {probe.get('p99_ms')}ms "
+                    f"{probe['status_codes']}  admitted p99: login {admitted['login'].get('p99_ms')}ms "
+                    f"listing {admitted['listing'].get('p99_ms')}ms  flood {results[name]['flood_status_codes']}")
+
+    return {
+        "flood_concurrency": flood,
+        "duration_s": duration,
+        "limits": load_shedder.stats(),
+        "profiles": results,
+    }
@@ -0,0 +1,188 @@
+"""
+Drives the FastAPI app in-process through an ASGI transport and reports
+latency percentiles, throughput and SQL queries per request per scenario.
+Load shedding is turned off for the run: a request turned away with a
+fast 503 says nothing about the latency of its route.
+"""
+import asyncio
+import platform
+import random
+import statistics
+import subprocess
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import event, func, select, text
+
+from app.config import settings
+from app.core.shedding import load_shedder
+from app.database import async_engine, engine
+from app.main import app
+from app.models.user import User, UserRole
+
+from .scenarios import SCENARIOS, Context, Scenario
+from .seed import PASSWORD
+
+
+class QueryCounter:
+    """Counts statements executed on both engines"""
+
+    def __init__(self):
+        self.count = 0
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+
+def _percentile(quantiles: List[float], p: int) -> float:
+    return round(quantiles[p - 1] * 1000, 3)
+
+
+def summarize(scenario: Scenario, latencies: List[float], statuses: Counter,
+              elapsed: float, queries: int) -> dict:
+    requests = len(latencies)
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if requests > 1 else latencies * 99
+    return {
+        "router": scenario.router,
+        "requests": requests,
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "p50_ms": _percentile(quantiles, 50),
+        "p95_ms": _percentile(quantiles, 95),
+        "p99_ms": _percentile(quantiles, 99),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "queries_per_request": round(queries / requests, 2),
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, ctx: Context,
+                       requests: int, concurrency: int, warmup: int,
+                       rng: random.Random, counter: QueryCounter) -> dict:
+    for _ in range(warmup):
+        await client.request(**scenario.build(ctx, rng))
+
+    specs = iter([scenario.build(ctx, rng) for _ in range(scenario.requests or requests)])
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+
+    async def worker():
+        for spec in specs:
+            started = time.perf_counter()
+            response = await client.request(**spec)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    queries_before = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return summarize(scenario, latencies, statuses, elapsed, counter.count - queries_before)
+
+
+async def _login(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/api/auth/login", data={"username": email, "password": PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def build_context(client: httpx.AsyncClient, sample_users: int, rng: random.Random) -> Context:
+    with engine.connect() as connection:
+        user_count = connection.scalar(select(func.count()).select_from(User))
+        admin_email = connection.scalar(
+            select(User.email).where(User.role == UserRole.ADMIN).order_by(User.id).limit(1)
+        )
+        emails = connection.scalars(
+            select(User.email)
+            .where(User.role == UserRole.USER, User.is_active == True, User.is_banned == False)
+            .order_by(User.id)
+        ).all()
+
+    ctx = Context(user_count=user_count, emails=rng.sample(emails, min(sample_users, len(emails))))
+    ctx.tokens = [await _login(client, email) for email in ctx.emails]
+    ctx.admin_token = await _login(client, admin_email)
+    return ctx
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _dataset() -> Dict[str, int]:
+    with engine.connect() as connection:
+        return {
+            table: connection.scalar(text(f"SELECT count(*) FROM {table}"))
+            for table in ("users", "skills_offered", "skills_wanted", "swaps", "feedback")
+        }
+
+
+async def run_benchmarks(requests: int, concurrency: int, warmup: int, sample_users: int,
+                         seed: int, only: List[str] = None, log=print) -> dict:
+    rng = random.Random(seed)
+    counter = QueryCounter()
+    scenarios = [s for s in SCENARIOS if not only or s.name in only or s.router in only]
+
+    results = {}
+    configured = load_shedder.limits
+    load_shedder.limits = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                ctx = await build_context(client, sample_users, rng)
+                for scenario in scenarios:
+                    result = await run_scenario(client, scenario, ctx, requests, concurrency, warmup, rng, counter)
+                    results[scenario.name] = result
+                    log(
+                        f"{scenario.name:<26} p50={result['p50_ms']:>8.2f}ms p95={result['p95_ms']:>8.2f}ms "
+                        f"p99={result['p99_ms']:>8.2f}ms {result['throughput_rps']:>8.1f} req/s "
+                        f"{result['queries_per_request']:>5.1f} q/req errors={result['errors']}"
+                    )
+    finally:
+        load_shedder.limits = configured
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "database_url": settings.DATABASE_URL,
+            "db_async": settings.DB_ASYNC,
+            "dataset": _dataset(),
+            "requests": requests,
+            "concurrency": concurrency,
+            "seed": seed,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(base: dict, head: dict) -> List[str]:
+    """One line per scenario with the relative change in p50/p95/p99 and queries"""
+    lines = [f"{'scenario':<26} {'p50':>9} {'p95':>9} {'p99':>9} {'q/req':>12}"]
+    for name, new in head["scenarios"].items():
+        old = base["scenarios"].get(name)
+        if old is None:
+            lines.append(f"{name:<26} (new)")
+            continue
+
+        def change(key):
+            if not old[key]:
+                return "n/a"
+            return f"{(new[key] - old[key]) / old[key] * 100:+.1f}%"
+
+        queries = f"{old['queries_per_request']:g}->{new['queries_per_request']:g}"
+        lines.append(
+            f"{name:<26} {change('p50_ms'):>9} {change('p95_ms'):>9} {change('p99_ms'):>9} {queries:>12}"
+        )
+    return lines
@@ -0,0 +1,100 @@
+"""
+Request scenarios, one or more per router.
+
+Each scenario builds a request from a shared context (logged-in sample
+users, an admin token, id ranges) and a seeded random generator, so two
+runs against the same dataset issue the same requests.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .seed import FIRST_NAMES, LAST_NAMES, PASSWORD, SKILLS
+
+
+@dataclass
+class Context:
+    user_count: int
+    tokens: List[str] = field(default_factory=list)
+    admin_token: Optional[str] = None
+    emails: List[str] = field(default_factory=list)
+
+    def auth(self, rng: random.Random) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {rng.choice(self.tokens)}"}
+
+    def admin(self, rng: random.Random) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.admin_token}"}
+
+
+@dataclass
+class Scenario:
+    name: str
+    router: str
+    build: Callable[[Context, random.Random], dict]
+    # Overrides the run-wide request count (e.g. for bcrypt-bound login)
+    requests: Optional[int] = None
+
+
+def _get(url: str, headers: Callable, params: Callable = None):
+    def build(ctx: Context, rng: random.Random) -> dict:
+        return {
+            "method": "GET",
+            "url": url(ctx, rng) if callable(url) else url,
+            "headers": headers(ctx, rng),
+            "params": params(ctx, rng) if params else None,
+        }
+    return build
+
+
+def _login(ctx: Context, rng: random.Random) -> dict:
+    return {
+        "method": "POST",
+        "url": "/api/auth/login",
+        "data": {"username": rng.choice(ctx.emails), "password": PASSWORD},
+    }
+
+
+def _search_term(ctx: Context, rng: random.Random) -> dict:
+    # Mostly whole words, sometimes a prefix as typed in the search box
+    word = rng.choice(SKILLS).split()[0]
+    if rng.random() < 0.3:
+        word = word[:rng.randint(2, len(word))]
+    return {"query": word}
+
+
+def _misspelled_name(ctx: Context, rng: random.Random) -> dict:
+    # A full name with two adjacent letters swapped in the surname
+    last = rng.choice(LAST_NAMES)
+    i = rng.randint(0, len(last) - 2)
+    last = last[:i] + last[i + 1] + last[i] + last[i + 2:]
+    return {"query": f"{rng.choice(FIRST_NAMES)} {last}"}
+
+
+def _keystrokes(ctx: Context, rng: random.Random) -> dict:
+    # The first few letters of a skill or a user's name
+    word = rng.choice(SKILLS) if rng.random() < 0.5 else rng.choice(FIRST_NAMES + LAST_NAMES)
+    return {"prefix": word[:rng.randint(1, 4)]}
+
+
+USER = Context.auth
+ADMIN = Context.admin
+
+SCENARIOS = [
+    Scenario("auth.login", "auth", _login, requests=50),
+    Scenario("users.me", "users", _get("/api/users/me", USER)),
+    Scenario("users.get", "users", _get(lambda ctx, rng: f"/api/users/{rng.randint(1, ctx.user_count)}", USER)),
+    Scenario("users.search", "users", _get("/api/users/", USER, lambda ctx, rng: {"query": f"user{rng.randint(1, 999)}"})),
+    Scenario("users.search_typo", "users", _get("/api/users/", USER, _misspelled_name)),
+    Scenario("autocomplete", "autocomplete", _get("/api/autocomplete", USER, _keystrokes)),
+    Scenario("skills.offered", "skills", _get("/api/skills/offered", USER)),
+    Scenario("skills.wanted", "skills", _get("/api/skills/wanted", USER)),
+    Scenario("skills.search", "skills", _get("/api/skills/search", USER, _search_term)),
+    Scenario("swaps.list", "swaps", _get("/api/swaps", USER)),
+    Scenario("swaps.sent", "swaps", _get("/api/swaps/sent", USER)),
+    Scenario("swaps.received", "swaps", _get("/api/swaps/received", USER, lambda ctx, rng: {"limit": 20})),
+    Scenario("swaps.feedback_received", "swaps", _get("/api/swaps/feedback/received", USER)),
+    Scenario("matches.list", "matches", _get("/api/matches", USER)),
+    Scenario("admin.users", "admin", _get("/api/admin/users", ADMIN)),
+    Scenario("admin.swaps", "admin", _get("/api/admin/swaps", ADMIN)),
+    Scenario("admin.stats", "admin", _get("/api/admin/stats", ADMIN)),
+]
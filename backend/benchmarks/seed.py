@@ -0,0 +1,240 @@
+"""
+Seeded synthetic dataset generator.
+
+Rows are generated deterministically from the seed and written with Core
+executemany inserts in large batches, so a full-scale dataset loads in
+minutes rather than hours. Database triggers (search index, platform
+counters) fire as they would in production.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.core.hashing import password_context
+from app.models.skill import SkillOffered, SkillStatus, SkillWanted
+from app.models.swap import Feedback, Swap, SwapStatus
+from app.models.user import ProfileVisibility, User, UserAvailability, UserRole
+
+# Every seeded account shares this password, so scenarios can log in
+PASSWORD = "benchmark"
+
+# users, skills (offered + wanted), swaps, feedback
+SCALES = {
+    "tiny": (500, 2_500, 5_000, 1_500),
+    "small": (10_000, 50_000, 100_000, 30_000),
+    "full": (100_000, 500_000, 1_000_000, 300_000),
+}
+
+BATCH_SIZE = 10_000
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Alex", "Amara", "Ana", "Arjun", "Ben", "Chen", "Chloe", "Daniel",
+    "Diya", "Elena", "Emma", "Farah", "Gabriel", "Hana", "Ibrahim", "Isla", "Jonas", "Kavya",
+    "Leo", "Lucia", "Maya", "Mateo", "Nadia", "Noah", "Omar", "Priya", "Rohan", "Sara",
+    "Sofia", "Tariq", "Uma", "Victor", "Wei", "Yara", "Yusuf", "Zoe",
+]
+
+LAST_NAMES = [
+    "Agarwal", "Bauer", "Costa", "Das", "Evans", "Fernandes", "Gadekar", "Garcia", "Huang",
+    "Iyer", "Jensen", "Khan", "Kim", "Lopez", "Mehta", "Müller", "Nair", "Okafor", "Patel",
+    "Quinn", "Rao", "Rossi", "Sato", "Shah", "Singh", "Tanaka", "Usman", "Varga", "Wong",
+]
+
+CITIES = [
+    "Ahmedabad", "Amsterdam", "Bengaluru", "Berlin", "Chennai", "Delhi", "Hyderabad", "Lagos",
+    "Lisbon", "London", "Mumbai", "Nairobi", "New York", "Pune", "São Paulo", "Singapore",
+    "Tokyo", "Toronto",
+]
+
+SKILLS = [
+    "Python Programming", "JavaScript", "React", "Data Analysis", "Machine Learning", "SQL",
+    "Excel", "Photoshop", "Illustrator", "Video Editing", "Photography", "Public Speaking",
+    "Copywriting", "SEO", "Digital Marketing", "Guitar", "Piano", "Violin", "Singing",
+    "Drawing", "Watercolor Painting", "Pottery", "Knitting", "Cooking", "Baking",
+    "Bread Making", "Yoga", "Meditation", "Running Coaching", "Chess", "Spanish", "French",
+    "German", "Japanese", "Hindi", "Mandarin", "Sign Language", "Carpentry", "Gardening",
+    "Bike Repair", "Home Electrical", "Accounting", "Personal Finance", "Resume Writing",
+    "Interview Prep", "UX Design", "Figma", "Blender 3D", "Game Development", "Rust",
+    "Go", "Docker", "Kubernetes", "Linux Administration", "Calligraphy", "Dance",
+]
+
+LEVELS = ["", "", "Beginner ", "Intermediate ", "Advanced "]
+
+SKILL_STATUS_WEIGHTS = [
+    (SkillStatus.APPROVED, 85), (SkillStatus.PENDING, 10), (SkillStatus.REJECTED, 5),
+]
+
+SWAP_STATUS_WEIGHTS = [
+    (SwapStatus.PENDING, 20), (SwapStatus.ACCEPTED, 15), (SwapStatus.REJECTED, 15),
+    (SwapStatus.CANCELLED, 10), (SwapStatus.COMPLETED, 40),
+]
+
+RATING_WEIGHTS = [(1.0, 3), (2.0, 5), (3.0, 12), (4.0, 35), (5.0, 45)]
+
+
+def _weighted(rng: random.Random, weights):
+    values, cumulative, total = [], [], 0
+    for value, weight in weights:
+        total += weight
+        values.append(value)
+        cumulative.append(total)
+    return lambda: rng.choices(values, cum_weights=cumulative)[0]
+
+
+def _batches(rows: Iterator[dict], size: int = BATCH_SIZE) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class DatasetGenerator:
+    """Generates related rows; ids are assigned here so references stay valid"""
+
+    def __init__(self, users: int, skills: int, swaps: int, feedback: int, seed: int = 42):
+        self.counts = {"users": users, "skills": skills, "swaps": swaps, "feedback": feedback}
+        self.rng = random.Random(seed)
+        self.now = datetime(2026, 1, 1)
+        self.hashed_password = password_context().hash(PASSWORD)
+
+        # Filled as rows are generated, used by later tables
+        self.offered_owner: List[int] = [0]
+        self.wanted_owner: List[int] = [0]
+        self.completed_swaps: List[tuple] = []
+
+    def _timestamp(self, days: int = 730) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def users(self) -> Iterator[dict]:
+        rng = self.rng
+        availability = list(UserAvailability)
+        for user_id in range(1, self.counts["users"] + 1):
+            yield {
+                "id": user_id,
+                "email": f"user{user_id}@bench.example",
+                "username": f"user{user_id}",
+                "hashed_password": self.hashed_password,
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "location": rng.choice(CITIES) if rng.random() < 0.7 else None,
+                "bio": None,
+                "availability": rng.choice(availability),
+                "visibility": ProfileVisibility.PUBLIC if rng.random() < 0.9 else ProfileVisibility.PRIVATE,
+                # User 1 is the benchmark admin
+                "role": UserRole.ADMIN if user_id == 1 else UserRole.USER,
+                "is_active": True,
+                "is_banned": user_id != 1 and rng.random() < 0.01,
+                "created_at": self._timestamp(),
+            }
+
+    def _skill_name(self) -> str:
+        return self.rng.choice(LEVELS) + self.rng.choice(SKILLS)
+
+    def skills_offered(self) -> Iterator[dict]:
+        status = _weighted(self.rng, SKILL_STATUS_WEIGHTS)
+        for skill_id in range(1, self.counts["skills"] * 3 // 5 + 1):
+            user_id = self.rng.randint(1, self.counts["users"])
+            self.offered_owner.append(user_id)
+            yield {
+                "id": skill_id,
+                "user_id": user_id,
+                "name": self._skill_name(),
+                "description": f"Sessions covering {self.rng.choice(SKILLS).lower()} basics",
+                "status": status(),
+                "created_at": self._timestamp(),
+            }
+
+    def skills_wanted(self) -> Iterator[dict]:
+        for skill_id in range(1, self.counts["skills"] * 2 // 5 + 1):
+            user_id = self.rng.randint(1, self.counts["users"])
+            self.wanted_owner.append(user_id)
+            yield {
+                "id": skill_id,
+                "user_id": user_id,
+                "name": self._skill_name(),
+                "description": None,
+                "created_at": self._timestamp(),
+            }
+
+    def swaps(self) -> Iterator[dict]:
+        rng = self.rng
+        status = _weighted(rng, SWAP_STATUS_WEIGHTS)
+        for swap_id in range(1, self.counts["swaps"] + 1):
+            # The provider owns the offered skill, the requester the wanted one
+            skill_offered_id = rng.randrange(1, len(self.offered_owner))
+            skill_wanted_id = rng.randrange(1, len(self.wanted_owner))
+            provider_id = self.offered_owner[skill_offered_id]
+            requester_id = self.wanted_owner[skill_wanted_id]
+            if requester_id == provider_id:
+                requester_id = requester_id % self.counts["users"] + 1
+
+            swap_status = status()
+            created_at = self._timestamp(365)
+            completed_at = None
+            if swap_status == SwapStatus.COMPLETED:
+                completed_at = created_at + timedelta(days=rng.randint(1, 30))
+                self.completed_swaps.append((swap_id, requester_id, provider_id, completed_at))
+
+            yield {
+                "id": swap_id,
+                "requester_id": requester_id,
+                "provider_id": provider_id,
+                "skill_offered_id": skill_offered_id,
+                "skill_wanted_id": skill_wanted_id,
+                "message": "Would you like to swap?",
+                "status": swap_status,
+                "created_at": created_at,
+                "updated_at": completed_at,
+                "completed_at": completed_at,
+            }
+
+    def feedback(self) -> Iterator[dict]:
+        rating = _weighted(self.rng, RATING_WEIGHTS)
+        # Each participant of a completed swap leaves at most one review
+        givers = [
+            (swap, side) for swap in self.completed_swaps for side in (0, 1)
+        ]
+        self.rng.shuffle(givers)
+        for feedback_id, (swap, side) in enumerate(givers[:self.counts["feedback"]], start=1):
+            swap_id, requester_id, provider_id, completed_at = swap
+            giver_id, receiver_id = (requester_id, provider_id) if side == 0 else (provider_id, requester_id)
+            yield {
+                "id": feedback_id,
+                "swap_id": swap_id,
+                "giver_id": giver_id,
+                "receiver_id": receiver_id,
+                "rating": rating(),
+                "comment": None,
+                "created_at": completed_at + timedelta(hours=self.rng.randint(1, 72)),
+            }
+
+
+def seed_database(engine: Engine, generator: DatasetGenerator, log=print) -> Dict[str, int]:
+    """Load every table in dependency order; returns rows written per table"""
+    tables = [
+        (User, generator.users),
+        (SkillOffered, generator.skills_offered),
+        (SkillWanted, generator.skills_wanted),
+        (Swap, generator.swaps),
+        (Feedback, generator.feedback),
+    ]
+
+    written = {}
+    for model, rows in tables:
+        started = time.perf_counter()
+        count = 0
+        with engine.begin() as connection:
+            for batch in _batches(rows()):
+                connection.execute(insert(model), batch)
+                count += len(batch)
+        written[model.__tablename__] = count
+        log(f"{model.__tablename__}: {count} rows in {time.perf_counter() - started:.1f}s")
+
+    return written
@@ -0,0 +1,116 @@
+"""
+Response serialization micro-benchmark.
+
+Compares FastAPI's response_model path (validate, dump to Python objects,
+encode with the stdlib json module) with app.core.serialization (validate and
+dump straight to bytes in pydantic-core) on the same swap pages, and checks
+that both produce identical bytes. orjson over model_dump() is included as a
+reference when it is installed.
+"""
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from app.core.serialization import render_json
+from app.models.skill import SkillOffered, SkillStatus, SkillWanted
+from app.models.swap import Swap, SwapStatus
+from app.models.user import ProfileVisibility, User, UserAvailability, UserRole
+from app.schemas.pagination import Page
+from app.schemas.swap import SwapWithDetails
+
+PAGE_TYPE = Page[SwapWithDetails]
+
+
+def build_page(size: int) -> dict:
+    """A page of transient ORM swaps with their users and skills attached"""
+    now = datetime(2026, 1, 1)
+    users = [
+        User(
+            id=i, email=f"user{i}@bench.example", username=f"user{i}", name=f"User {i}",
+            location="Pune", bio="Happy to trade lessons", availability=UserAvailability.EVENINGS,
+            visibility=ProfileVisibility.PUBLIC, role=UserRole.USER, is_active=True, is_banned=False,
+            created_at=now - timedelta(days=i),
+        )
+        for i in range(1, 21)
+    ]
+    items = []
+    for i in range(1, size + 1):
+        requester, provider = users[i % 20], users[(i + 7) % 20]
+        items.append(Swap(
+            id=i, requester_id=requester.id, provider_id=provider.id,
+            skill_offered_id=i, skill_wanted_id=i, message="Would you like to swap?",
+            status=SwapStatus.COMPLETED, version=3, created_at=now - timedelta(minutes=i), updated_at=now,
+            completed_at=now, requester=requester, provider=provider,
+            skill_offered=SkillOffered(
+                id=i, user_id=provider.id, name="Python Programming", description="Flask and Django",
+                status=SkillStatus.APPROVED, created_at=now, updated_at=now,
+            ),
+            skill_wanted=SkillWanted(
+                id=i, user_id=requester.id, name="Guitar", description="Acoustic", created_at=now,
+            ),
+        ))
+    return {"items": items, "next_cursor": "eyJjIjogWyIyMDI2LTAxLTAxIiwgMV19"}
+
+
+def serializers() -> Dict[str, Callable[[dict], bytes]]:
+    field = create_response_field(name="response", type_=PAGE_TYPE)
+    adapter = TypeAdapter(PAGE_TYPE)
+
+    # All async so each is timed the same way inside one event loop
+    async def fastapi_path(content):
+        encoded = await serialize_response(field=field, response_content=content, is_coroutine=True)
+        return JSONResponse(encoded).body
+
+    async def type_adapter(content):
+        return render_json(adapter, content)
+
+    paths = {"fastapi_response_model": fastapi_path, "type_adapter_dump_json": type_adapter}
+
+    try:
+        import orjson
+    except ImportError:
+        return paths
+
+    async def type_adapter_orjson(content):
+        return orjson.dumps(adapter.dump_python(adapter.validate_python(content, from_attributes=True)))
+
+    paths["type_adapter_orjson"] = type_adapter_orjson
+    return paths
+
+
+async def _time(func: Callable, content, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func(content)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def run_serialization(sizes: List[int], repeat: int, log=print) -> dict:
+    paths = serializers()
+    results = {}
+    for size in sizes:
+        content = build_page(size)
+        baseline = await paths["fastapi_response_model"](content)
+        results[str(size)] = {}
+        for name, func in paths.items():
+            body = await func(content)  # also warms up
+            median = statistics.median(await _time(func, content, repeat))
+            base_median = results[str(size)].get("fastapi_response_model", {}).get("median_ms")
+            results[str(size)][name] = {
+                "median_ms": round(median * 1000, 3),
+                "speedup": round(base_median / (median * 1000), 2) if base_median else 1.0,
+                "identical_output": body == baseline,
+                "bytes": len(body),
+            }
+            log(f"{size:>5} items  {name:<24} {median * 1000:>8.3f}ms  "
+                f"x{results[str(size)][name]['speedup']:<5} identical={results[str(size)][name]['identical_output']}")
+
+    return {"payload": "Page[SwapWithDetails]", "repeat": repeat, "sizes": results}
@@ -0,0 +1,146 @@
+"""
+Import and startup time benchmark, doubling as a regression guard.
+
+Imports app.main in fresh interpreters under `python -X importtime`, from
+an empty working directory, and reports the median import time, the
+slowest modules and the time spent per top-level package. It also checks
+that the import stays free of side effects: no file written, no engine
+created, and none of the modules the app defers to first use (DEFERRED)
+loaded. With --db it also times the lifespan startup (schema check,
+search indexes, warmup) against that database.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy modules that only specific requests (or the warmup) may import
+DEFERRED = ("passlib", "bcrypt", "jose", "PIL", "alembic")
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+import app.database
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "deferred_imported": sorted({name.split(".")[0] for name in sys.modules} & set(sys.argv[1:])),
+    # Trees from before the engines were created lazily have no _engines
+    "engines_created": getattr(app.database, "_engines", "eager") is not None,
+}))
+"""
+
+LIFESPAN_SCRIPT = """
+import asyncio, json, time
+import app.main
+
+async def main():
+    started = time.perf_counter()
+    async with app.main.app.router.lifespan_context(app.main.app):
+        return (time.perf_counter() - started) * 1000
+
+print(json.dumps({"lifespan_ms": asyncio.run(main())}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """`import time: self [us] | cumulative | package` lines, as dicts in ms"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def _run(script: str, args: List[str], cwd: str, env: dict, importtime: bool = False) -> tuple:
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", script, *args]
+    result = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def _files_in(directory: str) -> List[str]:
+    return sorted(
+        os.path.relpath(os.path.join(root, name), directory)
+        for root, dirs, files in os.walk(directory)
+        for name in files + dirs
+    )
+
+
+def run_startup(runs: int, db: Optional[str], top: int, log=print) -> dict:
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.pop("DATABASE_URL", None)
+
+    samples, breakdowns, deferred, engines_created, written = [], [], set(), False, set()
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as cwd:
+            result, stderr = _run(IMPORT_SCRIPT, list(DEFERRED), cwd, env, importtime=True)
+            written.update(_files_in(cwd))
+        samples.append(result["import_ms"])
+        breakdowns.append(parse_importtime(stderr))
+        deferred.update(result["deferred_imported"])
+        engines_created = engines_created or result["engines_created"]
+
+    # Break down the run closest to the median
+    median = statistics.median(samples)
+    modules = breakdowns[min(range(runs), key=lambda i: abs(samples[i] - median))]
+    packages: Dict[str, float] = defaultdict(float)
+    for module in modules:
+        packages[module["module"].split(".")[0]] += module["self_ms"]
+
+    report = {
+        "runs": runs,
+        "import_ms": {
+            "median": round(median, 1),
+            "min": round(min(samples), 1),
+            "max": round(max(samples), 1),
+        },
+        "slowest_modules": [
+            {key: round(value, 1) if key != "module" else value for key, value in module.items()}
+            for module in sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)[:top]
+        ],
+        "packages_ms": {
+            name: round(ms, 1)
+            for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        },
+        "deferred_imported": sorted(deferred),
+        "engines_created": engines_created,
+        "files_written": sorted(written),
+    }
+    log(f"import app.main: median {report['import_ms']['median']}ms over {runs} runs")
+    for name, ms in list(report["packages_ms"].items())[:10]:
+        log(f"  {name:<24} {ms:>8.1f}ms")
+
+    if db:
+        lifespan_env = {**env, "DATABASE_URL": f"sqlite:///{os.path.abspath(db)}"}
+        result, _ = _run(LIFESPAN_SCRIPT, [], BACKEND_DIR, lifespan_env)
+        report["lifespan_startup_ms"] = round(result["lifespan_ms"], 1)
+        log(f"lifespan startup: {report['lifespan_startup_ms']}ms")
+
+    return report
+
+
+def check(report: dict, max_import_ms: Optional[float]) -> List[str]:
+    """Regressions in a report; empty when the guard passes"""
+    problems = []
+    if report["deferred_imported"]:
+        problems.append(f"importing app.main loaded {', '.join(report['deferred_imported'])}")
+    if report["engines_created"]:
+        problems.append("importing app.main created the database engines")
+    if report["files_written"]:
+        problems.append(f"importing app.main wrote {', '.join(report['files_written'])}")
+    if max_import_ms is not None and report["import_ms"]["median"] > max_import_ms:
+        problems.append(f"median import took {report['import_ms']['median']}ms, budget {max_import_ms}ms")
+    return problems
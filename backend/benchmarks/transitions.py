@@ -0,0 +1,159 @@
+"""
+Swap transition stress test.
+
+Creates `swaps` pending swaps between seeded users, then races every
+conflicting transition of each swap at once through the app (in-process,
+over an ASGI transport): the provider accepts and rejects while the
+requester cancels, `contenders` times each. Swaps that were accepted are
+then completed by both sides at once. Exactly one transition of each race
+may succeed and every other must get 409; the final rows must match the
+winners, with one version step per transition, and the platform counters
+kept by triggers must still add up. Any violation is a lost update.
+Load shedding is turned off for the run, so no request is turned away
+before reaching the database.
+"""
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import select
+
+from app.core.shedding import load_shedder
+from app.core.stats import recount
+from app.database import engine
+from app.main import app
+from app.models.skill import SkillOffered
+from app.models.swap import Swap
+from app.models.user import User, UserRole
+
+from .runner import _login
+
+
+def _participants(count: int, rng: random.Random) -> List[dict]:
+    """Active users with an offered skill (needed to request a swap)"""
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(User.id, User.email, SkillOffered.id.label("skill_id"))
+            .join(SkillOffered, SkillOffered.user_id == User.id)
+            .where(User.role == UserRole.USER, User.is_active == True, User.is_banned == False)
+            .group_by(User.id)
+            .order_by(User.id)
+        ).all()
+    return [row._asdict() for row in rng.sample(rows, min(count, len(rows)))]
+
+
+async def _race(client: httpx.AsyncClient, swap_id: int, attempts: List[tuple]) -> List[tuple]:
+    """Send every (token, status) at once; (status sent, response status code, body)"""
+    async def attempt(token: str, target: str) -> tuple:
+        response = await client.put(
+            f"/api/swaps/{swap_id}", json={"status": target}, headers={"Authorization": f"Bearer {token}"}
+        )
+        return target, response.status_code, response.json()
+
+    return await asyncio.gather(*(attempt(token, target) for token, target in attempts))
+
+
+async def run_transitions(swaps: int, contenders: int, users: int, seed: int, log=print) -> dict:
+    rng = random.Random(seed)
+    configured = load_shedder.limits
+    load_shedder.limits = {}
+
+    problems: List[str] = []
+    statuses: Counter = Counter()
+    expected: Dict[int, tuple] = {}  # swap id -> (status, version) the winners imply
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                people = _participants(users, rng)
+                for person in people:
+                    person["token"] = await _login(client, person["email"])
+
+                created = []
+                for _ in range(swaps):
+                    requester, provider = rng.sample(people, 2)
+                    response = await client.post(
+                        "/api/swaps",
+                        json={"provider_id": provider["id"], "skill_offered_id": requester["skill_id"]},
+                        headers={"Authorization": f"Bearer {requester['token']}"},
+                    )
+                    response.raise_for_status()
+                    created.append((response.json()["id"], requester, provider))
+
+                started = time.perf_counter()
+                # Round 1: every transition out of pending, all at once
+                rounds = []
+                for swap_id, requester, provider in created:
+                    attempts = [
+                        (token, target)
+                        for token, target in [
+                            (provider["token"], "accepted"),
+                            (provider["token"], "rejected"),
+                            (requester["token"], "cancelled"),
+                        ]
+                        for _ in range(contenders)
+                    ]
+                    rng.shuffle(attempts)
+                    rounds.append(_race(client, swap_id, attempts))
+                first = await asyncio.gather(*rounds)
+
+                # Round 2: both sides complete the accepted swaps at once
+                rounds, accepted = [], []
+                for (swap_id, requester, provider), results in zip(created, first):
+                    winners = [body for target, code, body in results if code == 200]
+                    statuses.update(code for _, code, _ in results)
+                    if len(winners) != 1:
+                        problems.append(f"swap {swap_id}: {len(winners)} transitions out of pending succeeded")
+                        continue
+                    expected[swap_id] = (winners[0]["status"], 2)
+                    if winners[0]["status"] == "accepted":
+                        attempts = [(requester["token"], "completed"), (provider["token"], "completed")] * contenders
+                        rounds.append(_race(client, swap_id, attempts))
+                        accepted.append(swap_id)
+                second = await asyncio.gather(*rounds)
+                elapsed = time.perf_counter() - started
+
+                for swap_id, results in zip(accepted, second):
+                    winners = [body for target, code, body in results if code == 200]
+                    statuses.update(code for _, code, _ in results)
+                    if len(winners) != 1:
+                        problems.append(f"swap {swap_id}: {len(winners)} completions succeeded")
+                        continue
+                    expected[swap_id] = ("completed", 3)
+    finally:
+        load_shedder.limits = configured
+
+    unexpected = {code: count for code, count in statuses.items() if code not in (200, 409)}
+    if unexpected:
+        problems.append(f"unexpected status codes {unexpected}")
+
+    with engine.connect() as connection:
+        rows = {
+            row.id: (row.status.value, row.version)
+            for row in connection.execute(
+                select(Swap.id, Swap.status, Swap.version).where(Swap.id.in_(list(expected)))
+            )
+        }
+        drift = recount(connection, dry_run=True)
+    for swap_id, state in expected.items():
+        if rows.get(swap_id) != state:
+            problems.append(f"swap {swap_id}: stored {rows.get(swap_id)}, winners imply {state}")
+    if drift:
+        problems.append(f"platform counters drifted: {drift}")
+
+    transitions = sum(statuses.values())
+    log(f"{swaps} swaps, {transitions} concurrent transitions in {elapsed:.2f}s: "
+        f"{dict(sorted(statuses.items()))}, {len(problems)} problems")
+    return {
+        "swaps": swaps,
+        "contenders": contenders,
+        "transitions": transitions,
+        "elapsed_s": round(elapsed, 3),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "final_states": dict(Counter(state for state, _ in rows.values())),
+        "problems": problems,
+    }
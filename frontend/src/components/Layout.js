@@ -142,7 +142,7 @@ const Layout = ({ children }) => {
                     <IconButton onClick={handleOpenUserMenu} sx={{ p: 0 }}>
                       <Avatar 
                         alt={user?.name} 
-                        src={user?.profile_photo ? `http://localhost:8000${user.profile_photo}` : undefined}
+                        src={user?.profile_photo ? `http://localhost:8000${user.profile_photo_variants?.['64']?.webp || user.profile_photo}` : undefined}
                       >
                         {user?.name?.charAt(0)}
                       </Avatar>
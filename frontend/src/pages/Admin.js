@@ -243,6 +243,8 @@ const AdminUsers = () => {
 };
 
 // Admin Skills Component
+const BULK_LIMIT = 1000; // BULK_MAX_ITEMS on the server
+
 const AdminSkills = () => {
   const [pendingSkills, setPendingSkills] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -304,6 +306,29 @@ const AdminSkills = () => {
     }
   };
 
+  const handleBulk = async (action) => {
+    setActionLoading(true);
+    setActionError(null);
+    setActionSuccess(null);
+    
+    try {
+      const moderate = action === 'approve' ? adminService.approveSkills : adminService.rejectSkills;
+      const ids = pendingSkills.map(s => s.id);
+      let results = [];
+      for (let i = 0; i < ids.length; i += BULK_LIMIT) {
+        results = results.concat(await moderate(ids.slice(i, i + BULK_LIMIT)));
+      }
+      const done = new Set(results.filter(r => r.result !== 'not_found').map(r => r.id));
+      setPendingSkills(pendingSkills.filter(s => !done.has(s.id)));
+      setActionSuccess(`${done.size} skills ${action === 'approve' ? 'approved' : 'rejected'} successfully.`);
+    } catch (err) {
+      console.error(`Error during bulk ${action}:`, err);
+      setActionError(`Failed to ${action} skills. Please try again.`);
+    } finally {
+      setActionLoading(false);
+    }
+  };
+
   if (loading) {
     return (
       <Box sx={{ display: 'flex', justifyContent: 'center', my: 4 }}>
@@ -314,9 +339,32 @@ const AdminSkills = () => {
 
   return (
     <Box>
-      <Typography variant="h5" gutterBottom>
-        Moderate Skills
-      </Typography>
+      <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', mb: 1 }}>
+        <Typography variant="h5" gutterBottom>
+          Moderate Skills
+        </Typography>
+        
+        {pendingSkills.length > 1 && (
+          <Box>
+            <Button
+              startIcon={<CheckCircleIcon />}
+              color="success"
+              onClick={() => handleBulk('approve')}
+              disabled={actionLoading}
+            >
+              Approve all
+            </Button>
+            <Button
+              startIcon={<CancelIcon />}
+              color="error"
+              onClick={() => handleBulk('reject')}
+              disabled={actionLoading}
+            >
+              Reject all
+            </Button>
+          </Box>
+        )}
+      </Box>
       
       {actionError && (
         <Alert severity="error" sx={{ mb: 2 }} onClose={() => setActionError(null)}>
@@ -653,7 +701,7 @@ const AdminMessaging = () => {
     
     try {
       const result = await adminService.sendPlatformMessage(title, message);
-      setSuccess(`Message sent successfully to ${result.recipients_count} users.`);
+      setSuccess(`Message queued for delivery to ${result.total_recipients} users.`);
       setTitle('');
       setMessage('');
     } catch (err) {
@@ -240,7 +240,7 @@ const Profile = () => {
         <Grid container spacing={3}>
           <Grid item xs={12} md={4} sx={{ display: 'flex', flexDirection: 'column', alignItems: 'center' }}>
             <Avatar
-              src={user.profile_photo ? `http://localhost:8000${user.profile_photo}` : undefined}
+              src={user.profile_photo ? `http://localhost:8000${user.profile_photo_variants?.['256']?.webp || user.profile_photo}` : undefined}
               alt={user.name}
               sx={{ width: 150, height: 150, mb: 2 }}
             >
@@ -667,7 +667,7 @@ const Profile = () => {
                     <CardContent>
                       <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
                         <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
-                          <Avatar src={item.giver.profile_photo ? `http://localhost:8000${item.giver.profile_photo}` : undefined}>
+                          <Avatar src={item.giver.profile_photo ? `http://localhost:8000${item.giver.profile_photo_variants?.['64']?.webp || item.giver.profile_photo}` : undefined}>
                             {item.giver.name.charAt(0)}
                           </Avatar>
                           <Typography variant="subtitle1">
@@ -49,8 +49,10 @@ const SwapDetail = () => {
   const [newStatus, setNewStatus] = useState('');
   const [showFeedbackForm, setShowFeedbackForm] = useState(false);
   
-  const fetchSwapDetails = async () => {
-    setLoading(true);
+  const fetchSwapDetails = async (showLoading = true) => {
+    if (showLoading) {
+      setLoading(true);
+    }
     setError(null);
     
     try {
@@ -71,6 +73,15 @@ const SwapDetail = () => {
     fetchSwapDetails();
   }, [swapId]);
   
+  // Refresh when the other side updates this swap or leaves feedback on it
+  useEffect(() => {
+    return swapService.subscribeToSwapEvents((type, data) => {
+      if (type === 'resync' || String(data.swap_id) === String(swapId)) {
+        fetchSwapDetails(false);
+      }
+    });
+  }, [swapId]);
+  
   const handleUpdateStatus = async () => {
     if (!swap || !newStatus) return;
     
@@ -79,7 +90,7 @@ const SwapDetail = () => {
     setActionSuccess(null);
     
     try {
-      const updatedSwap = await swapService.updateSwap(swap.id, { status: newStatus });
+      const updatedSwap = await swapService.updateSwap(swap.id, { status: newStatus, version: swap.version });
       setSwap(updatedSwap);
       setActionSuccess(`Swap request ${newStatus} successfully.`);
       
@@ -88,7 +99,13 @@ const SwapDetail = () => {
       }
     } catch (err) {
       console.error('Error updating swap status:', err);
-      setActionError('Failed to update swap status. Please try again.');
+      if (err.response?.status === 409) {
+        // Changed by the other side in the meantime
+        setActionError(err.response.data.detail);
+        fetchSwapDetails(false);
+      } else {
+        setActionError('Failed to update swap status. Please try again.');
+      }
     } finally {
       setActionLoading(false);
       setStatusDialogOpen(false);
@@ -50,8 +50,10 @@ const Swaps = () => {
     setTabValue(newValue);
   };
 
-  const fetchSwaps = async () => {
-    setLoading(true);
+  const fetchSwaps = async (showLoading = true) => {
+    if (showLoading) {
+      setLoading(true);
+    }
     setError(null);
     
     try {
@@ -74,6 +76,11 @@ const Swaps = () => {
     fetchSwaps();
   }, []);
 
+  // Refresh when the other side creates or updates a swap
+  useEffect(() => {
+    return swapService.subscribeToSwapEvents(() => fetchSwaps(false));
+  }, []);
+
   const handleDeleteSwap = async () => {
     if (!swapToDelete) return;
     
@@ -103,7 +110,10 @@ const Swaps = () => {
     setActionSuccess(null);
     
     try {
-      const updatedSwap = await swapService.updateSwap(swapToUpdate.id, { status: newStatus });
+      const updatedSwap = await swapService.updateSwap(swapToUpdate.id, {
+        status: newStatus,
+        version: swapToUpdate.version,
+      });
       
       if (tabValue === 0) {
         setSentSwaps(sentSwaps.map(swap => swap.id === updatedSwap.id ? updatedSwap : swap));
@@ -114,7 +124,13 @@ const Swaps = () => {
       setActionSuccess(`Swap request ${newStatus} successfully.`);
     } catch (err) {
       console.error('Error updating swap status:', err);
-      setActionError('Failed to update swap status. Please try again.');
+      if (err.response?.status === 409) {
+        // Changed by the other side in the meantime
+        setActionError(err.response.data.detail);
+        fetchSwaps(false);
+      } else {
+        setActionError('Failed to update swap status. Please try again.');
+      }
     } finally {
       setActionLoading(false);
       setStatusDialogOpen(false);
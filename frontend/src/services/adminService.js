@@ -72,16 +72,39 @@ export const rejectSkill = async (skillId) => {
   }
 };
 
+export const approveSkills = async (skillIds) => {
+  try {
+    const response = await axios.put('/api/admin/skills/bulk/approve', { ids: skillIds });
+    return response.data;
+  } catch (error) {
+    console.error('Error approving skills:', error);
+    throw error;
+  }
+};
+
+export const rejectSkills = async (skillIds) => {
+  try {
+    const response = await axios.put('/api/admin/skills/bulk/reject', { ids: skillIds });
+    return response.data;
+  } catch (error) {
+    console.error('Error rejecting skills:', error);
+    throw error;
+  }
+};
+
 // Swap monitoring
-export const getAllSwaps = async (status = null, skip = 0, limit = 100) => {
+export const getAllSwaps = async (status = null, cursor = null, limit = 100) => {
   try {
-    const params = { skip, limit };
+    const params = { limit };
     if (status) {
       params.status = status;
     }
+    if (cursor) {
+      params.cursor = cursor;
+    }
     
     const response = await axios.get('/api/admin/swaps', { params });
-    return response.data;
+    return response.data.items;
   } catch (error) {
     console.error('Error fetching all swaps:', error);
     throw error;
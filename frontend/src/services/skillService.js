@@ -103,15 +103,18 @@ export const deleteSkillWanted = async (skillId) => {
 };
 
 // Skill search
-export const searchSkills = async (query, skillType = null) => {
+export const searchSkills = async (query, skillType = null, cursor = null) => {
   try {
     const params = { query };
     if (skillType) {
       params.skill_type = skillType;
     }
+    if (cursor) {
+      params.cursor = cursor;
+    }
     
     const response = await axios.get('/api/skills/search', { params });
-    return response.data;
+    return response.data.items;
   } catch (error) {
     console.error('Error searching skills:', error);
     throw error;
@@ -1,33 +1,42 @@
 import axios from 'axios';
 
 // Swaps
-export const getAllSwaps = async (status = null) => {
+export const getAllSwaps = async (status = null, cursor = null) => {
   try {
     const params = status ? { status } : {};
+    if (cursor) {
+      params.cursor = cursor;
+    }
     const response = await axios.get('/api/swaps', { params });
-    return response.data;
+    return response.data.items;
   } catch (error) {
     console.error('Error fetching all swaps:', error);
     throw error;
   }
 };
 
-export const getSentSwaps = async (status = null) => {
+export const getSentSwaps = async (status = null, cursor = null) => {
   try {
     const params = status ? { status } : {};
+    if (cursor) {
+      params.cursor = cursor;
+    }
     const response = await axios.get('/api/swaps/sent', { params });
-    return response.data;
+    return response.data.items;
   } catch (error) {
     console.error('Error fetching sent swaps:', error);
     throw error;
   }
 };
 
-export const getReceivedSwaps = async (status = null) => {
+export const getReceivedSwaps = async (status = null, cursor = null) => {
   try {
     const params = status ? { status } : {};
+    if (cursor) {
+      params.cursor = cursor;
+    }
     const response = await axios.get('/api/swaps/received', { params });
-    return response.data;
+    return response.data.items;
   } catch (error) {
     console.error('Error fetching received swaps:', error);
     throw error;
@@ -114,3 +123,24 @@ export const getSwapFeedback = async (swapId) => {
     throw error;
   }
 };
+
+// Live updates
+const SWAP_EVENTS = ['swap.created', 'swap.status_changed', 'feedback.received', 'resync'];
+
+// Calls onEvent(type, data) for each swap notification until the returned
+// function is called. EventSource reconnects on its own; 'resync' means
+// some notifications were missed and the caller should refetch.
+export const subscribeToSwapEvents = (onEvent) => {
+  const token = localStorage.getItem('token');
+  if (!token || typeof EventSource === 'undefined') {
+    return () => {};
+  }
+
+  const source = new EventSource(`/api/events?access_token=${encodeURIComponent(token)}`);
+  SWAP_EVENTS.forEach((type) => {
+    source.addEventListener(type, (event) => {
+      onEvent(type, JSON.parse(event.data));
+    });
+  });
+  return () => source.close();
+};